@@ -1,39 +1,90 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.auth.deps import get_current_user, require_roles
-from app.auth.schemas import UserResponse
-from app.admin.schemas import RoleUpdateRequest
-from app.db.database import get_db
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.auth.deps import invalidate_user, require_roles, user_cache
+from app.auth.schemas import CurrentUser, UserResponse
+from app.admin.export import MEDIA_TYPES, ExportFormat, ExportTable, export_filename, stream_export
+from app.admin.schemas import RoleUpdateRequest, CacheStatsResponse, HasherStats, PoolStatsResponse, UserPage
+from app.core.pagination import decode_cursor, decode_text_cursor, encode_cursor, encode_text_cursor
+from app.auth.hashing import password_hasher
+from app.db.database import async_engine, get_async_db
+from app.db.pool import pool_snapshots
+from app.db.replicas import get_read_db, pin_to_primary, replica_router
 from app.db.models import User, UserRole
+from app.videos.cache import catalog_cache, invalidate_catalog, playback_cache, search_cache, trending_cache
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
+# Upper bound for a prefix range scan: sorts after any character.
+PREFIX_RANGE_END = "\U0010ffff"
 
-@router.get("/users", response_model=list[UserResponse])
-def list_users(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(UserRole.ADMIN)),
+
+def email_sort_key(dialect: str):
+    # Byte-order collation on Postgres, so the prefix range and the ORDER BY
+    # are both served by idx_users_email_lower (migrations/007).
+    key = func.lower(User.email)
+    return key.collate("C") if dialect == "postgresql" else key
+
+
+@router.get("/users", response_model=UserPage)
+async def list_users(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    q: Optional[str] = Query(None, max_length=255, description="Case-insensitive email prefix"),
+    role: Optional[UserRole] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: CurrentUser = Depends(require_roles(UserRole.ADMIN)),
 ):
-    users = db.query(User).order_by(User.created_at.desc()).all()
-    return [
-        UserResponse(
-            id=u.id,
-            email=u.email,
-            role=u.role,
-            created_at=u.created_at,
-        )
-        for u in users
-    ]
+    """Newest first; with `q`, email prefix matches in email order."""
+    prefix = (q or "").strip().lower()
+    key = email_sort_key(db.bind.dialect.name)
+    query = select(User.id, User.email, User.role, User.created_at, key.label("sort_key"))
+    if role is not None:
+        query = query.where(User.role == role)
+
+    if prefix:
+        query = query.where(key >= prefix, key < prefix + PREFIX_RANGE_END)
+        if cursor:
+            after_key, after_id = decode_text_cursor(cursor)
+            query = query.where(tuple_(key, User.id) > tuple_(after_key, after_id))
+        query = query.order_by(key, User.id)
+    else:
+        if cursor:
+            cursor_created_at, cursor_id = decode_cursor(cursor)
+            query = query.where(tuple_(User.created_at, User.id) < tuple_(cursor_created_at, cursor_id))
+        query = query.order_by(User.created_at.desc(), User.id.desc())
+
+    # One extra row tells us whether another page exists without a COUNT.
+    rows = (await db.execute(query.limit(limit + 1))).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        if prefix:
+            next_cursor = encode_text_cursor(last.sort_key, last.id)
+        else:
+            next_cursor = encode_cursor(last.created_at, last.id)
+
+    return UserPage(
+        items=[
+            UserResponse(id=row.id, email=row.email, role=row.role, created_at=row.created_at)
+            for row in rows
+        ],
+        next_cursor=next_cursor,
+    )
 
 
 @router.patch("/users/{user_id}/role", response_model=UserResponse)
-def update_user_role(
+async def update_user_role(
     user_id: int,
     payload: RoleUpdateRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(UserRole.ADMIN)),
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(require_roles(UserRole.ADMIN)),
 ):
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -44,8 +95,10 @@ def update_user_role(
         )
 
     user.role = payload.role
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    invalidate_user(user.id)
+    pin_to_primary(response)
 
     return UserResponse(
         id=user.id,
@@ -53,3 +106,51 @@ def update_user_role(
         role=user.role,
         created_at=user.created_at,
     )
+
+
+@router.get("/cache/stats", response_model=CacheStatsResponse)
+async def cache_stats(
+    current_user: CurrentUser = Depends(require_roles(UserRole.ADMIN)),
+):
+    return CacheStatsResponse(
+        catalog=catalog_cache.stats(),
+        playback=playback_cache.stats(),
+        search=search_cache.stats(),
+        trending=trending_cache.stats(),
+        users=user_cache.stats(),
+    )
+
+
+@router.delete("/cache", status_code=204)
+async def clear_cache(
+    current_user: CurrentUser = Depends(require_roles(UserRole.ADMIN)),
+):
+    invalidate_catalog()
+
+
+@router.get("/hasher/stats", response_model=HasherStats)
+async def hasher_stats(
+    current_user: CurrentUser = Depends(require_roles(UserRole.ADMIN)),
+):
+    return HasherStats(**password_hasher.stats())
+
+
+@router.get("/db/pool", response_model=PoolStatsResponse)
+async def db_pool_stats(
+    current_user: CurrentUser = Depends(require_roles(UserRole.ADMIN)),
+):
+    return PoolStatsResponse(pools=pool_snapshots(), replicas=replica_router.stats())
+
+
+@router.get("/export/{table}")
+async def export_table(
+    table: ExportTable,
+    format: ExportFormat = ExportFormat.NDJSON,
+    current_user: CurrentUser = Depends(require_roles(UserRole.ADMIN)),
+):
+    """Stream every row of `table` as NDJSON or CSV (see app/admin/export.py)."""
+    return StreamingResponse(
+        stream_export(async_engine, table, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{export_filename(table, format)}"'},
+    )
@@ -1,6 +1,72 @@
+from typing import Optional
 from pydantic import BaseModel
+from app.auth.schemas import UserResponse
 from app.db.models import UserRole
 
 
 class RoleUpdateRequest(BaseModel):
     role: UserRole
+
+
+class UserPage(BaseModel):
+    items: list[UserResponse]
+    next_cursor: str | None = None
+
+
+class CacheStats(BaseModel):
+    size: int
+    max_entries: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    hit_rate: float
+    evictions: int
+    invalidations: int
+
+
+class CacheStatsResponse(BaseModel):
+    catalog: CacheStats
+    playback: CacheStats
+    search: CacheStats
+    trending: CacheStats
+    users: CacheStats
+
+
+class HasherStats(BaseModel):
+    workers: int
+    queue_depth: int
+    in_flight: int
+    queued: int
+    completed: int
+    rejected: int
+    hash_p50_ms: float
+    hash_p99_ms: float
+    wait_p50_ms: float
+    wait_p99_ms: float
+
+
+class PoolStats(BaseModel):
+    name: str
+    pool_size: int
+    checked_out: int
+    idle: int
+    overflow: int
+    max_overflow: int
+    checkouts: int
+    overflow_checkouts: int
+    timeouts: int
+    pre_pings: int
+    wait_avg_ms: float
+    wait_p99_ms: float
+    wait_max_ms: float
+
+
+class ReplicaStatus(BaseModel):
+    name: str
+    healthy: bool
+    last_error: Optional[str] = None
+
+
+class PoolStatsResponse(BaseModel):
+    pools: list[PoolStats]
+    replicas: list[ReplicaStatus] = []
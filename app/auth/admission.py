@@ -0,0 +1,57 @@
+import logging
+import math
+from functools import lru_cache
+from typing import Optional
+
+from fastapi import HTTPException, Request, status
+from app.core.config import settings
+from app.core.metrics import AUTH_RATE_LIMITED
+from app.core.ratelimit import KeyedRateLimiter, MemoryRateLimiter, RedisRateLimiter
+
+logger = logging.getLogger(__name__)
+
+PER_MINUTE = 1 / 60
+
+
+@lru_cache
+def get_auth_limiter() -> KeyedRateLimiter:
+    if settings.auth_rate_limit_redis_url:
+        return RedisRateLimiter(settings.auth_rate_limit_redis_url, prefix="auth:")
+    return MemoryRateLimiter(settings.auth_rate_limit_max_keys)
+
+
+def client_ip(request: Request) -> str:
+    # Behind a proxy, run uvicorn with --proxy-headers (and
+    # --forwarded-allow-ips) so this is the real client, not the proxy.
+    return request.client.host if request.client else "unknown"
+
+
+def _rules(endpoint: str, ip: str, email: Optional[str]) -> list[tuple[str, str, float, float]]:
+    """(scope, key, tokens per second, burst) checked in order."""
+    if endpoint == "register":
+        return [("ip", f"register:ip:{ip}", settings.register_ip_per_minute * PER_MINUTE, settings.register_ip_burst)]
+    rules = [("ip", f"login:ip:{ip}", settings.login_ip_per_minute * PER_MINUTE, settings.login_ip_burst)]
+    if email:
+        rules.append(
+            ("email", f"login:email:{email}", settings.login_email_per_minute * PER_MINUTE, settings.login_email_burst)
+        )
+    return rules
+
+
+async def admit(request: Request, endpoint: str, email: Optional[str] = None) -> None:
+    """Raise 429 when the caller is over its budget; runs before any DB or bcrypt work."""
+    if not settings.auth_rate_limit_enabled:
+        return
+    ip = client_ip(request)
+    email = email.strip().lower() if email else None
+    limiter = get_auth_limiter()
+    for scope, key, rate, burst in _rules(endpoint, ip, email):
+        wait = await limiter.hit(key, rate, burst)
+        if wait:
+            AUTH_RATE_LIMITED.labels(endpoint, scope).inc()
+            logger.info("Rate limited %s by %s (%s)", endpoint, scope, ip)
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many attempts, retry later",
+                headers={"Retry-After": str(max(1, math.ceil(wait)))},
+            )
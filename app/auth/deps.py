@@ -1,41 +1,124 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.auth.schemas import CurrentUser, TokenUser
 from app.auth.security import decode_access_token
-from app.db.database import get_db
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.database import get_async_db
+from app.db.replicas import get_read_db
 from app.db.models import User, UserRole
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+# Authenticated identities keyed by user id, so most requests skip the
+# users table entirely. Role changes must call invalidate_user(), which only
+# reaches this process; elsewhere the entry lives out its TTL, and admins
+# get the short USER_CACHE_ADMIN_TTL_SECONDS so a revoked admin does not keep
+# the role for long.
+user_cache = TTLCache(
+    max_entries=settings.user_cache_max_entries,
+    ttl_seconds=settings.user_cache_ttl_seconds,
+)
+
+credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
+
+def invalidate_user(user_id: int) -> None:
+    user_cache.delete(user_id)
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-) -> User:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
 
+def _decode_token(token: str) -> dict:
     try:
         payload = decode_access_token(token)
-        user_id = payload.get("sub")
-        if not user_id:
-            raise credentials_exception
     except JWTError:
         raise credentials_exception
-
-    user = db.query(User).filter(User.id == int(user_id)).first()
-    if not user:
+    if not payload.get("sub"):
         raise credentials_exception
+    return payload
+
 
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> CurrentUser:
+    user_id = int(_decode_token(token)["sub"])
+
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        return cached
+    generation = user_cache.generation
+
+    user = await _load_user(db, user_id)
+    # Read routes take a second session from get_read_db(); holding this
+    # connection while they wait for it deadlocks the pool under load.
+    await db.close()
+    user_cache.set(user_id, user, generation, ttl_seconds=_cache_ttl(user))
     return user
 
 
+def _cache_ttl(user: CurrentUser) -> float:
+    if user.role == UserRole.ADMIN:
+        return settings.user_cache_admin_ttl_seconds
+    return settings.user_cache_ttl_seconds
+
+
+async def _load_user(db: AsyncSession, user_id: int) -> CurrentUser:
+    row = (
+        await db.execute(
+            select(User.id, User.email, User.role, User.created_at).where(User.id == user_id)
+        )
+    ).first()
+    if not row:
+        raise credentials_exception
+    return CurrentUser(id=row.id, email=row.email, role=row.role, created_at=row.created_at)
+
+
+async def get_current_read_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_read_db),
+) -> CurrentUser:
+    """get_current_user, loading cache misses from a read replica.
+
+    A replica may still hold a role the primary has already changed, so
+    what it returns is never put in user_cache, which write routes trust.
+    """
+    user_id = int(_decode_token(token)["sub"])
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        return cached
+    return await _load_user(db, user_id)
+
+
+async def get_read_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> TokenUser:
+    """Identity for read-only routes.
+
+    With AUTH_TRUST_TOKEN_ROLE enabled the role claim in the JWT is used as
+    is, so these routes never touch the users table; a role change then only
+    takes effect once the user gets a new token.
+    """
+    if settings.auth_trust_token_role:
+        payload = _decode_token(token)
+        try:
+            return TokenUser(id=int(payload["sub"]), role=UserRole(payload.get("role")))
+        except ValueError:
+            raise credentials_exception
+
+    user = await get_current_user(token, db)
+    return TokenUser(id=user.id, role=user.role)
+
+
 def require_roles(*roles: UserRole):
-    def _role_guard(current_user: User = Depends(get_current_user)) -> User:
+    async def _role_guard(current_user: CurrentUser = Depends(get_current_user)) -> CurrentUser:
         if current_user.role not in roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
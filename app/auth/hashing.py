@@ -0,0 +1,135 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Optional
+from app.auth.security import hash_password, verify_password
+from app.core.config import settings
+from app.core.metrics import BCRYPT_REJECTED, BCRYPT_SECONDS, BCRYPT_WAIT, percentile
+
+
+class HasherSaturatedError(RuntimeError):
+    """All hashing workers are busy and the wait queue is full."""
+
+
+def _timed(fn: Callable, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+class PasswordHasher:
+    """Runs bcrypt in a dedicated process pool with bounded admission.
+
+    At most `workers + queue_depth` operations are in flight; anything
+    beyond that is rejected immediately with HasherSaturatedError instead
+    of piling up on the request threadpool.
+    """
+
+    def __init__(self, workers: Optional[int] = None, queue_depth: Optional[int] = None) -> None:
+        self.workers = workers or settings.bcrypt_workers or os.cpu_count() or 1
+        self.queue_depth = queue_depth if queue_depth is not None else settings.bcrypt_queue_depth
+        self._slots = threading.BoundedSemaphore(self.workers + self.queue_depth)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self._hash_seconds: deque[float] = deque(maxlen=1024)
+        self._wait_seconds: deque[float] = deque(maxlen=1024)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn keeps worker processes free of the server's threads and
+                # open sockets, which fork would copy.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _submit(self, fn: Callable, *args) -> Future:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            BCRYPT_REJECTED.inc()
+            raise HasherSaturatedError("Password hashing is saturated")
+
+        op = "hash" if fn is hash_password else "verify"
+        submitted = time.perf_counter()
+        with self._lock:
+            self.in_flight += 1
+        try:
+            inner = self._get_executor().submit(_timed, fn, *args)
+        except Exception:
+            self._release()
+            raise
+
+        outer: Future = Future()
+
+        def _done(done: Future) -> None:
+            self._release()
+            try:
+                result, hash_seconds = done.result()
+            except BaseException as exc:
+                outer.set_exception(exc)
+                return
+            wait_seconds = max(time.perf_counter() - submitted - hash_seconds, 0.0)
+            with self._lock:
+                self.completed += 1
+                self._hash_seconds.append(hash_seconds)
+                self._wait_seconds.append(wait_seconds)
+            BCRYPT_SECONDS.labels(op).observe(hash_seconds)
+            BCRYPT_WAIT.observe(wait_seconds)
+            outer.set_result(result)
+
+        inner.add_done_callback(_done)
+        return outer
+
+    def _release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    def hash(self, password: str) -> str:
+        return self._submit(hash_password, password).result()
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return self._submit(verify_password, plain_password, hashed_password).result()
+
+    async def ahash(self, password: str) -> str:
+        return await asyncio.wrap_future(self._submit(hash_password, password))
+
+    async def averify(self, plain_password: str, hashed_password: str) -> bool:
+        return await asyncio.wrap_future(self._submit(verify_password, plain_password, hashed_password))
+
+    def stats(self) -> dict:
+        with self._lock:
+            hash_seconds = list(self._hash_seconds)
+            wait_seconds = list(self._wait_seconds)
+            in_flight = self.in_flight
+            return {
+                "workers": self.workers,
+                "queue_depth": self.queue_depth,
+                "in_flight": in_flight,
+                "queued": max(in_flight - self.workers, 0),
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "hash_p50_ms": round(percentile(hash_seconds, 50) * 1000, 2),
+                "hash_p99_ms": round(percentile(hash_seconds, 99) * 1000, 2),
+                "wait_p50_ms": round(percentile(wait_seconds, 50) * 1000, 2),
+                "wait_p99_ms": round(percentile(wait_seconds, 99) * 1000, 2),
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher()
@@ -1,36 +1,54 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.auth.schemas import RegisterRequest, LoginRequest, AuthResponse, UserResponse
-from app.auth.security import hash_password, verify_password, create_access_token
-from app.db.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.auth.admission import admit
+from app.auth.schemas import RegisterRequest, LoginRequest, AuthResponse, CurrentUser, UserResponse
+from app.auth.hashing import HasherSaturatedError, password_hasher
+from app.auth.security import create_access_token
+from app.db.database import get_async_db
 from app.db.models import User, UserRole
-from app.auth.deps import get_current_user
+from app.auth.deps import get_current_read_user
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+hasher_saturated_exception = HTTPException(
+    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+    detail="Authentication is busy, retry shortly",
+    headers={"Retry-After": "1"},
+)
+
 
 @router.post("/register", response_model=AuthResponse, status_code=201)
-def register(payload: RegisterRequest, db: Session = Depends(get_db)):
+async def register(payload: RegisterRequest, request: Request, db: AsyncSession = Depends(get_async_db)):
+    await admit(request, "register")
     if payload.role == UserRole.ADMIN:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot register as admin",
         )
-    existing = db.query(User).filter(User.email == payload.email).first()
+    existing = await db.scalar(select(User.id).where(User.email == payload.email))
     if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
         )
 
+    # bcrypt can queue for seconds under load; don't hold a pooled
+    # connection through it. The session reconnects for the insert.
+    await db.close()
+    try:
+        password_hash = await password_hasher.ahash(payload.password)
+    except HasherSaturatedError:
+        raise hasher_saturated_exception
+
     user = User(
         email=payload.email,
-        password_hash=hash_password(payload.password),
+        password_hash=password_hash,
         role=payload.role,
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
 
     token = create_access_token(subject=str(user.id), role=user.role.value)
     return AuthResponse(
@@ -45,9 +63,16 @@ def register(payload: RegisterRequest, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=AuthResponse)
-def login(payload: LoginRequest, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == payload.email).first()
-    if not user or not verify_password(payload.password, user.password_hash):
+async def login(payload: LoginRequest, request: Request, db: AsyncSession = Depends(get_async_db)):
+    await admit(request, "login", payload.email)
+    user = await db.scalar(select(User).where(User.email == payload.email))
+    # Release the connection before bcrypt; `user` stays loaded.
+    await db.close()
+    try:
+        valid = bool(user) and await password_hasher.averify(payload.password, user.password_hash)
+    except HasherSaturatedError:
+        raise hasher_saturated_exception
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
@@ -66,7 +91,7 @@ def login(payload: LoginRequest, db: Session = Depends(get_db)):
 
 
 @router.get("/me", response_model=UserResponse)
-def me(current_user: User = Depends(get_current_user)):
+async def me(current_user: CurrentUser = Depends(get_current_read_user)):
     return UserResponse(
         id=current_user.id,
         email=current_user.email,
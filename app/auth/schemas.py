@@ -1,5 +1,5 @@
 from datetime import datetime
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, ConfigDict, field_validator
 from app.db.models import UserRole
 
 
@@ -39,3 +39,19 @@ class AuthResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
     user: UserResponse
+
+
+class CurrentUser(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    id: int
+    email: str
+    role: UserRole
+    created_at: datetime
+
+
+class TokenUser(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    id: int
+    role: UserRole
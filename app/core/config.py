@@ -1,10 +1,26 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Literal, Optional
 
 
 class Settings(BaseSettings):
     # Database
     database_url: str
+    async_database_url: Optional[str] = None
+    db_pgbouncer_mode: bool = False
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: Literal["always", "idle", "never"] = "idle"
+    db_pool_pre_ping_idle_seconds: float = 30.0
+    # Apply pending migrations/*.sql at startup (false = scripts/migrate.py only)
+    db_migrate_on_startup: bool = True
+    # Read replicas for read-only routes: comma-separated URLs in DATABASE_URL form
+    database_replica_urls: str = ""
+    db_replica_check_interval_seconds: float = 5.0
+    db_replica_check_timeout_seconds: float = 2.0
+    # Reads stay on the primary this long after a write; keep above replica lag
+    db_read_your_writes_seconds: float = 5.0
 
     # JWT
     jwt_secret: str
@@ -14,9 +30,113 @@ class Settings(BaseSettings):
     # Mux
     mux_token_id: str
     mux_token_secret: str
+    mux_base_url: str = "https://api.mux.com/video/v1"
+    mux_connect_timeout_seconds: float = 3.05
+    mux_read_timeout_seconds: float = 10.0
+    mux_pool_size: int = 20
+    mux_max_retries: int = 3
+    mux_backoff_base_seconds: float = 0.25
+    mux_backoff_max_seconds: float = 4.0
+    mux_breaker_failure_threshold: int = 5
+    mux_breaker_reset_seconds: float = 30.0
+    mux_reconcile_enabled: bool = True
+    mux_reconcile_interval_seconds: float = 15.0
+    mux_reconcile_max_interval_seconds: float = 300.0
+    mux_reconcile_batch_size: int = 50
+    mux_reconcile_concurrency: int = 4
+    mux_webhook_secret: Optional[str] = None
+    mux_webhook_tolerance_seconds: int = 300
+    mux_webhook_flush_interval_seconds: float = 0.5
+    mux_webhook_max_batch: int = 500
+    mux_webhook_dedupe_size: int = 100_000
+    # Direct uploads; chunks must be a multiple of 256 KiB
+    mux_upload_chunk_bytes: int = 8 * 1024 * 1024
+    mux_upload_max_retries: int = 5
+    mux_upload_cors_origin: str = "*"
+    mux_upload_asset_wait_seconds: float = 5.0
+    # Bulk ingestion; Mux allows roughly one asset POST per second sustained
+    mux_ingest_concurrency: int = 4
+    mux_ingest_rate_per_second: float = 1.0
+    mux_ingest_burst: float = 2.0
+    mux_ingest_batch_size: int = 100
+    ingest_max_manifest_bytes: int = 10 * 1024 * 1024
+
+    # Video creation jobs (POST /videos enqueues, workers call Mux)
+    video_jobs_enabled: bool = True
+    video_job_workers: int = 4
+    video_job_max_attempts: int = 5
+    video_job_poll_interval_seconds: float = 1.0
+    video_job_lease_seconds: float = 300.0
+    video_job_backoff_base_seconds: float = 5.0
+    video_job_backoff_max_seconds: float = 300.0
+
+    # Playback events (POST /videos/events), buffered and written in bulk
+    playback_event_buffer_size: int = 50_000
+    playback_event_flush_size: int = 2_000
+    playback_event_flush_interval_seconds: float = 1.0
+    playback_event_max_batch: int = 100
+    # Failed flushes of the same rows before they are bisected and bad rows dropped
+    playback_event_flush_max_attempts: int = 3
+    playback_session_ttl_seconds: int = 86_400
+    # Client occurred_at is clamped to [received - session TTL, received + skew]
+    playback_event_max_clock_skew_seconds: float = 60.0
+
+    # Trending / most-watched rollups (GET /videos/trending)
+    rollups_enabled: bool = True
+    rollup_interval_seconds: float = 60.0
+    rollup_batch_size: int = 50_000
+    # Events received more recently than this wait for the next pass
+    rollup_settle_seconds: float = 30.0
+    trending_half_life_hours: float = 24.0
+    rollup_hourly_retention_days: int = 14
+    trending_cache_max_entries: int = 64
+
+    # Password hashing (0 workers = one per CPU)
+    bcrypt_workers: int = 0
+    bcrypt_queue_depth: int = 32
+
+    # Login / register admission control (token buckets, checked before bcrypt)
+    auth_rate_limit_enabled: bool = True
+    login_ip_per_minute: float = 30.0
+    login_ip_burst: float = 30.0
+    login_email_per_minute: float = 6.0
+    login_email_burst: float = 10.0
+    register_ip_per_minute: float = 5.0
+    register_ip_burst: float = 10.0
+    auth_rate_limit_max_keys: int = 100_000
+    # Share limits across workers; requires the redis package
+    auth_rate_limit_redis_url: Optional[str] = None
+
+    # Caching
+    # invalidate_user() only clears the calling process: other workers keep
+    # serving a changed role until their entry expires, so this TTL is how
+    # long a role change can take to apply everywhere.
+    user_cache_ttl_seconds: float = 60.0
+    # ...and this one bounds how long a demoted admin keeps admin rights.
+    user_cache_admin_ttl_seconds: float = 5.0
+    user_cache_max_entries: int = 10_000
+    auth_trust_token_role: bool = False
+    catalog_cache_ttl_seconds: float = 30.0
+    catalog_cache_max_entries: int = 2048
+    # GET /videos/search pages; free text makes the key space unbounded,
+    # so they get their own LRU instead of evicting catalog pages
+    search_cache_ttl_seconds: float = 30.0
+    search_cache_max_entries: int = 1024
+    # Per-video /play decisions; in-process writes invalidate exactly, the
+    # TTL only bounds staleness from writers in other processes
+    playback_cache_ttl_seconds: float = 60.0
+    playback_cache_max_entries: int = 50_000
+
+    # Observability
+    metrics_enabled: bool = True
 
     # API
     api_base_url: str = "http://localhost:8000"
+    # Responses smaller than this are sent uncompressed
+    gzip_minimum_size: int = 1024
+    gzip_compress_level: int = 6
+    # web/ pages; no-cache still lets browsers revalidate with the ETag
+    static_cache_control: str = "public, no-cache"
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,218 @@
+"""Prometheus metrics: per-route HTTP latency, DB time, Mux and bcrypt costs."""
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile (pct in 0-100) of raw samples; 0.0 when empty."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route template and status code",
+    ["method", "route", "status"],
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "http_request_db_seconds",
+    "Time spent executing SQL per HTTP request",
+    ["route"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_QUERIES = Counter("db_queries_total", "SQL statements executed", ["engine"])
+DB_SECONDS = Counter("db_query_seconds_total", "Time spent executing SQL", ["engine"])
+DB_READ_ROUTE = Counter("db_read_route_total", "Read-only route sessions by database", ["target"])
+MUX_LATENCY = Histogram(
+    "mux_request_duration_seconds",
+    "Mux API call latency per attempt",
+    ["method", "endpoint"],
+    buckets=LATENCY_BUCKETS,
+)
+MUX_ERRORS = Counter("mux_errors_total", "Failed Mux API attempts", ["reason"])
+BCRYPT_SECONDS = Histogram(
+    "bcrypt_duration_seconds",
+    "bcrypt time inside the hashing worker",
+    ["op"],
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.0),
+)
+BCRYPT_WAIT = Histogram(
+    "bcrypt_queue_wait_seconds",
+    "Time a hashing request waited for a worker",
+    buckets=LATENCY_BUCKETS,
+)
+BCRYPT_REJECTED = Counter("bcrypt_rejected_total", "Hashing requests rejected while saturated")
+PLAYBACK_EVENTS = Counter(
+    "playback_events_total",
+    "Playback events by outcome (accepted, rejected when the buffer is full, written, dropped)",
+    ["outcome"],
+)
+AUTH_RATE_LIMITED = Counter(
+    "auth_rate_limited_total",
+    "Login/register attempts rejected by admission control",
+    ["endpoint", "scope"],
+)
+PLAYBACK_ENTRY_AGE = Histogram(
+    "playback_cache_entry_age_seconds",
+    "Age of the playback decision served on a cache hit (worst-case staleness)",
+    buckets=(0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0),
+)
+
+# Accumulates SQL time for the current request; set by MetricsMiddleware.
+_request_db_time: ContextVar[Optional[list]] = ContextVar("request_db_time", default=None)
+
+
+def mux_endpoint(path: str) -> str:
+    """Collapse ids out of Mux paths: /assets/abc -> /assets/{id}."""
+    parts = path.strip("/").split("/")
+    return "/" + parts[0] + ("/{id}" if len(parts) > 1 else "")
+
+
+def instrument_engine_timing(engine: Engine, name: str) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info["query_started"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info.pop("query_started", time.perf_counter())
+        DB_QUERIES.labels(name).inc()
+        DB_SECONDS.labels(name).inc(elapsed)
+        box = _request_db_time.get()
+        if box is not None:
+            box[0] += elapsed
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware, so the per-request cost is a few counter updates.
+
+    Labels use the matched route template (/videos/{video_id}), never the raw
+    path, which keeps label cardinality bounded.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+        self._templates: dict = {}
+
+    def _route_template(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        template = self._templates.get(endpoint)
+        if template is None:
+            for route in scope["app"].routes:
+                if getattr(route, "endpoint", None) is endpoint:
+                    template = route.path
+                    break
+            else:
+                template = "unmatched"
+            self._templates[endpoint] = template
+        return template
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_code[0] = message["status"]
+            await send(message)
+
+        db_time = [0.0]
+        token = _request_db_time.set(db_time)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            _request_db_time.reset(token)
+            route = self._route_template(scope)
+            method = scope["method"]
+            HTTP_REQUESTS.labels(method, route, str(status_code[0])).inc()
+            HTTP_LATENCY.labels(method, route).observe(elapsed)
+            DB_TIME_PER_REQUEST.labels(route).observe(db_time[0])
+
+
+class AppStatsCollector:
+    """Exports the in-process caches, DB pools and hasher on each scrape."""
+
+    def collect(self):
+        from app.auth.admission import get_auth_limiter
+        from app.auth.deps import user_cache
+        from app.auth.hashing import password_hasher
+        from app.db.pool import pool_snapshots
+        from app.videos.cache import catalog_cache, playback_cache, search_cache, trending_cache
+
+        cache_size = GaugeMetricFamily("cache_entries", "Entries held by an in-process cache", labels=["cache"])
+        cache_hits = CounterMetricFamily("cache_hits", "Cache hits", labels=["cache"])
+        cache_misses = CounterMetricFamily("cache_misses", "Cache misses", labels=["cache"])
+        cache_evictions = CounterMetricFamily("cache_evictions", "LRU evictions", labels=["cache"])
+        for name, cache in (
+            ("catalog", catalog_cache),
+            ("playback", playback_cache),
+            ("search", search_cache),
+            ("trending", trending_cache),
+            ("users", user_cache),
+        ):
+            stats = cache.stats()
+            cache_size.add_metric([name], stats["size"])
+            cache_hits.add_metric([name], stats["hits"])
+            cache_misses.add_metric([name], stats["misses"])
+            cache_evictions.add_metric([name], stats["evictions"])
+        yield from (cache_size, cache_hits, cache_misses, cache_evictions)
+
+        checked_out = GaugeMetricFamily("db_pool_checked_out", "Connections in use", labels=["pool"])
+        idle = GaugeMetricFamily("db_pool_idle", "Idle pooled connections", labels=["pool"])
+        overflow = GaugeMetricFamily("db_pool_overflow", "Connections beyond pool_size", labels=["pool"])
+        timeouts = CounterMetricFamily("db_pool_timeouts", "Checkout timeouts", labels=["pool"])
+        overflow_checkouts = CounterMetricFamily(
+            "db_pool_overflow_checkouts", "Checkouts served by overflow connections", labels=["pool"]
+        )
+        for snapshot in pool_snapshots():
+            checked_out.add_metric([snapshot["name"]], snapshot["checked_out"])
+            idle.add_metric([snapshot["name"]], snapshot["idle"])
+            overflow.add_metric([snapshot["name"]], snapshot["overflow"])
+            timeouts.add_metric([snapshot["name"]], snapshot["timeouts"])
+            overflow_checkouts.add_metric([snapshot["name"]], snapshot["overflow_checkouts"])
+        yield from (checked_out, idle, overflow, timeouts, overflow_checkouts)
+
+        if get_auth_limiter.cache_info().currsize:
+            limiter = get_auth_limiter().stats()
+            if "keys" in limiter:
+                yield GaugeMetricFamily("auth_rate_limit_keys", "Login/register buckets held in memory", value=limiter["keys"])
+            if "errors" in limiter:
+                yield CounterMetricFamily(
+                    "auth_rate_limit_errors", "Limiter calls that failed open (Redis unreachable)", value=limiter["errors"]
+                )
+
+        from app.videos.events import playback_event_buffer
+
+        yield GaugeMetricFamily(
+            "playback_events_buffered", "Playback events waiting to be written", value=len(playback_event_buffer)
+        )
+
+        hasher = password_hasher.stats()
+        yield GaugeMetricFamily("bcrypt_in_flight", "Hashing operations in flight", value=hasher["in_flight"])
+        yield GaugeMetricFamily("bcrypt_queued", "Hashing operations waiting for a worker", value=hasher["queued"])
+
+
+def render_latest() -> tuple[bytes, str]:
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,154 @@
+import abc
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens if available; otherwise return seconds until they would be."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        while True:
+            wait = self.try_acquire(tokens)
+            if not wait:
+                return
+            time.sleep(wait)
+
+    def penalize(self, seconds: float) -> None:
+        """Drain the bucket so nobody proceeds for `seconds` (e.g. after a 429)."""
+        with self._lock:
+            self._tokens = min(self._tokens, -seconds * self.rate)
+            self._updated = time.monotonic()
+
+
+class KeyedRateLimiter(abc.ABC):
+    """Token buckets per key: hit() returns 0.0 if allowed, else seconds to wait."""
+
+    @abc.abstractmethod
+    async def hit(self, key: str, rate: float, capacity: float) -> float:
+        ...
+
+    def stats(self) -> dict:
+        return {}
+
+
+class MemoryRateLimiter(KeyedRateLimiter):
+    """Per-process buckets as (tokens, updated) pairs in an LRU-bounded dict.
+
+    A bucket that has refilled to capacity is no different from a missing
+    one, so it is dropped; `max_keys` caps memory during a spray of
+    distinct keys (the oldest buckets go first, which only forgives them).
+    """
+
+    def __init__(self, max_keys: int) -> None:
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    async def hit(self, key: str, rate: float, capacity: float) -> float:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._buckets.pop(key, None)
+            tokens = capacity if entry is None else min(capacity, entry[0] + (now - entry[1]) * rate)
+            wait = 0.0
+            if tokens >= 1.0:
+                tokens -= 1.0
+            else:
+                wait = (1.0 - tokens) / rate
+            full_at = now + (capacity - tokens) / rate
+            self._buckets[key] = (tokens, now, full_at)
+            self._expire(now)
+            return wait
+
+    def _expire(self, now: float) -> None:
+        while self._buckets:
+            key, (_, _, full_at) = next(iter(self._buckets.items()))
+            if full_at <= now:
+                del self._buckets[key]
+            elif len(self._buckets) > self.max_keys:
+                del self._buckets[key]
+                self.evictions += 1
+            else:
+                break
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"backend": "memory", "keys": len(self._buckets), "max_keys": self.max_keys, "evictions": self.evictions}
+
+
+# KEYS[1] = bucket; ARGV = rate, capacity, now (seconds). Returns wait in ms.
+_REDIS_TOKEN_BUCKET = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 't', 'u')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+else
+  wait = math.ceil((1 - tokens) / rate * 1000)
+end
+redis.call('HSET', KEYS[1], 't', tokens, 'u', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate * 1000) + 1000)
+return wait
+"""
+
+
+class RedisRateLimiter(KeyedRateLimiter):
+    """Buckets shared by every worker through Redis (needs the `redis` package).
+
+    Fails open: if Redis is unreachable the request is allowed, so an
+    outage of the limiter never locks users out. Failures are counted in
+    `errors` (exported as auth_rate_limit_errors) and logged once per outage.
+    """
+
+    def __init__(self, url: str, prefix: str = "ratelimit:") -> None:
+        import redis.asyncio as redis
+
+        self.client = redis.from_url(url)
+        self.prefix = prefix
+        self._script = self.client.register_script(_REDIS_TOKEN_BUCKET)
+        self.errors = 0
+        self._failing = False
+
+    async def hit(self, key: str, rate: float, capacity: float) -> float:
+        try:
+            wait_ms = await self._script(keys=[self.prefix + key], args=[rate, capacity, time.time()])
+        except Exception as exc:
+            self.errors += 1
+            if not self._failing:
+                logger.warning("Redis rate limiter unavailable, allowing requests: %s", exc)
+                self._failing = True
+            return 0.0
+        if self._failing:
+            logger.info("Redis rate limiter back")
+            self._failing = False
+        return int(wait_ms) / 1000
+
+    def stats(self) -> dict:
+        return {"backend": "redis", "errors": self.errors}
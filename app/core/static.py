@@ -0,0 +1,133 @@
+"""In-memory web/ pages with precompressed variants.
+
+Pages are read once at startup and stored as identity, gzip and (when the
+brotli package is installed) brotli bodies, each with its own strong ETag.
+A request is answered from memory: the encoding is picked from
+Accept-Encoding and a matching If-None-Match gets an empty 304.
+"""
+import gzip
+import hashlib
+import mimetypes
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from fastapi import Request, Response
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # optional; gzip is served instead
+    brotli = None
+
+# Preferred first when the client accepts several.
+ENCODINGS = ("br", "gzip", "identity")
+
+
+class Variant(NamedTuple):
+    body: bytes
+    etag: str
+
+
+class StaticAsset(NamedTuple):
+    media_type: str
+    variants: dict[str, Variant]
+
+
+def _variant(body: bytes, encoding: str) -> Variant:
+    digest = hashlib.sha256(body).hexdigest()[:32]
+    return Variant(body, f'"{digest}"' if encoding == "identity" else f'"{digest}-{encoding}"')
+
+
+def build_asset(body: bytes, media_type: str) -> StaticAsset:
+    variants = {"identity": _variant(body, "identity")}
+    # mtime=0 keeps the gzip bytes, and so the ETag, stable across restarts.
+    compressed = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        compressed["br"] = brotli.compress(body, quality=11)
+    for encoding, data in compressed.items():
+        # Tiny files can grow when compressed.
+        if len(data) < len(body):
+            variants[encoding] = _variant(data, encoding)
+    return StaticAsset(media_type, variants)
+
+
+def accepted_encodings(header: Optional[str]) -> dict[str, float]:
+    """Accept-Encoding as {coding: q}; identity is acceptable unless refused."""
+    accepted = {}
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def choose_encoding(asset: StaticAsset, header: Optional[str]) -> str:
+    accepted = accepted_encodings(header)
+    wildcard = accepted.get("*")
+    best, best_q = "identity", 0.0
+    for encoding in ENCODINGS:
+        if encoding not in asset.variants:
+            continue
+        q = accepted.get(encoding, wildcard)
+        if q is None:
+            q = 1.0 if encoding == "identity" else 0.0
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison.
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+class StaticPages:
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.assets: dict[str, StaticAsset] = {}
+
+    def load(self, *names: str) -> None:
+        assets = {}
+        for name in names:
+            path = self.root / name
+            if not path.is_file():
+                continue
+            # Response appends "; charset=utf-8" to text/* types.
+            media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+            assets[name] = build_asset(path.read_bytes(), media_type)
+        self.assets = assets
+
+    def response(self, request: Request, name: str) -> Optional[Response]:
+        """None when the page was not found at startup."""
+        asset = self.assets.get(name)
+        if asset is None:
+            return None
+        encoding = choose_encoding(asset, request.headers.get("accept-encoding"))
+        variant = asset.variants[encoding]
+        headers = {
+            "ETag": variant.etag,
+            "Cache-Control": settings.static_cache_control,
+            "Vary": "Accept-Encoding",
+        }
+        if etag_matches(request.headers.get("if-none-match"), variant.etag):
+            return Response(status_code=304, headers=headers)
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(content=variant.body, media_type=asset.media_type, headers=headers)
+
+
+static_pages = StaticPages(Path(__file__).resolve().parents[2] / "web")
@@ -1,17 +1,68 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import settings
+from app.core.metrics import instrument_engine_timing
+from app.db.pool import instrument_engine, pool_options
 
-# Create engine
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(database_url: str) -> URL:
+    """Map the sync DATABASE_URL onto its asyncio driver."""
+    url = make_url(database_url)
+    url = url.set(drivername=ASYNC_DRIVERS.get(url.drivername, url.drivername))
+    if url.drivername == "postgresql+asyncpg" and "sslmode" in url.query:
+        # asyncpg spells libpq's sslmode as ssl.
+        query = dict(url.query)
+        query["ssl"] = query.pop("sslmode")
+        url = url.set(query=query)
+    return url
+
+
+def async_connect_args() -> dict:
+    if settings.db_pgbouncer_mode:
+        # Transaction-pooling PgBouncer (e.g. Supabase port 6543) cannot keep
+        # server-side prepared statements across transactions.
+        return {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+    return {}
+
+
+# Create engine (sync: scripts and background workers)
 engine = create_engine(
     settings.database_url,
     echo=False,
-    pool_pre_ping=True,
+    **pool_options(settings.database_url, "primary"),
 )
+instrument_engine(engine, "primary")
+instrument_engine_timing(engine, "primary")
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine used by the API routes
+async_database_url = settings.async_database_url or to_async_url(settings.database_url)
+async_engine = create_async_engine(
+    async_database_url,
+    echo=False,
+    connect_args=async_connect_args(),
+    **pool_options(async_database_url, "primary_async", is_async=True),
+)
+instrument_engine(async_engine.sync_engine, "primary_async")
+instrument_engine_timing(async_engine.sync_engine, "primary_async")
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 # Base for models
 Base = declarative_base()
 
@@ -23,3 +74,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Dependency to get an async DB session."""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,157 @@
+"""Versioned SQL migrations for Postgres.
+
+migrations/NNN_name.sql files are applied in version order, each in its own
+transaction, and recorded with their SHA-256 in the schema_migrations
+ledger. A transaction-scoped advisory lock (safe behind a
+transaction-pooling PgBouncer) makes concurrent workers apply each file
+exactly once; the others wait, see it in the ledger and move on.
+
+When the ledger already lists every file, migrate() returns after a single
+SELECT and takes no lock, so worker start-up does no schema work.
+"""
+import hashlib
+import re
+import time
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "migrations"
+FILENAME = re.compile(r"^(?P<version>\d+)_(?P<name>\w+)\.sql$")
+# Arbitrary constant shared by every process that migrates this database.
+LOCK_KEY = 7_286_401_903
+
+_create_ledger = text(
+    """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version VARCHAR(32) PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        checksum CHAR(64) NOT NULL,
+        applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        duration_ms INTEGER NOT NULL
+    )
+    """
+)
+
+
+class MigrationError(RuntimeError):
+    pass
+
+
+class Migration(NamedTuple):
+    version: str
+    name: str
+    sql: str
+    checksum: str
+
+
+def discover(directory: Path = MIGRATIONS_DIR) -> list[Migration]:
+    migrations = []
+    for path in sorted(directory.glob("*.sql")):
+        match = FILENAME.match(path.name)
+        if not match:
+            raise MigrationError(f"Unexpected file name {path.name} (expected NNN_name.sql)")
+        sql = path.read_text(encoding="utf-8")
+        checksum = hashlib.sha256(sql.encode("utf-8")).hexdigest()
+        migrations.append(Migration(match["version"], match["name"], sql, checksum))
+    versions = [migration.version for migration in migrations]
+    duplicates = {version for version in versions if versions.count(version) > 1}
+    if duplicates:
+        raise MigrationError(f"Duplicate migration versions: {', '.join(sorted(duplicates))}")
+    return sorted(migrations, key=lambda migration: int(migration.version))
+
+
+def applied_checksums(conn: Connection) -> Optional[dict[str, str]]:
+    """version -> checksum from the ledger; None when the ledger doesn't exist yet."""
+    if conn.execute(text("SELECT to_regclass('schema_migrations')")).scalar() is None:
+        return None
+    return dict(conn.execute(text("SELECT version, checksum FROM schema_migrations")).all())
+
+
+def check_drift(migrations: list[Migration], applied: dict[str, str]) -> None:
+    changed = [m.version for m in migrations if m.version in applied and applied[m.version] != m.checksum]
+    if changed:
+        raise MigrationError(
+            f"Applied migrations were edited after they ran: {', '.join(changed)}. "
+            "Add a new migration instead of changing an applied one."
+        )
+
+
+def _require_postgres(engine: Engine) -> None:
+    if engine.dialect.name != "postgresql":
+        raise MigrationError(f"SQL migrations target Postgres, not {engine.dialect.name}")
+
+
+def pending(engine: Engine, migrations: Optional[list[Migration]] = None) -> list[Migration]:
+    _require_postgres(engine)
+    migrations = discover() if migrations is None else migrations
+    with engine.connect() as conn:
+        applied = applied_checksums(conn) or {}
+    check_drift(migrations, applied)
+    return [migration for migration in migrations if migration.version not in applied]
+
+
+def migrate(engine: Engine, migrations: Optional[list[Migration]] = None) -> list[str]:
+    """Apply pending migrations; returns the versions this call applied."""
+    migrations = discover() if migrations is None else migrations
+    if not pending(engine, migrations):
+        return []
+
+    applied_now = []
+    for migration in migrations:
+        try:
+            applied_now += _apply_one(engine, migration)
+        except DBAPIError as exc:
+            raise MigrationError(f"Migration {migration.version}_{migration.name} failed: {exc.orig}") from exc
+    return applied_now
+
+
+def _apply_one(engine: Engine, migration: Migration) -> list[str]:
+    with engine.begin() as conn:
+        conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": LOCK_KEY})
+        conn.execute(_create_ledger)
+        applied = applied_checksums(conn)
+        check_drift([migration], applied)
+        if migration.version in applied:
+            # Another worker got here first.
+            return []
+        started = time.perf_counter()
+        conn.exec_driver_sql(migration.sql)
+        conn.execute(
+            text(
+                "INSERT INTO schema_migrations (version, name, checksum, duration_ms) "
+                "VALUES (:version, :name, :checksum, :duration_ms)"
+            ),
+            {
+                "version": migration.version,
+                "name": migration.name,
+                "checksum": migration.checksum,
+                "duration_ms": int((time.perf_counter() - started) * 1000),
+            },
+        )
+    return [migration.version]
+
+
+def status(engine: Engine) -> list[dict]:
+    _require_postgres(engine)
+    migrations = discover()
+    with engine.connect() as conn:
+        applied = applied_checksums(conn) or {}
+        ledger = {}
+        if applied:
+            ledger = {
+                row.version: row
+                for row in conn.execute(text("SELECT version, applied_at, duration_ms FROM schema_migrations"))
+            }
+    rows = []
+    for migration in migrations:
+        entry = {"version": migration.version, "name": migration.name, "state": "pending"}
+        if migration.version in applied:
+            entry["state"] = "applied" if applied[migration.version] == migration.checksum else "edited"
+            entry["applied_at"] = ledger[migration.version].applied_at
+            entry["duration_ms"] = ledger[migration.version].duration_ms
+        rows.append(entry)
+    return rows
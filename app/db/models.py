@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, Enum, ForeignKey
+from sqlalchemy import BigInteger, Column, String, Integer, Boolean, Date, DateTime, Enum, Float, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -17,6 +17,22 @@ class VideoStatus(str, enum.Enum):
     FAILED = "failed"
 
 
+class PlaybackEventType(str, enum.Enum):
+    PLAY = "play"
+    HEARTBEAT = "heartbeat"
+    PROGRESS = "progress"
+    PAUSE = "pause"
+    ENDED = "ended"
+    ERROR = "error"
+
+
+class JobStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    DEAD = "dead"
+
+
 class User(Base):
     __tablename__ = "users"
 
@@ -29,6 +45,13 @@ class User(Base):
     # Relationships
     videos = relationship("Video", back_populates="creator")
 
+    # Admin user list (migrations/007 adds COLLATE "C" to the email index on Postgres)
+    __table_args__ = (
+        Index("idx_users_created_at_id", created_at.desc(), id.desc()),
+        Index("idx_users_role_created_at_id", role, created_at.desc(), id.desc()),
+        Index("idx_users_email_lower", func.lower(email), id),
+    )
+
 
 class Video(Base):
     __tablename__ = "videos"
@@ -39,6 +62,7 @@ class Video(Base):
     is_premium = Column(Boolean, default=False, nullable=False)
     is_hidden = Column(Boolean, default=False, nullable=False)
     mux_asset_id = Column(String, nullable=True, index=True)
+    mux_upload_id = Column(String, nullable=True, index=True)
     playback_id = Column(String, nullable=True, index=True)
     status = Column(String, default=VideoStatus.PROCESSING.value, nullable=False)
     created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -46,3 +70,108 @@ class Video(Base):
 
     # Relationships
     creator = relationship("User", back_populates="videos")
+
+    __table_args__ = (
+        Index("idx_videos_created_at_id", created_at.desc(), id.desc()),
+    )
+
+
+class VideoJob(Base):
+    """Durable Mux asset creation request for a video row (see app/videos/jobs.py)."""
+
+    __tablename__ = "video_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    video_id = Column(Integer, ForeignKey("videos.id", ondelete="CASCADE"), nullable=False, index=True)
+    input_url = Column(String, nullable=False)
+    status = Column(String, default=JobStatus.QUEUED.value, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, nullable=False)
+    last_error = Column(String, nullable=True)
+    run_after = Column(DateTime, default=datetime.utcnow, nullable=False)
+    locked_at = Column(DateTime, nullable=True)
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    video = relationship("Video")
+
+    __table_args__ = (
+        Index("idx_video_jobs_status_run_after", status, run_after),
+    )
+
+
+class PlaybackEvent(Base):
+    """Append-only player telemetry, written in bulk by app/videos/events.py.
+
+    No foreign keys: every insert would otherwise check users and videos.
+    """
+
+    __tablename__ = "playback_events"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    session_id = Column(String(64), nullable=False)
+    user_id = Column(Integer, nullable=False)
+    video_id = Column(Integer, nullable=False)
+    event_type = Column(String(16), nullable=False)
+    position_seconds = Column(Float, nullable=True)
+    bitrate_kbps = Column(Integer, nullable=True)
+    buffering_ms = Column(Integer, nullable=True)
+    occurred_at = Column(DateTime, nullable=False)
+    received_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        # "Continue watching": latest position per user and video.
+        Index("idx_playback_events_user_video_occurred", user_id, video_id, occurred_at.desc()),
+    )
+
+
+class VideoStatHourly(Base):
+    """Play counts per video and hour, maintained by app/videos/rollups.py."""
+
+    __tablename__ = "video_stats_hourly"
+
+    video_id = Column(Integer, primary_key=True)
+    bucket_start = Column(DateTime, primary_key=True)
+    plays = Column(Integer, default=0, nullable=False)
+
+
+class VideoStatDaily(Base):
+    __tablename__ = "video_stats_daily"
+
+    video_id = Column(Integer, primary_key=True)
+    day = Column(Date, primary_key=True)
+    plays = Column(Integer, default=0, nullable=False)
+
+
+class VideoRollup(Base):
+    """One row per watched video: the keys GET /videos/trending sorts on.
+
+    trend_key is log(sum of exp(decay * (play time - TREND_EPOCH))); every
+    row decays at the same rate, so ordering by it stays correct without
+    rewriting idle rows.
+    """
+
+    __tablename__ = "video_rollups"
+
+    video_id = Column(Integer, primary_key=True)
+    total_plays = Column(BigInteger().with_variant(Integer, "sqlite"), default=0, nullable=False)
+    plays_7d = Column(Integer, default=0, nullable=False)
+    trend_key = Column(Float, nullable=False)
+    last_play_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("idx_video_rollups_trend_key", trend_key.desc()),
+        Index("idx_video_rollups_plays_7d", plays_7d.desc()),
+    )
+
+
+class RollupState(Base):
+    """High-water mark of playback_events already folded into the rollups."""
+
+    __tablename__ = "rollup_state"
+
+    name = Column(String(64), primary_key=True)
+    last_event_id = Column(BigInteger().with_variant(Integer, "sqlite"), default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,134 @@
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+from app.core.config import settings
+
+# name -> PoolStats, one per engine built through pool_options()
+POOL_STATS: dict[str, "PoolStats"] = {}
+
+
+class PoolStats:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.pool: Optional[Pool] = None
+        self.checkouts = 0
+        self.overflow_checkouts = 0
+        self.timeouts = 0
+        self.pings = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self._waits: deque[float] = deque(maxlen=2048)
+        self._lock = threading.Lock()
+
+    def record_checkout(self, wait: float, overflow: bool) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+            self._waits.append(wait)
+            if overflow:
+                self.overflow_checkouts += 1
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        pool = self.pool
+        with self._lock:
+            waits = sorted(self._waits)
+            p99 = waits[min(len(waits) - 1, int(0.99 * (len(waits) - 1)))] if waits else 0.0
+            return {
+                "name": self.name,
+                "pool_size": pool.size() if pool else 0,
+                "checked_out": pool.checkedout() if pool else 0,
+                "idle": pool.checkedin() if pool else 0,
+                "overflow": max(pool.overflow(), 0) if pool else 0,
+                "max_overflow": getattr(pool, "_max_overflow", 0) if pool else 0,
+                "checkouts": self.checkouts,
+                "overflow_checkouts": self.overflow_checkouts,
+                "timeouts": self.timeouts,
+                "pre_pings": self.pings,
+                "wait_avg_ms": round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "wait_p99_ms": round(p99 * 1000, 3),
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+            }
+
+
+def _instrumented(base: type, stats: PoolStats) -> type:
+    # A subclass per engine so pool.recreate() (which rebuilds from
+    # self.__class__) keeps reporting into the same PoolStats.
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            conn = base._do_get(self)
+        except exc.TimeoutError:
+            stats.record_timeout()
+            raise
+        stats.pool = self
+        stats.record_checkout(time.perf_counter() - started, self.overflow() > 0)
+        return conn
+
+    return type(f"Instrumented{base.__name__}", (base,), {"_do_get": _do_get})
+
+
+def pool_options(database_url: str, name: str, is_async: bool = False) -> dict:
+    """create_engine()/create_async_engine() kwargs for the configured pool."""
+    url = make_url(str(database_url))
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        # In-memory SQLite must stay on its single-connection pool.
+        return {}
+
+    stats = POOL_STATS.setdefault(name, PoolStats(name))
+    base = AsyncAdaptedQueuePool if is_async else QueuePool
+    return {
+        "poolclass": _instrumented(base, stats),
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping == "always",
+    }
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """Attach PoolStats to the engine's pool and install the pre-ping policy.
+
+    With DB_POOL_PRE_PING=idle only connections that sat idle longer than
+    DB_POOL_PRE_PING_IDLE_SECONDS are pinged, so hot connections skip the
+    extra round trip that pool_pre_ping costs on every checkout.
+    """
+    stats = POOL_STATS.get(name)
+    if stats:
+        stats.pool = engine.pool
+    if settings.db_pool_pre_ping != "idle":
+        return
+    threshold = settings.db_pool_pre_ping_idle_seconds
+
+    @event.listens_for(engine, "checkin")
+    def _mark_idle(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _ping_if_idle(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < threshold:
+            return
+        if stats:
+            stats.pings += 1
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("SELECT 1")
+        except Exception:
+            raise exc.DisconnectionError()
+        finally:
+            cursor.close()
+
+
+def pool_snapshots() -> list[dict]:
+    return [stats.snapshot() for stats in POOL_STATS.values()]
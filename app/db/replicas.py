@@ -0,0 +1,178 @@
+"""Read-replica routing for read-only API routes.
+
+Routes that only read (the catalog list/detail, the admin user list and
+/auth/me) take their session from get_read_db(), which hands out replicas
+round-robin. A background task pings every replica and takes failing ones
+out of rotation until they answer again; with no healthy replica, or none
+configured, reads go to the primary.
+
+Read-your-writes: write routes call pin_to_primary(), whose cookie sends
+the writer's reads to the primary for DB_READ_YOUR_WRITES_SECONDS on every
+worker, and which also pins this whole process for that window so the
+shared caches are not refilled from a replica that missed the write.
+Background writers (webhooks, reconciler, jobs, ingest) do not pin: under
+steady ingest that would keep every read off the replicas. Their changes
+reach replica readers after normal replication lag.
+"""
+import asyncio
+import itertools
+import logging
+import math
+import time
+from typing import Optional
+
+from fastapi import Request, Response
+from sqlalchemy import text
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.core.config import settings
+from app.core.metrics import DB_READ_ROUTE, instrument_engine_timing
+from app.db.database import AsyncSessionLocal, async_connect_args, to_async_url
+from app.db.pool import instrument_engine, pool_options
+
+logger = logging.getLogger(__name__)
+
+PRIMARY_COOKIE = "horios_primary_until"
+
+
+def replica_urls() -> list[str]:
+    return [url.strip() for url in settings.database_replica_urls.split(",") if url.strip()]
+
+
+class Replica:
+    def __init__(self, index: int, database_url: str) -> None:
+        self.name = f"replica{index}_async"
+        url = to_async_url(database_url)
+        self.engine = create_async_engine(
+            url,
+            echo=False,
+            connect_args=async_connect_args(),
+            **pool_options(url, self.name, is_async=True),
+        )
+        instrument_engine(self.engine.sync_engine, self.name)
+        instrument_engine_timing(self.engine.sync_engine, self.name)
+        self.sessionmaker = async_sessionmaker(
+            self.engine,
+            class_=AsyncSession,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+        self.healthy = True
+        self.last_error: Optional[str] = None
+
+    def mark_down(self, error: Exception) -> None:
+        if self.healthy:
+            logger.warning("Replica %s taken out of rotation: %s", self.name, error)
+        self.healthy = False
+        self.last_error = str(error)
+
+    def mark_up(self) -> None:
+        if not self.healthy:
+            logger.info("Replica %s back in rotation", self.name)
+        self.healthy = True
+        self.last_error = None
+
+    def stats(self) -> dict:
+        return {"name": self.name, "healthy": self.healthy, "last_error": self.last_error}
+
+
+class ReplicaRouter:
+    def __init__(self, urls: list[str]) -> None:
+        self.replicas = [Replica(index, url) for index, url in enumerate(urls, start=1)]
+        self._next = itertools.count()
+        self._last_write = -math.inf
+        self._task: Optional[asyncio.Task] = None
+
+    def record_write(self) -> None:
+        self._last_write = time.monotonic()
+
+    def recently_written(self) -> bool:
+        return time.monotonic() - self._last_write < settings.db_read_your_writes_seconds
+
+    def pick(self) -> Optional[Replica]:
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._next) % len(healthy)]
+
+    async def check(self) -> None:
+        for replica in self.replicas:
+            try:
+                async with asyncio.timeout(settings.db_replica_check_timeout_seconds):
+                    async with replica.engine.connect() as conn:
+                        await conn.execute(text("SELECT 1"))
+            except Exception as e:
+                replica.mark_down(e if str(e) else TimeoutError("health check timed out"))
+            else:
+                replica.mark_up()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.check()
+            except Exception:
+                logger.exception("Replica health check failed")
+            await asyncio.sleep(settings.db_replica_check_interval_seconds)
+
+    def start(self) -> None:
+        if self.replicas and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    def stats(self) -> list[dict]:
+        return [replica.stats() for replica in self.replicas]
+
+
+replica_router = ReplicaRouter(replica_urls())
+
+
+def pin_to_primary(response: Response) -> None:
+    """Keep this client's (and this process's) reads on the primary for a while."""
+    replica_router.record_write()
+    if replica_router.replicas:
+        window = settings.db_read_your_writes_seconds
+        response.set_cookie(
+            PRIMARY_COOKIE,
+            str(int(time.time() + window) + 1),
+            max_age=math.ceil(window),
+            httponly=True,
+            samesite="lax",
+        )
+
+
+def _pinned(request: Request) -> bool:
+    if replica_router.recently_written():
+        return True
+    try:
+        return float(request.cookies.get(PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+async def get_read_db(request: Request):
+    """Dependency for read-only routes: a replica session when one is usable."""
+    replica = None if _pinned(request) else replica_router.pick()
+    if replica is None:
+        DB_READ_ROUTE.labels("primary").inc()
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+
+    DB_READ_ROUTE.labels("replica").inc()
+    async with replica.sessionmaker() as db:
+        try:
+            yield db
+        except (OperationalError, InterfaceError) as e:
+            # Don't wait for the next health check to stop sending traffic.
+            replica.mark_down(e)
+            raise
@@ -0,0 +1,249 @@
+import asyncio
+import random
+import threading
+import time
+from typing import Optional
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from app.core.config import settings
+from app.core.metrics import MUX_ERRORS, MUX_LATENCY, mux_endpoint
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "PUT", "DELETE", "OPTIONS"}
+
+
+class MuxAPIError(RuntimeError):
+    def __init__(self, status_code: int, message: str, retry_after: Optional[str] = None) -> None:
+        super().__init__(f"Mux error {status_code}: {message}")
+        self.status_code = status_code
+        # Raw Retry-After header of a 429, if Mux sent one.
+        self.retry_after = retry_after
+
+
+class MuxUnavailableError(RuntimeError):
+    """Mux is failing or the circuit is open; callers should fail fast."""
+
+
+class CircuitBreaker:
+    """Classic closed -> open -> half-open breaker shared by all Mux clients."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.failures < self.failure_threshold:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def before_call(self) -> bool:
+        """Raises while open; returns True if the caller holds the half-open trial."""
+        with self._lock:
+            state = self.state
+            if state == self.CLOSED:
+                return False
+            if state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+        raise MuxUnavailableError("Mux circuit open")
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """End a call that says nothing about Mux's health (e.g. a 429)."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+def _retry_delay(attempt: int, retry_after: Optional[str]) -> float:
+    if retry_after:
+        try:
+            return min(float(retry_after), settings.mux_backoff_max_seconds)
+        except ValueError:
+            pass
+    # Full jitter: uniform over [0, base * 2^attempt], capped.
+    ceiling = min(settings.mux_backoff_base_seconds * (2 ** attempt), settings.mux_backoff_max_seconds)
+    return random.uniform(0, ceiling)
+
+
+def _error_reason(status_code: Optional[int], error: Exception) -> str:
+    if status_code is not None:
+        return "http_429" if status_code == 429 else f"http_{status_code // 100}xx"
+    if isinstance(error, (requests.Timeout, httpx.TimeoutException)):
+        return "timeout"
+    return "connection"
+
+
+def _should_retry(method: str, status_code: Optional[int], sent: bool) -> bool:
+    # A request that never reached Mux, or one Mux rejected with 429, is safe
+    # to repeat. Anything else is only retried for idempotent methods so a
+    # POST /assets is never duplicated.
+    if not sent or status_code == 429:
+        return True
+    return method in IDEMPOTENT_METHODS and (status_code is None or status_code in RETRY_STATUSES)
+
+
+class MuxHttpClient:
+    """Keep-alive pooled client for the Mux API with retries and a breaker."""
+
+    def __init__(self, breaker: CircuitBreaker, base_url: Optional[str] = None) -> None:
+        self.base_url = (base_url or settings.mux_base_url).rstrip("/")
+        self.breaker = breaker
+        self.timeout = (settings.mux_connect_timeout_seconds, settings.mux_read_timeout_seconds)
+        self.session = requests.Session()
+        self.session.auth = (settings.mux_token_id, settings.mux_token_secret)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=settings.mux_pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(self, method: str, path: str, **kwargs) -> dict:
+        try:
+            trial = self.breaker.before_call()
+        except MuxUnavailableError:
+            MUX_ERRORS.labels("circuit_open").inc()
+            raise
+        try:
+            return self._request(method, path, **kwargs)
+        finally:
+            # Whatever escaped (an unexpected requests error, a bug), the
+            # half-open trial must not stay claimed forever.
+            if trial:
+                self.breaker.release_trial()
+
+    def _request(self, method: str, path: str, **kwargs) -> dict:
+        latency = MUX_LATENCY.labels(method, mux_endpoint(path))
+        attempt = 0
+        while True:
+            status_code = None
+            retry_after = None
+            sent = True
+            started = time.perf_counter()
+            try:
+                response = self.session.request(method, f"{self.base_url}{path}", timeout=self.timeout, **kwargs)
+                latency.observe(time.perf_counter() - started)
+                status_code = response.status_code
+                if response.ok:
+                    self.breaker.record_success()
+                    return response.json()
+                if status_code not in RETRY_STATUSES:
+                    # 4xx other than 429 is our fault, not a Mux outage.
+                    self.breaker.record_success()
+                    MUX_ERRORS.labels(_error_reason(status_code, None)).inc()
+                    raise MuxAPIError(status_code, response.text)
+                retry_after = response.headers.get("Retry-After")
+                error = MuxAPIError(status_code, response.text, retry_after)
+            except requests.exceptions.ConnectTimeout as exc:
+                sent = False
+                error = exc
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                error = exc
+
+            MUX_ERRORS.labels(_error_reason(status_code, error)).inc()
+            if attempt >= settings.mux_max_retries or not _should_retry(method, status_code, sent):
+                if status_code == 429:
+                    # Rate limited, not down: let the caller back off without
+                    # counting it against the breaker.
+                    self.breaker.release_trial()
+                    raise error
+                self.breaker.record_failure()
+                raise MuxUnavailableError(str(error)) from error
+            time.sleep(_retry_delay(attempt, retry_after))
+            attempt += 1
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class AsyncMuxHttpClient:
+    """asyncio counterpart of MuxHttpClient for use from async routes."""
+
+    def __init__(self, breaker: CircuitBreaker, base_url: Optional[str] = None) -> None:
+        self.base_url = (base_url or settings.mux_base_url).rstrip("/")
+        self.breaker = breaker
+        self.client = httpx.AsyncClient(
+            auth=(settings.mux_token_id, settings.mux_token_secret),
+            timeout=httpx.Timeout(
+                settings.mux_read_timeout_seconds,
+                connect=settings.mux_connect_timeout_seconds,
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.mux_pool_size,
+                max_keepalive_connections=settings.mux_pool_size,
+            ),
+        )
+
+    async def request(self, method: str, path: str, **kwargs) -> dict:
+        try:
+            trial = self.breaker.before_call()
+        except MuxUnavailableError:
+            MUX_ERRORS.labels("circuit_open").inc()
+            raise
+        try:
+            return await self._request(method, path, **kwargs)
+        finally:
+            # Also runs on CancelledError when the caller goes away mid-request.
+            if trial:
+                self.breaker.release_trial()
+
+    async def _request(self, method: str, path: str, **kwargs) -> dict:
+        latency = MUX_LATENCY.labels(method, mux_endpoint(path))
+        attempt = 0
+        while True:
+            status_code = None
+            retry_after = None
+            sent = True
+            started = time.perf_counter()
+            try:
+                response = await self.client.request(method, f"{self.base_url}{path}", **kwargs)
+                latency.observe(time.perf_counter() - started)
+                status_code = response.status_code
+                if response.is_success:
+                    self.breaker.record_success()
+                    return response.json()
+                if status_code not in RETRY_STATUSES:
+                    self.breaker.record_success()
+                    MUX_ERRORS.labels(_error_reason(status_code, None)).inc()
+                    raise MuxAPIError(status_code, response.text)
+                retry_after = response.headers.get("Retry-After")
+                error = MuxAPIError(status_code, response.text, retry_after)
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as exc:
+                sent = False
+                error = exc
+            except httpx.TransportError as exc:
+                error = exc
+
+            MUX_ERRORS.labels(_error_reason(status_code, error)).inc()
+            if attempt >= settings.mux_max_retries or not _should_retry(method, status_code, sent):
+                if status_code == 429:
+                    self.breaker.release_trial()
+                    raise error
+                self.breaker.record_failure()
+                raise MuxUnavailableError(str(error)) from error
+            await asyncio.sleep(_retry_delay(attempt, retry_after))
+            attempt += 1
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
@@ -0,0 +1,301 @@
+"""In-process stand-in for the Mux Video API, for offline runs and benchmarks.
+
+Also fakes direct uploads: POST /video/v1/uploads hands out an upload URL on
+this server that speaks the resumable PUT protocol Mux's upload URLs use
+(Content-Range chunks, 308 with a Range header until the last byte).
+
+Usage:
+    python -m app.mux.fake_server --port 8765 --ready-after 5
+
+Then point the API at it with MUX_BASE_URL=http://127.0.0.1:8765/video/v1
+"""
+import argparse
+import hashlib
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+ASSET_PATH = re.compile(r"^/video/v1/assets/(?P<asset_id>[\w-]+)$")
+UPLOAD_PATH = re.compile(r"^/video/v1/uploads/(?P<upload_id>[\w-]+)$")
+UPLOAD_PUT_PATH = re.compile(r"^/upload/(?P<upload_id>[\w-]+)$")
+CONTENT_RANGE = re.compile(r"^bytes (?:(?P<start>\d+)-(?P<end>\d+)|\*)/(?P<total>\d+|\*)$")
+
+
+class FakeMuxState:
+    def __init__(self, ready_after: float = 0.0, latency: float = 0.0) -> None:
+        self.ready_after = ready_after
+        self.latency = latency
+        self.assets: dict[str, dict] = {}
+        self.forced_status: dict[str, str] = {}
+        self.uploads: dict[str, dict] = {}
+        # PUTs to fail with a 503 after persisting only half their bytes.
+        self.fail_next_puts = 0
+        # Asset POSTs to answer with 429 (Retry-After: 0).
+        self.rate_limit_next_posts = 0
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def create_asset(self, input_url: str) -> dict:
+        asset_id = uuid.uuid4().hex
+        asset = {
+            "id": asset_id,
+            "status": "preparing",
+            "input_url": input_url,
+            "created_at": time.time(),
+            "playback_ids": [{"id": uuid.uuid4().hex, "policy": "public"}],
+        }
+        with self.lock:
+            self.assets[asset_id] = asset
+        return self.render(asset)
+
+    def create_upload(self, base_url: str) -> dict:
+        upload_id = uuid.uuid4().hex
+        upload = {
+            "id": upload_id,
+            "status": "waiting",
+            "url": f"{base_url}/upload/{upload_id}",
+            "received": 0,
+            "total": None,
+            "sha256": hashlib.sha256(),
+            "asset_id": None,
+        }
+        with self.lock:
+            self.uploads[upload_id] = upload
+        return self.render_upload(upload)
+
+    def render_upload(self, upload: dict) -> dict:
+        body = {"id": upload["id"], "status": upload["status"], "url": upload["url"], "timeout": 3600}
+        if upload["asset_id"]:
+            body["asset_id"] = upload["asset_id"]
+        return body
+
+    def complete_upload(self, upload: dict) -> None:
+        asset = self.create_asset(f"upload://{upload['id']}")
+        upload["asset_id"] = asset["id"]
+        upload["status"] = "asset_created"
+
+    def set_status(self, asset_id: str, status: str) -> None:
+        with self.lock:
+            self.forced_status[asset_id] = status
+
+    def get_asset(self, asset_id: str) -> Optional[dict]:
+        with self.lock:
+            asset = self.assets.get(asset_id)
+        return self.render(asset) if asset else None
+
+    def render(self, asset: dict) -> dict:
+        status = self.forced_status.get(asset["id"])
+        if status is None:
+            elapsed = time.time() - asset["created_at"]
+            status = "ready" if elapsed >= self.ready_after else "preparing"
+        return {
+            "id": asset["id"],
+            "status": status,
+            "playback_ids": asset["playback_ids"],
+        }
+
+
+class FakeMuxHandler(BaseHTTPRequestHandler):
+    server_version = "FakeMux/1.0"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def state(self) -> FakeMuxState:
+        return self.server.state
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length))
+
+    def _send_json(self, status: int, body: dict) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _before(self) -> None:
+        with self.state.lock:
+            self.state.requests += 1
+        if self.state.latency:
+            time.sleep(self.state.latency)
+
+    def do_POST(self) -> None:
+        self._before()
+        if self.path == "/video/v1/assets":
+            body = self._read_json()
+            with self.state.lock:
+                limited = self.state.rate_limit_next_posts > 0
+                if limited:
+                    self.state.rate_limit_next_posts -= 1
+            if limited:
+                payload = b'{"error": {"type": "too_many_requests"}}'
+                self.send_response(429)
+                self.send_header("Retry-After", "0")
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+                return
+            inputs = body.get("input") or [{}]
+            asset = self.state.create_asset(inputs[0].get("url", ""))
+            self._send_json(201, {"data": asset})
+            return
+        if self.path == "/video/v1/uploads":
+            self._read_json()
+            host, port = self.server.server_address[:2]
+            self._send_json(201, {"data": self.state.create_upload(f"http://{host}:{port}")})
+            return
+        self._send_json(404, {"error": {"type": "not_found"}})
+
+    def do_GET(self) -> None:
+        self._before()
+        match = ASSET_PATH.match(self.path)
+        if match:
+            asset = self.state.get_asset(match.group("asset_id"))
+            if asset is None:
+                self._send_json(404, {"error": {"type": "not_found"}})
+                return
+            self._send_json(200, {"data": asset})
+            return
+        match = UPLOAD_PATH.match(self.path)
+        if match:
+            upload = self.state.uploads.get(match.group("upload_id"))
+            if upload is None:
+                self._send_json(404, {"error": {"type": "not_found"}})
+                return
+            self._send_json(200, {"data": self.state.render_upload(upload)})
+            return
+        if self.path.split("?")[0] == "/video/v1/assets":
+            with self.state.lock:
+                assets = list(self.state.assets.values())
+            self._send_json(200, {"data": [self.state.render(a) for a in assets]})
+            return
+        self._send_json(404, {"error": {"type": "not_found"}})
+
+
+    def _send_upload_progress(self, upload: dict) -> None:
+        self.send_response(308)
+        if upload["received"]:
+            self.send_header("Range", f"bytes=0-{upload['received'] - 1}")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_PUT(self) -> None:
+        self._before()
+        match = UPLOAD_PUT_PATH.match(self.path)
+        upload = self.state.uploads.get(match.group("upload_id")) if match else None
+        length = int(self.headers.get("Content-Length") or 0)
+        content_range = CONTENT_RANGE.match(self.headers.get("Content-Range", ""))
+        if upload is None or content_range is None:
+            self.rfile.read(length)
+            self._send_json(404 if upload is None else 400, {"error": {"type": "invalid_request"}})
+            return
+
+        total = content_range.group("total")
+        if total != "*":
+            upload["total"] = int(total)
+        start = content_range.group("start")
+        fail = False
+        with self.state.lock:
+            if self.state.fail_next_puts and length:
+                self.state.fail_next_puts -= 1
+                fail = True
+
+        if start is None or int(start) != upload["received"]:
+            # Status query, or a chunk that doesn't continue where we are.
+            self.rfile.read(length)
+        else:
+            keep = length // 2 if fail else length
+            remaining = length
+            while remaining:
+                data = self.rfile.read(min(remaining, 64 * 1024))
+                if not data:
+                    break
+                if keep > 0:
+                    upload["sha256"].update(data[:keep])
+                    upload["received"] += len(data[:keep])
+                    keep -= len(data[:keep])
+                remaining -= len(data)
+            if fail:
+                self._send_json(503, {"error": {"type": "unavailable"}})
+                return
+
+        if upload["total"] is not None and upload["received"] >= upload["total"]:
+            if upload["status"] == "waiting":
+                self.state.complete_upload(upload)
+            self._send_json(200, {})
+            return
+        self._send_upload_progress(upload)
+
+
+class FakeMuxServer:
+    """Runs FakeMuxHandler on a background thread; port=0 picks a free port."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        ready_after: float = 0.0,
+        latency: float = 0.0,
+    ) -> None:
+        self.state = FakeMuxState(ready_after=ready_after, latency=latency)
+        self.httpd = ThreadingHTTPServer((host, port), FakeMuxHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.state = self.state
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/video/v1"
+
+    def start(self) -> "FakeMuxServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="fake-mux", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> "FakeMuxServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run a fake Mux API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--ready-after", type=float, default=5.0, help="seconds before assets turn ready")
+    parser.add_argument("--latency", type=float, default=0.0, help="artificial per-request latency")
+    args = parser.parse_args()
+
+    server = FakeMuxServer(args.host, args.port, args.ready_after, args.latency)
+    print(f"Fake Mux listening on {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
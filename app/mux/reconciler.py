@@ -0,0 +1,227 @@
+import logging
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from sqlalchemy import bindparam, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.models import Video, VideoStatus
+from app.mux.service import MuxService, get_mux_service
+from app.mux.uploads import FAILED_UPLOAD_STATUSES
+from app.videos.cache import invalidate_catalog
+
+logger = logging.getLogger(__name__)
+
+videos_table = Video.__table__
+
+# Only rows that are still processing are touched, so a status written
+# concurrently (e.g. by a webhook) is never overwritten by a stale poll.
+_bulk_status_update = (
+    videos_table.update()
+    .where(
+        videos_table.c.id == bindparam("video_id"),
+        videos_table.c.status == VideoStatus.PROCESSING.value,
+    )
+    .values(status=bindparam("new_status"))
+)
+
+
+# Direct uploads get their asset ids once Mux has created the asset.
+_bulk_upload_update = (
+    videos_table.update()
+    .where(
+        videos_table.c.id == bindparam("video_id"),
+        videos_table.c.mux_asset_id.is_(None),
+    )
+    .values(
+        mux_asset_id=bindparam("new_asset_id"),
+        playback_id=bindparam("new_playback_id"),
+        status=bindparam("new_status"),
+    )
+)
+
+
+@dataclass
+class ReconcileResult:
+    checked: int = 0
+    changed: int = 0
+    failed: int = 0
+    uploads_resolved: int = 0
+
+
+class MuxStatusReconciler:
+    """Background poller that moves PROCESSING videos to their Mux status."""
+
+    def __init__(
+        self,
+        mux_service: Optional[MuxService] = None,
+        session_factory: Callable[[], Session] = SessionLocal,
+        interval: Optional[float] = None,
+        max_interval: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+    ) -> None:
+        self.mux_service = mux_service or get_mux_service()
+        self.session_factory = session_factory
+        self.interval = interval or settings.mux_reconcile_interval_seconds
+        self.max_interval = max_interval or settings.mux_reconcile_max_interval_seconds
+        self.batch_size = batch_size or settings.mux_reconcile_batch_size
+        self.concurrency = concurrency or settings.mux_reconcile_concurrency
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _fetch_status(self, row) -> Optional[str]:
+        try:
+            mux_status = self.mux_service.get_asset_status(row.mux_asset_id)
+        except Exception as exc:
+            logger.warning("Mux status check failed for asset %s: %s", row.mux_asset_id, exc)
+            return None
+        return MuxService.to_video_status(mux_status)
+
+    def _load_batch(self, after_id: int) -> list:
+        with self.session_factory() as db:
+            return db.execute(
+                select(Video.id, Video.mux_asset_id)
+                .where(
+                    Video.status == VideoStatus.PROCESSING.value,
+                    Video.mux_asset_id.isnot(None),
+                    Video.id > after_id,
+                )
+                .order_by(Video.id)
+                .limit(self.batch_size)
+            ).all()
+
+    def _resolve_upload(self, row) -> Optional[dict]:
+        try:
+            upload = self.mux_service.get_upload(row.mux_upload_id)
+            if upload.get("asset_id"):
+                mux_asset_id, playback_id = self.mux_service.get_asset_ids(upload["asset_id"])
+                return {
+                    "video_id": row.id,
+                    "new_asset_id": mux_asset_id,
+                    "new_playback_id": playback_id,
+                    "new_status": VideoStatus.PROCESSING.value,
+                }
+        except Exception as exc:
+            logger.warning("Mux upload check failed for %s: %s", row.mux_upload_id, exc)
+            return None
+        if upload.get("status") in FAILED_UPLOAD_STATUSES:
+            return {
+                "video_id": row.id,
+                "new_asset_id": None,
+                "new_playback_id": None,
+                "new_status": VideoStatus.FAILED.value,
+            }
+        return None
+
+    def _load_upload_batch(self, after_id: int) -> list:
+        with self.session_factory() as db:
+            return db.execute(
+                select(Video.id, Video.mux_upload_id)
+                .where(
+                    Video.status == VideoStatus.PROCESSING.value,
+                    Video.mux_upload_id.isnot(None),
+                    Video.mux_asset_id.is_(None),
+                    Video.id > after_id,
+                )
+                .order_by(Video.id)
+                .limit(self.batch_size)
+            ).all()
+
+    def resolve_uploads(self, executor: ThreadPoolExecutor) -> int:
+        resolved = 0
+        after_id = 0
+        while not self._stop.is_set():
+            rows = self._load_upload_batch(after_id)
+            if not rows:
+                break
+            after_id = rows[-1].id
+
+            changes = [change for change in executor.map(self._resolve_upload, rows) if change]
+            if changes:
+                with self.session_factory() as db:
+                    db.execute(_bulk_upload_update, changes)
+                    db.commit()
+                invalidate_catalog([change["video_id"] for change in changes])
+                resolved += len(changes)
+
+            if len(rows) < self.batch_size:
+                break
+        return resolved
+
+    def _write_changes(self, changes: list[dict]) -> None:
+        with self.session_factory() as db:
+            db.execute(_bulk_status_update, changes)
+            db.commit()
+        invalidate_catalog([change["video_id"] for change in changes])
+
+    def run_once(self) -> ReconcileResult:
+        result = ReconcileResult()
+        after_id = 0
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            result.uploads_resolved = self.resolve_uploads(executor)
+            while not self._stop.is_set():
+                rows = self._load_batch(after_id)
+                if not rows:
+                    break
+                after_id = rows[-1].id
+
+                changes = []
+                for row, new_status in zip(rows, executor.map(self._fetch_status, rows)):
+                    result.checked += 1
+                    if new_status is None:
+                        result.failed += 1
+                    elif new_status != VideoStatus.PROCESSING.value:
+                        changes.append({"video_id": row.id, "new_status": new_status})
+
+                if changes:
+                    self._write_changes(changes)
+                    result.changed += len(changes)
+
+                if len(rows) < self.batch_size:
+                    break
+        return result
+
+    def _next_delay(self, delay: float, result: Optional[ReconcileResult]) -> float:
+        # Back off exponentially while Mux (or the DB) is failing, then snap
+        # back to the configured interval on the first healthy pass.
+        if result is None or (result.checked and result.failed == result.checked):
+            delay = min(delay * 2, self.max_interval)
+        else:
+            delay = self.interval
+        return delay * random.uniform(0.9, 1.1)
+
+    def _run(self) -> None:
+        delay = self.interval
+        while not self._stop.is_set():
+            try:
+                result = self.run_once()
+                if result.checked:
+                    logger.info(
+                        "Mux reconcile: checked=%s changed=%s failed=%s",
+                        result.checked,
+                        result.changed,
+                        result.failed,
+                    )
+            except Exception:
+                logger.exception("Mux reconcile pass failed")
+                result = None
+            delay = self._next_delay(delay, result)
+            self._stop.wait(delay)
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="mux-reconciler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
@@ -0,0 +1,53 @@
+import json
+from fastapi import APIRouter, HTTPException, Request, status
+from app.core.config import settings
+from app.mux.schemas import WebhookAck
+from app.mux.webhooks import EVENT_STATUS, InvalidSignatureError, verify_signature, webhook_ingestor
+
+router = APIRouter(prefix="/mux", tags=["mux"])
+
+
+@router.post("/webhooks", response_model=WebhookAck)
+async def receive_webhook(request: Request):
+    if not settings.mux_webhook_secret:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Webhook secret not configured",
+        )
+
+    body = await request.body()
+    try:
+        verify_signature(
+            body,
+            request.headers.get("mux-signature"),
+            settings.mux_webhook_secret,
+            settings.mux_webhook_tolerance_seconds,
+        )
+    except InvalidSignatureError as exc:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(exc))
+
+    malformed = HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Malformed event")
+    try:
+        event = json.loads(body)
+    except ValueError:
+        raise malformed
+    if not isinstance(event, dict):
+        raise malformed
+    event_id, event_type = event.get("id"), event.get("type")
+    data, obj = event.get("data") or {}, event.get("object") or {}
+    if not isinstance(event_id, str) or not isinstance(event_type, str):
+        raise malformed
+    if not isinstance(data, dict) or not isinstance(obj, dict):
+        raise malformed
+
+    new_status = EVENT_STATUS.get(event_type)
+    asset_id = data.get("id") or obj.get("id")
+    if new_status is None or not asset_id:
+        return WebhookAck(status="ignored")
+    if not isinstance(asset_id, str):
+        raise malformed
+
+    # Only buffer here; the ingestor writes to the DB off the request path.
+    if not webhook_ingestor.submit(event_id, asset_id, new_status):
+        return WebhookAck(status="duplicate")
+    return WebhookAck(status="accepted")
@@ -1,41 +1,113 @@
-from typing import Tuple
-import requests
+from functools import lru_cache
+from typing import Optional, Tuple
 from app.core.config import settings
+from app.db.models import VideoStatus
+from app.mux.client import AsyncMuxHttpClient, CircuitBreaker, MuxHttpClient
+
+MUX_STATUS_MAP = {
+    "ready": VideoStatus.READY.value,
+    "errored": VideoStatus.FAILED.value,
+}
+
+
+def _asset_payload(input_url: str) -> dict:
+    return {
+        "input": [{"url": input_url}],
+        "playback_policy": ["public"],
+    }
+
+
+def _upload_payload() -> dict:
+    return {
+        "new_asset_settings": {"playback_policy": ["public"]},
+        "cors_origin": settings.mux_upload_cors_origin,
+    }
+
+
+def _asset_ids(data: dict) -> Tuple[str, str]:
+    mux_asset_id = data["id"]
+    playback_id = data["playback_ids"][0]["id"]
+    return mux_asset_id, playback_id
 
 
 class MuxService:
-    def __init__(self) -> None:
-        self.base_url = "https://api.mux.com/video/v1"
-        self.auth = (settings.mux_token_id, settings.mux_token_secret)
+    def __init__(self, client: Optional[MuxHttpClient] = None) -> None:
+        self.client = client or MuxHttpClient(get_circuit_breaker())
+        self.base_url = self.client.base_url
 
     def create_asset(self, input_url: str) -> Tuple[str, str]:
-        payload = {
-            "input": [{"url": input_url}],
-            "playback_policy": ["public"],
-        }
-        response = requests.post(
-            f"{self.base_url}/assets",
-            json=payload,
-            auth=self.auth,
-            timeout=30,
-        )
-        if not response.ok:
-            raise RuntimeError(f"Mux error {response.status_code}: {response.text}")
-        data = response.json()["data"]
-        mux_asset_id = data["id"]
-        playback_id = data["playback_ids"][0]["id"]
-        return mux_asset_id, playback_id
+        data = self.client.request("POST", "/assets", json=_asset_payload(input_url))["data"]
+        return _asset_ids(data)
 
     def get_asset_status(self, mux_asset_id: str) -> str:
-        response = requests.get(
-            f"{self.base_url}/assets/{mux_asset_id}",
-            auth=self.auth,
-            timeout=30,
-        )
-        response.raise_for_status()
-        data = response.json()["data"]
+        data = self.client.request("GET", f"/assets/{mux_asset_id}")["data"]
         return data.get("status", "processing")
 
+    def get_asset_ids(self, mux_asset_id: str) -> Tuple[str, str]:
+        return _asset_ids(self.client.request("GET", f"/assets/{mux_asset_id}")["data"])
+
+    def create_direct_upload(self) -> Tuple[str, str]:
+        """Returns (upload id, URL to PUT the file to)."""
+        data = self.client.request("POST", "/uploads", json=_upload_payload())["data"]
+        return data["id"], data["url"]
+
+    def get_upload(self, upload_id: str) -> dict:
+        return self.client.request("GET", f"/uploads/{upload_id}")["data"]
+
+    @staticmethod
+    def to_video_status(mux_status: str) -> str:
+        return MUX_STATUS_MAP.get(mux_status, VideoStatus.PROCESSING.value)
+
     @staticmethod
     def get_public_playback_url(playback_id: str) -> str:
         return f"https://stream.mux.com/{playback_id}.m3u8"
+
+    @staticmethod
+    def get_thumbnail_url(playback_id: str) -> str:
+        return f"https://image.mux.com/{playback_id}/thumbnail.jpg?time=0"
+
+
+class AsyncMuxService:
+    def __init__(self, client: Optional[AsyncMuxHttpClient] = None) -> None:
+        self.client = client or AsyncMuxHttpClient(get_circuit_breaker())
+        self.base_url = self.client.base_url
+
+    async def create_asset(self, input_url: str) -> Tuple[str, str]:
+        data = (await self.client.request("POST", "/assets", json=_asset_payload(input_url)))["data"]
+        return _asset_ids(data)
+
+    async def get_asset_status(self, mux_asset_id: str) -> str:
+        data = (await self.client.request("GET", f"/assets/{mux_asset_id}"))["data"]
+        return data.get("status", "processing")
+
+    async def get_asset_ids(self, mux_asset_id: str) -> Tuple[str, str]:
+        return _asset_ids((await self.client.request("GET", f"/assets/{mux_asset_id}"))["data"])
+
+    async def create_direct_upload(self) -> Tuple[str, str]:
+        data = (await self.client.request("POST", "/uploads", json=_upload_payload()))["data"]
+        return data["id"], data["url"]
+
+    async def get_upload(self, upload_id: str) -> dict:
+        return (await self.client.request("GET", f"/uploads/{upload_id}"))["data"]
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+@lru_cache
+def get_circuit_breaker() -> CircuitBreaker:
+    return CircuitBreaker(
+        failure_threshold=settings.mux_breaker_failure_threshold,
+        reset_timeout=settings.mux_breaker_reset_seconds,
+    )
+
+
+@lru_cache
+def get_mux_service() -> MuxService:
+    """Process-wide MuxService so every caller shares one connection pool."""
+    return MuxService()
+
+
+@lru_cache
+def get_async_mux_service() -> AsyncMuxService:
+    return AsyncMuxService()
@@ -0,0 +1,242 @@
+"""Resumable chunked PUTs to Mux direct-upload URLs.
+
+The URL returned by POST /uploads accepts the resumable protocol: each PUT
+carries `Content-Range: bytes <start>-<end>/<total>` (total may be `*`
+until the last chunk), the server answers 308 with a `Range` header naming
+the bytes it has persisted, and 200/201 once the final byte arrives. After
+a failed PUT we ask for the persisted offset (`bytes */<total>`) and resend
+from there, so only the unpersisted tail of one chunk is ever repeated.
+
+Chunks of one upload must arrive in order, so a single file is streamed
+sequentially; parallelism comes from uploading several files at once.
+Only one chunk per upload is held in memory.
+"""
+import asyncio
+import os
+import random
+import time
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+import httpx
+import requests
+from app.core.config import settings
+from app.mux.service import AsyncMuxService, MuxService
+
+CHUNK_ALIGNMENT = 256 * 1024
+FAILED_UPLOAD_STATUSES = {"errored", "cancelled", "timed_out"}
+
+Progress = Callable[[int, Optional[int]], None]
+
+
+class UploadError(RuntimeError):
+    pass
+
+
+def aligned_chunk_size(chunk_size: Optional[int] = None) -> int:
+    size = chunk_size or settings.mux_upload_chunk_bytes
+    return max(CHUNK_ALIGNMENT, size - size % CHUNK_ALIGNMENT)
+
+
+def content_range(start: int, length: int, total: Optional[int]) -> str:
+    size = "*" if total is None else str(total)
+    if length == 0:
+        return f"bytes */{size}"
+    return f"bytes {start}-{start + length - 1}/{size}"
+
+
+def persisted_offset(headers) -> int:
+    """Bytes persisted so far, from a 308's `Range: bytes=0-<last>` header."""
+    value = headers.get("Range")
+    if not value:
+        return 0
+    return int(value.rsplit("-", 1)[1]) + 1
+
+
+def _retry_delay(attempt: int) -> float:
+    return random.uniform(0, min(settings.mux_backoff_base_seconds * 2 ** attempt, settings.mux_backoff_max_seconds))
+
+
+def _is_fatal(status_code: int) -> bool:
+    return 400 <= status_code < 500 and status_code not in (408, 429)
+
+
+class ChunkedUploader:
+    """Sends one upload's bytes in order; call send() per chunk, final=True last."""
+
+    def __init__(
+        self,
+        url: str,
+        total_size: Optional[int] = None,
+        session: Optional[requests.Session] = None,
+        progress: Optional[Progress] = None,
+        max_retries: Optional[int] = None,
+    ) -> None:
+        self.url = url
+        self.total_size = total_size
+        self.session = session or requests.Session()
+        self.progress = progress
+        self.max_retries = settings.mux_upload_max_retries if max_retries is None else max_retries
+        self.timeout = (settings.mux_connect_timeout_seconds, max(settings.mux_read_timeout_seconds, 60.0))
+        self.offset = 0
+        self.completed = False
+
+    def _put(self, data: bytes, total: Optional[int]) -> Optional[requests.Response]:
+        try:
+            return self.session.put(
+                self.url,
+                data=data,
+                headers={"Content-Range": content_range(self.offset, len(data), total)},
+                timeout=self.timeout,
+            )
+        except requests.RequestException:
+            return None
+
+    def _apply(self, response: Optional[requests.Response], end: int) -> bool:
+        """Update offset from a response; True when [.., end) is persisted."""
+        if response is None:
+            return False
+        if response.status_code in (200, 201):
+            self.offset = end
+            self.completed = True
+        elif response.status_code == 308:
+            self.offset = persisted_offset(response.headers)
+        elif _is_fatal(response.status_code):
+            raise UploadError(f"Upload rejected with HTTP {response.status_code}")
+        else:
+            return False
+        if self.progress:
+            self.progress(self.offset, self.total_size)
+        return self.offset >= end and (self.completed or end != self.total_size)
+
+    def send(self, data: bytes, final: bool = False) -> None:
+        start = self.offset
+        end = start + len(data)
+        if final:
+            self.total_size = end
+        total = self.total_size
+        failures = 0
+        while True:
+            before = self.offset
+            response = self._put(data[self.offset - start:], total)
+            if self._apply(response, end):
+                return
+            if response is not None and response.status_code == 308 and self.offset > before:
+                continue  # partial write; send the rest right away
+            failures += 1
+            if failures > self.max_retries:
+                raise UploadError(f"Upload stalled at byte {self.offset} after {failures} failed attempts")
+            time.sleep(_retry_delay(failures))
+            # Ask where the server really is before resending.
+            if self._apply(self._put(b"", total), end):
+                return
+            if self.offset < start:
+                raise UploadError(f"Server lost persisted bytes ({self.offset} < {start})")
+
+    def upload_file(self, path: Path, chunk_size: Optional[int] = None) -> None:
+        size = aligned_chunk_size(chunk_size)
+        self.total_size = os.path.getsize(path)
+        if not self.total_size:
+            raise UploadError(f"{path} is empty")
+        with open(path, "rb") as source:
+            while not self.completed:
+                source.seek(self.offset)
+                chunk = source.read(size)
+                self.send(chunk, final=self.offset + len(chunk) >= self.total_size)
+
+
+class AsyncChunkedUploader:
+    """asyncio twin of ChunkedUploader, for streaming a request body through."""
+
+    def __init__(
+        self,
+        url: str,
+        client: httpx.AsyncClient,
+        progress: Optional[Progress] = None,
+        max_retries: Optional[int] = None,
+    ) -> None:
+        self.url = url
+        self.client = client
+        self.total_size: Optional[int] = None
+        self.progress = progress
+        self.max_retries = settings.mux_upload_max_retries if max_retries is None else max_retries
+        self.offset = 0
+        self.completed = False
+
+    async def _put(self, data: bytes, total: Optional[int]) -> Optional[httpx.Response]:
+        try:
+            return await self.client.put(
+                self.url,
+                content=data,
+                headers={"Content-Range": content_range(self.offset, len(data), total)},
+            )
+        except httpx.HTTPError:
+            return None
+
+    def _apply(self, response: Optional[httpx.Response], end: int) -> bool:
+        if response is None:
+            return False
+        if response.status_code in (200, 201):
+            self.offset = end
+            self.completed = True
+        elif response.status_code == 308:
+            self.offset = persisted_offset(response.headers)
+        elif _is_fatal(response.status_code):
+            raise UploadError(f"Upload rejected with HTTP {response.status_code}")
+        else:
+            return False
+        if self.progress:
+            self.progress(self.offset, self.total_size)
+        return self.offset >= end and (self.completed or end != self.total_size)
+
+    async def send(self, data: bytes, final: bool = False) -> None:
+        start = self.offset
+        end = start + len(data)
+        if final:
+            self.total_size = end
+        total = self.total_size
+        failures = 0
+        while True:
+            before = self.offset
+            response = await self._put(data[self.offset - start:], total)
+            if self._apply(response, end):
+                return
+            if response is not None and response.status_code == 308 and self.offset > before:
+                continue
+            failures += 1
+            if failures > self.max_retries:
+                raise UploadError(f"Upload stalled at byte {self.offset} after {failures} failed attempts")
+            await asyncio.sleep(_retry_delay(failures))
+            if self._apply(await self._put(b"", total), end):
+                return
+            if self.offset < start:
+                raise UploadError(f"Server lost persisted bytes ({self.offset} < {start})")
+
+
+def wait_for_asset(mux_service: MuxService, upload_id: str, timeout: Optional[float] = None) -> Optional[Tuple[str, str]]:
+    """Poll the upload until Mux creates its asset; None if it is still pending."""
+    deadline = time.monotonic() + (settings.mux_upload_asset_wait_seconds if timeout is None else timeout)
+    while True:
+        upload = mux_service.get_upload(upload_id)
+        if upload.get("asset_id"):
+            return mux_service.get_asset_ids(upload["asset_id"])
+        if upload.get("status") in FAILED_UPLOAD_STATUSES:
+            raise UploadError(f"Mux upload {upload_id} {upload['status']}")
+        if time.monotonic() >= deadline:
+            return None
+        time.sleep(0.5)
+
+
+async def await_asset(
+    mux_service: AsyncMuxService, upload_id: str, timeout: Optional[float] = None,
+) -> Optional[Tuple[str, str]]:
+    deadline = time.monotonic() + (settings.mux_upload_asset_wait_seconds if timeout is None else timeout)
+    while True:
+        upload = await mux_service.get_upload(upload_id)
+        if upload.get("asset_id"):
+            return await mux_service.get_asset_ids(upload["asset_id"])
+        if upload.get("status") in FAILED_UPLOAD_STATUSES:
+            raise UploadError(f"Mux upload {upload_id} {upload['status']}")
+        if time.monotonic() >= deadline:
+            return None
+        await asyncio.sleep(0.5)
@@ -0,0 +1,176 @@
+import hashlib
+import hmac
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from sqlalchemy import bindparam, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.models import Video, VideoStatus
+from app.videos.cache import invalidate_catalog
+
+logger = logging.getLogger(__name__)
+
+EVENT_STATUS = {
+    "video.asset.ready": VideoStatus.READY.value,
+    "video.asset.errored": VideoStatus.FAILED.value,
+}
+
+videos_table = Video.__table__
+
+_bulk_status_update = (
+    videos_table.update()
+    .where(
+        videos_table.c.mux_asset_id == bindparam("asset_id"),
+        videos_table.c.status != bindparam("new_status"),
+    )
+    .values(status=bindparam("new_status"))
+)
+
+
+class InvalidSignatureError(Exception):
+    pass
+
+
+def sign_payload(body: bytes, secret: str, timestamp: Optional[int] = None) -> str:
+    """Build a Mux-Signature header value (used by the replay tool and fakes)."""
+    timestamp = int(time.time()) if timestamp is None else timestamp
+    digest = hmac.new(secret.encode(), f"{timestamp}.".encode() + body, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={digest}"
+
+
+def verify_signature(body: bytes, header: Optional[str], secret: str, tolerance: int) -> None:
+    if not header:
+        raise InvalidSignatureError("Missing signature")
+    parts = {}
+    for item in header.split(","):
+        key, _, value = item.strip().partition("=")
+        parts.setdefault(key, []).append(value)
+    try:
+        timestamp = int(parts["t"][0])
+    except (KeyError, ValueError):
+        raise InvalidSignatureError("Malformed signature")
+    if tolerance and abs(time.time() - timestamp) > tolerance:
+        raise InvalidSignatureError("Signature timestamp outside tolerance")
+
+    expected = hmac.new(secret.encode(), f"{timestamp}.".encode() + body, hashlib.sha256).hexdigest()
+    if not any(hmac.compare_digest(expected, candidate) for candidate in parts.get("v1", [])):
+        raise InvalidSignatureError("Signature mismatch")
+
+
+class WebhookIngestor:
+    """Buffers Mux asset events and applies them to videos in coalesced batches.
+
+    Events are de-duplicated on their id, and only the latest status per
+    asset survives until the next flush, so a burst of N events costs one
+    executemany UPDATE instead of N transactions.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        flush_interval: Optional[float] = None,
+        max_batch: Optional[int] = None,
+        dedupe_size: Optional[int] = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval or settings.mux_webhook_flush_interval_seconds
+        self.max_batch = max_batch or settings.mux_webhook_max_batch
+        self.dedupe_size = dedupe_size or settings.mux_webhook_dedupe_size
+        self._seen: OrderedDict[str, None] = OrderedDict()
+        self._pending: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"received": 0, "duplicates": 0, "coalesced": 0, "flushes": 0, "rows_updated": 0}
+
+    def submit(self, event_id: str, asset_id: str, new_status: str) -> bool:
+        """Queue a status change. Returns False if the event was already seen."""
+        with self._lock:
+            if event_id in self._seen:
+                self.stats["duplicates"] += 1
+                return False
+            self._seen[event_id] = None
+            if len(self._seen) > self.dedupe_size:
+                self._seen.popitem(last=False)
+            self.stats["received"] += 1
+            if asset_id in self._pending:
+                self.stats["coalesced"] += 1
+            self._pending[asset_id] = new_status
+            should_wake = len(self._pending) >= self.max_batch
+        if should_wake:
+            self._wakeup.set()
+        return True
+
+    def flush(self) -> int:
+        with self._lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, {}
+
+        try:
+            with self.session_factory() as db:
+                # rowcount is not reliable for executemany on every driver, so
+                # find the rows that will change first and only touch those.
+                rows = db.execute(
+                    select(Video.id, Video.mux_asset_id, Video.status).where(Video.mux_asset_id.in_(list(batch)))
+                ).all()
+                changed = [row for row in rows if row.status != batch[row.mux_asset_id]]
+                if changed:
+                    assets = {row.mux_asset_id for row in changed}
+                    db.execute(
+                        _bulk_status_update,
+                        [{"asset_id": asset_id, "new_status": batch[asset_id]} for asset_id in assets],
+                    )
+                    db.commit()
+        except Exception:
+            # Put the batch back without clobbering anything newer that
+            # arrived while we were writing.
+            with self._lock:
+                for asset_id, status in batch.items():
+                    self._pending.setdefault(asset_id, status)
+            raise
+
+        # Unknown assets and repeats of the current status leave the caches warm.
+        if changed:
+            invalidate_catalog([row.id for row in changed])
+        updated = len(changed)
+        with self._lock:
+            self.stats["flushes"] += 1
+            self.stats["rows_updated"] += updated
+        return updated
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Mux webhook flush failed")
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="mux-webhooks", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Final Mux webhook flush failed")
+
+
+webhook_ingestor = WebhookIngestor()
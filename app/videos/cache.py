@@ -0,0 +1,65 @@
+from typing import Iterable, Optional
+
+import requests
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+# Serialized catalog responses keyed by role tier plus request parameters.
+# There are only three roles, so the key space stays small.
+catalog_cache = TTLCache(
+    max_entries=settings.catalog_cache_max_entries,
+    ttl_seconds=settings.catalog_cache_ttl_seconds,
+)
+
+# PlaybackDecision per video id for /videos/{id}/play (app/videos/playback.py).
+# LRU-bounded, so only the hot part of a large catalog stays resident.
+playback_cache = TTLCache(
+    max_entries=settings.playback_cache_max_entries,
+    ttl_seconds=settings.playback_cache_ttl_seconds,
+)
+
+# GET /videos/search pages. Every distinct query is a new key, so they live
+# in their own LRU and cannot push the catalog pages out.
+search_cache = TTLCache(
+    max_entries=settings.search_cache_max_entries,
+    ttl_seconds=settings.search_cache_ttl_seconds,
+)
+
+# GET /videos/trending pages. Kept apart from catalog_cache: every rollup
+# pass (app/videos/rollups.py) replaces them, and that must not flush the
+# list and detail pages.
+trending_cache = TTLCache(
+    max_entries=settings.trending_cache_max_entries,
+    ttl_seconds=settings.rollup_interval_seconds,
+)
+
+
+def invalidate_catalog(video_ids: Optional[Iterable[int]] = None) -> None:
+    """Call from every write path that changes what the catalog shows.
+
+    Pass the ids of the changed videos when known so the rest of the
+    playback cache stays warm; None drops all of it. Request handlers also
+    call pin_to_primary(); background writers must not.
+    """
+    catalog_cache.clear()
+    search_cache.clear()
+    trending_cache.clear()
+    if video_ids is None:
+        playback_cache.clear()
+    else:
+        for video_id in video_ids:
+            playback_cache.delete(video_id)
+
+
+def invalidate_remote_catalog(admin_token: str) -> None:
+    """Drop the running API's catalog cache from a script in another process."""
+    try:
+        response = requests.delete(
+            f"{settings.api_base_url}/admin/cache",
+            headers={"Authorization": f"Bearer {admin_token}"},
+            timeout=10,
+        )
+        response.raise_for_status()
+        print("API catalog cache invalidated")
+    except requests.RequestException as exc:
+        print(f"Could not invalidate API cache ({exc}); it expires after {settings.catalog_cache_ttl_seconds}s")
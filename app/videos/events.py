@@ -0,0 +1,257 @@
+import base64
+import csv
+import hashlib
+import hmac
+import io
+import logging
+import secrets
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.metrics import PLAYBACK_EVENTS
+from app.db.database import SessionLocal
+from app.db.models import PlaybackEvent
+
+logger = logging.getLogger(__name__)
+
+EVENT_COLUMNS = (
+    "session_id",
+    "user_id",
+    "video_id",
+    "event_type",
+    "position_seconds",
+    "bitrate_kbps",
+    "buffering_ms",
+    "occurred_at",
+    "received_at",
+)
+
+
+class InvalidSessionError(ValueError):
+    pass
+
+
+def _session_signature(payload: str) -> str:
+    digest = hmac.new(settings.jwt_secret.encode(), payload.encode(), hashlib.sha256).digest()[:16]
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode("ascii")
+
+
+def issue_session(user_id: int, video_id: int) -> str:
+    """Signed play-session id handed out by /videos/{id}/play.
+
+    Events carry it back, so the user and video are known without a lookup.
+    """
+    payload = f"{video_id}.{user_id}.{int(time.time())}.{secrets.token_hex(4)}"
+    return f"{payload}.{_session_signature(payload)}"
+
+
+def verify_session(session_id: str) -> tuple[int, int]:
+    """Returns (user_id, video_id)."""
+    payload, _, signature = session_id.rpartition(".")
+    if not payload or not hmac.compare_digest(signature, _session_signature(payload)):
+        raise InvalidSessionError("Invalid playback session")
+    video_id, user_id, issued_at, _ = payload.split(".")
+    if time.time() - int(issued_at) > settings.playback_session_ttl_seconds:
+        raise InvalidSessionError("Playback session expired")
+    return int(user_id), int(video_id)
+
+
+def to_utc_naive(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def clamp_occurred_at(value: Optional[datetime], received_at: datetime) -> datetime:
+    """Client timestamp, kept within what the session could have produced.
+
+    Nothing older than a play session's lifetime and nothing ahead of the
+    server clock beyond a small skew, so a bogus clock cannot skew the
+    rollups built from these rows.
+    """
+    if value is None:
+        return received_at
+    earliest = received_at - timedelta(seconds=settings.playback_session_ttl_seconds)
+    latest = received_at + timedelta(seconds=settings.playback_event_max_clock_skew_seconds)
+    return min(max(to_utc_naive(value), earliest), latest)
+
+
+class PlaybackEventBuffer:
+    """Bounded in-memory queue of playback events, written in bulk.
+
+    The API thread only appends to a deque; a background thread writes
+    batches of flush_size rows (COPY on psycopg2, executemany elsewhere)
+    whenever a batch is full or flush_interval has passed. When max_events
+    rows are waiting, submit() refuses the whole request so the caller can
+    answer 503 and the player retries later. A failed write goes back to
+    the front of the queue; once the same rows have failed max_attempts
+    times the batch is bisected and rows that fail on their own are dropped,
+    so one bad row cannot stall the buffer. stop() drains what is left.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        max_events: Optional[int] = None,
+        flush_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.max_events = max_events or settings.playback_event_buffer_size
+        self.flush_size = flush_size or settings.playback_event_flush_size
+        self.flush_interval = flush_interval or settings.playback_event_flush_interval_seconds
+        self.max_attempts = max_attempts or settings.playback_event_flush_max_attempts
+        self._failures = 0
+        self._rows: deque[dict] = deque()
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"accepted": 0, "rejected": 0, "written": 0, "flushes": 0, "failed_flushes": 0, "dropped": 0}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def submit(self, rows: list[dict]) -> bool:
+        """Queue all rows, or none of them if the buffer is full."""
+        with self._lock:
+            if len(self._rows) + len(rows) > self.max_events:
+                self.stats["rejected"] += len(rows)
+                PLAYBACK_EVENTS.labels("rejected").inc(len(rows))
+                return False
+            self._rows.extend(rows)
+            self.stats["accepted"] += len(rows)
+            should_wake = len(self._rows) >= self.flush_size
+        PLAYBACK_EVENTS.labels("accepted").inc(len(rows))
+        if should_wake:
+            self._wakeup.set()
+        return True
+
+    def _take(self) -> list[dict]:
+        with self._lock:
+            count = min(len(self._rows), self.flush_size)
+            return [self._rows.popleft() for _ in range(count)]
+
+    def _requeue(self, rows: list[dict]) -> None:
+        with self._lock:
+            self._rows.extendleft(reversed(rows))
+            self.stats["failed_flushes"] += 1
+
+    def _record_written(self, count: int) -> None:
+        with self._lock:
+            self.stats["flushes"] += 1
+            self.stats["written"] += count
+        PLAYBACK_EVENTS.labels("written").inc(count)
+
+    def _commit(self, rows: list[dict]) -> None:
+        with self.session_factory() as db:
+            self._write(db, rows)
+            db.commit()
+
+    def flush(self) -> int:
+        """Write one batch; returns the number of rows written."""
+        with self._write_lock:
+            batch = self._take()
+            if not batch:
+                return 0
+            try:
+                self._commit(batch)
+            except Exception:
+                self._failures += 1
+                if self._failures < self.max_attempts:
+                    self._requeue(batch)
+                    raise
+                self._failures = 0
+                return self._salvage(batch)
+            self._failures = 0
+        self._record_written(len(batch))
+        return len(batch)
+
+    def _salvage(self, batch: list[dict]) -> int:
+        """Bisect a batch that keeps failing, dropping rows that fail alone."""
+        written = 0
+        pending = [batch]
+        while pending:
+            chunk = pending.pop()
+            try:
+                self._commit(chunk)
+            except OperationalError:
+                # The database is unavailable, not the data: keep the rest.
+                self._requeue([row for part in [chunk, *reversed(pending)] for row in part])
+                if written:
+                    self._record_written(written)
+                raise
+            except Exception as e:
+                if len(chunk) > 1:
+                    middle = len(chunk) // 2
+                    pending += [chunk[middle:], chunk[:middle]]
+                    continue
+                logger.error("Dropping playback event that cannot be written: %s (%r)", e, chunk[0])
+                with self._lock:
+                    self.stats["dropped"] += 1
+                PLAYBACK_EVENTS.labels("dropped").inc()
+            else:
+                written += len(chunk)
+        if written:
+            self._record_written(written)
+        return written
+
+    def _write(self, db: Session, batch: list[dict]) -> None:
+        if db.get_bind().dialect.driver == "psycopg2":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for row in batch:
+                writer.writerow([row[column] for column in EVENT_COLUMNS])
+            buffer.seek(0)
+            cursor = db.connection().connection.cursor()
+            try:
+                # Unquoted empty CSV fields load as NULL.
+                cursor.copy_expert(
+                    f"COPY playback_events ({', '.join(EVENT_COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buffer
+                )
+            finally:
+                cursor.close()
+        else:
+            db.execute(insert(PlaybackEvent), batch)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                # Keep going while full batches are waiting.
+                while self.flush() == self.flush_size and not self._stop.is_set():
+                    pass
+            except Exception:
+                logger.exception("Playback event flush failed")
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="playback-events", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        try:
+            while self._rows:
+                self.flush()
+        except Exception:
+            logger.exception("Final playback event flush failed; %s events lost", len(self._rows))
+
+
+playback_event_buffer = PlaybackEventBuffer()
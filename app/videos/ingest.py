@@ -0,0 +1,411 @@
+"""Bulk video ingestion from CSV / JSONL manifests.
+
+Ingestion runs in two phases so it is idempotent and resumable:
+
+1. prepare(): validate the manifest, look titles up in batches, update the
+   flags of titles that already exist, and insert one placeholder row
+   (status=processing, no mux_asset_id) per new title in a single
+   transaction.
+2. run(): create Mux assets for every placeholder with bounded parallelism
+   under a token-bucket rate limit, writing asset ids back in batched
+   UPDATEs.
+
+Titles are the idempotency key, as in scripts/seed_videos.py. Re-running a
+manifest skips titles that already have an asset and retries placeholders
+left behind by an interrupted or failed run. A title is claimed by one run
+at a time (per process, through ingest_runs), so resubmitting a manifest
+while it is still running does not create a second asset for each
+placeholder.
+"""
+import csv
+import io
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from pydantic import ValidationError
+from sqlalchemy import bindparam, insert, select, update
+from app.core.config import settings
+from app.core.ratelimit import TokenBucket
+from app.db.database import SessionLocal
+from app.db.models import Video, VideoStatus
+from app.mux.client import MuxAPIError, MuxUnavailableError
+from app.mux.service import MuxService, get_mux_service
+from app.videos.cache import invalidate_catalog
+from app.videos.schemas import IngestItem
+
+logger = logging.getLogger(__name__)
+
+LOOKUP_CHUNK = 500
+FLAG_FIELDS = ("is_premium", "is_hidden")
+
+
+class ManifestError(ValueError):
+    pass
+
+
+def _penalty_seconds(retry_after: Optional[str]) -> float:
+    try:
+        return min(float(retry_after), settings.mux_backoff_max_seconds)
+    except (TypeError, ValueError):
+        return settings.mux_backoff_max_seconds
+
+
+@dataclass
+class IngestRun:
+    id: str
+    created_by: int
+    items: list[dict] = field(default_factory=list)
+    state: str = "preparing"
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
+    # item index -> IngestItem, for items waiting on Mux
+    pending: dict[int, IngestItem] = field(default_factory=dict)
+
+    def counts(self) -> dict[str, int]:
+        counts: dict[str, int] = {}
+        for item in self.items:
+            counts[item["status"]] = counts.get(item["status"], 0) + 1
+        return counts
+
+    def report(self) -> dict:
+        return {
+            "run_id": self.id,
+            "state": self.state,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "counts": self.counts(),
+            "items": list(self.items),
+        }
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str]) -> str:
+    name = (filename or "").lower()
+    if name.endswith(".csv") or (content_type or "").startswith("text/csv"):
+        return "csv"
+    return "jsonl"
+
+
+def parse_manifest(text: str, fmt: str) -> list[tuple[int, Optional[dict], Optional[str]]]:
+    """Returns (line number, raw item, parse error) per manifest entry."""
+    entries: list[tuple[int, Optional[dict], Optional[str]]] = []
+    if fmt == "csv":
+        reader = csv.DictReader(io.StringIO(text))
+        if not reader.fieldnames or "title" not in reader.fieldnames:
+            raise ManifestError("CSV manifest needs a header row with at least title and url")
+        for row in reader:
+            # Empty cells mean "use the default", not an empty string.
+            entries.append((reader.line_num, {k: v for k, v in row.items() if k and v not in (None, "")}, None))
+        return entries
+    if fmt == "jsonl":
+        for line_num, line in enumerate(text.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                raw = json.loads(line)
+            except ValueError as exc:
+                entries.append((line_num, None, f"Invalid JSON: {exc}"))
+                continue
+            if not isinstance(raw, dict):
+                entries.append((line_num, None, "Expected a JSON object"))
+                continue
+            entries.append((line_num, raw, None))
+        return entries
+    raise ManifestError(f"Unsupported manifest format {fmt!r}")
+
+
+def _result(line: int, title: Optional[str], status: str, **extra) -> dict:
+    return {"line": line, "title": title, "status": status, "video_id": None,
+            "mux_asset_id": None, "error": None, **extra}
+
+
+def _chunks(values: list, size: int) -> Iterable[list]:
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+class BulkIngestor:
+    def __init__(
+        self,
+        mux_service: Optional[MuxService] = None,
+        concurrency: Optional[int] = None,
+        rate_per_second: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        registry: Optional["IngestRegistry"] = None,
+    ) -> None:
+        self.mux_service = mux_service or get_mux_service()
+        self.registry = registry or ingest_runs
+        self.concurrency = concurrency or settings.mux_ingest_concurrency
+        rate = rate_per_second or settings.mux_ingest_rate_per_second
+        self.limiter = TokenBucket(rate, max(settings.mux_ingest_burst, 1.0))
+        self.batch_size = batch_size or settings.mux_ingest_batch_size
+
+    def prepare(self, entries: list[tuple[int, Optional[dict], Optional[str]]], created_by: int) -> IngestRun:
+        run = IngestRun(id=uuid.uuid4().hex, created_by=created_by)
+        valid: "OrderedDict[str, tuple[int, IngestItem]]" = OrderedDict()
+        for line, raw, error in entries:
+            title = (raw or {}).get("title")
+            if error is None:
+                try:
+                    item = IngestItem.model_validate(raw)
+                except ValidationError as exc:
+                    error = "; ".join(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in exc.errors())
+            if error is not None:
+                run.items.append(_result(line, title, "invalid", error=error))
+                continue
+            if item.title in valid:
+                run.items.append(_result(line, item.title, "duplicate",
+                                         error=f"Same title as line {valid[item.title][0]}"))
+                continue
+            valid[item.title] = (line, item)
+            run.items.append(_result(line, item.title, "queued"))
+
+        busy = self.registry.claim(run.id, list(valid))
+        for result in run.items:
+            if result["status"] == "queued" and result["title"] in busy:
+                result.update(status="in_progress", error=f"Already being ingested by run {busy[result['title']]}")
+                del valid[result["title"]]
+
+        try:
+            self._prepare_rows(run, valid, created_by)
+        except BaseException:
+            self.registry.release(run.id)
+            raise
+        run.state = "running" if run.pending else "done"
+        if not run.pending:
+            run.finished_at = datetime.utcnow()
+            self.registry.release(run.id)
+        return run
+
+    def _prepare_rows(self, run: IngestRun, valid: "OrderedDict[str, tuple[int, IngestItem]]", created_by: int) -> None:
+        index_by_title = {
+            item["title"]: i for i, item in enumerate(run.items) if item["status"] == "queued"
+        }
+        db = SessionLocal()
+        try:
+            existing = {}
+            for chunk in _chunks(list(valid), LOOKUP_CHUNK):
+                rows = db.execute(
+                    select(Video.id, Video.title, Video.mux_asset_id, Video.is_premium, Video.is_hidden)
+                    .where(Video.title.in_(chunk))
+                )
+                for row in rows:
+                    existing.setdefault(row.title, row)
+
+            flag_updates, new_rows = [], []
+            for title, (line, item) in valid.items():
+                index = index_by_title[title]
+                row = existing.get(title)
+                if row is None:
+                    new_rows.append(item)
+                    continue
+                result = run.items[index]
+                result["video_id"] = row.id
+                changed = any(getattr(row, f) != getattr(item, f) for f in FLAG_FIELDS)
+                if changed:
+                    flag_updates.append({"b_id": row.id, **{f: getattr(item, f) for f in FLAG_FIELDS}})
+                if row.mux_asset_id is None:
+                    # Placeholder from an earlier run that never got its asset.
+                    run.pending[index] = item
+                else:
+                    result["status"] = "updated" if changed else "exists"
+                    result["mux_asset_id"] = row.mux_asset_id
+
+            if flag_updates:
+                db.connection().execute(
+                    update(Video.__table__)
+                    .where(Video.__table__.c.id == bindparam("b_id"))
+                    .values({f: bindparam(f) for f in FLAG_FIELDS}),
+                    flag_updates,
+                )
+            for chunk in _chunks(new_rows, self.batch_size):
+                inserted = db.execute(
+                    insert(Video).returning(Video.id, Video.title),
+                    [
+                        {
+                            "title": item.title,
+                            "description": item.description,
+                            "is_premium": item.is_premium,
+                            "is_hidden": item.is_hidden,
+                            "status": VideoStatus.PROCESSING.value,
+                            "created_by": created_by,
+                        }
+                        for item in chunk
+                    ],
+                )
+                for row in inserted:
+                    index = index_by_title[row.title]
+                    run.items[index]["video_id"] = row.id
+                    run.pending[index] = valid[row.title][1]
+            db.commit()
+        finally:
+            db.close()
+
+        if flag_updates or new_rows:
+            invalidate_catalog([flags["b_id"] for flags in flag_updates])
+
+    def _create_asset(self, item: IngestItem) -> tuple[str, str]:
+        self.limiter.acquire()
+        try:
+            return self.mux_service.create_asset(item.input_url)
+        except MuxAPIError as exc:
+            if exc.status_code == 429:
+                # The client's own retries ran out; slow every worker down.
+                self.limiter.penalize(_penalty_seconds(exc.retry_after))
+            raise
+
+    def run(self, run: IngestRun) -> IngestRun:
+        if not run.pending:
+            self.registry.release(run.id)
+            return run
+        run.state = "running"
+        try:
+            self._run(run)
+            run.state = "done"
+        except BaseException:
+            logger.exception("Ingest run %s aborted", run.id)
+            run.state = "failed"
+            raise
+        finally:
+            run.pending.clear()
+            run.finished_at = datetime.utcnow()
+            self.registry.release(run.id)
+        return run
+
+    def _run(self, run: IngestRun) -> None:
+        results = {run.items[index]["video_id"]: run.items[index] for index in run.pending}
+        assigned: list[dict] = []
+        failed: list[dict] = []
+        last_flush = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="mux-ingest") as pool:
+            futures = {pool.submit(self._create_asset, item): index for index, item in run.pending.items()}
+            for future in as_completed(futures):
+                index = futures[future]
+                result = run.items[index]
+                try:
+                    mux_asset_id, playback_id = future.result()
+                except MuxAPIError as exc:
+                    retryable = exc.status_code == 429 or exc.status_code >= 500
+                    result.update(status="failed", error=f"Mux error {exc.status_code}", retryable=retryable)
+                    if not retryable:
+                        failed.append({"b_id": result["video_id"]})
+                except MuxUnavailableError as exc:
+                    result.update(status="failed", error=str(exc) or "Mux unavailable", retryable=True)
+                except Exception as exc:
+                    result.update(status="failed", error=str(exc) or type(exc).__name__, retryable=True)
+                else:
+                    result.update(status="created", mux_asset_id=mux_asset_id)
+                    assigned.append({"b_id": result["video_id"], "mux_asset_id": mux_asset_id,
+                                     "playback_id": playback_id})
+
+                if len(assigned) + len(failed) >= self.batch_size or time.monotonic() - last_flush > 1.0:
+                    self._record(results, assigned, failed)
+                    assigned, failed = [], []
+                    last_flush = time.monotonic()
+
+        self._record(results, assigned, failed)
+
+    def _record(self, results: dict[int, dict], assigned: list[dict], failed: list[dict]) -> None:
+        """_flush, keeping the run going when the write fails.
+
+        The affected items are reported as failed and retryable; their rows
+        stay placeholders, so re-running the manifest picks them up.
+        """
+        try:
+            self._flush(assigned, failed)
+        except Exception as exc:
+            logger.exception("Could not record %d ingest results", len(assigned) + len(failed))
+            for row in assigned:
+                results[row["b_id"]].update(
+                    status="failed", retryable=True,
+                    error=f"Mux asset {row['mux_asset_id']} created but not saved: {exc}",
+                )
+            for row in failed:
+                results[row["b_id"]]["error"] += f" (not saved: {exc})"
+
+    def _flush(self, assigned: list[dict], failed: list[dict]) -> None:
+        if not assigned and not failed:
+            return
+        videos = Video.__table__
+        db = SessionLocal()
+        try:
+            conn = db.connection()
+            if assigned:
+                conn.execute(
+                    update(videos)
+                    .where(videos.c.id == bindparam("b_id"))
+                    .values(
+                        mux_asset_id=bindparam("mux_asset_id"),
+                        playback_id=bindparam("playback_id"),
+                        status=VideoStatus.PROCESSING.value,
+                    ),
+                    assigned,
+                )
+            if failed:
+                # Rejected by Mux (bad URL etc.): mark failed, keep the row so a
+                # corrected manifest entry retries it.
+                conn.execute(
+                    update(videos).where(videos.c.id == bindparam("b_id")).values(status=VideoStatus.FAILED.value),
+                    failed,
+                )
+            db.commit()
+        finally:
+            db.close()
+        invalidate_catalog([row["b_id"] for row in assigned + failed])
+
+
+class IngestRegistry:
+    """Recent runs started through the API, for progress polling, and the
+    titles each unfinished run has claimed."""
+
+    def __init__(self, max_runs: int = 100) -> None:
+        self.max_runs = max_runs
+        self._runs: "OrderedDict[str, IngestRun]" = OrderedDict()
+        self._claims: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def claim(self, run_id: str, titles: list[str]) -> dict[str, str]:
+        """Claim the free titles for run_id; returns {title: owning run} for the rest."""
+        with self._lock:
+            busy = {title: self._claims[title] for title in titles if self._claims.get(title, run_id) != run_id}
+            for title in titles:
+                self._claims.setdefault(title, run_id)
+            return busy
+
+    def release(self, run_id: str) -> None:
+        with self._lock:
+            self._claims = {title: owner for title, owner in self._claims.items() if owner != run_id}
+
+    def add(self, run: IngestRun) -> None:
+        with self._lock:
+            self._runs[run.id] = run
+            while len(self._runs) > self.max_runs:
+                self._runs.popitem(last=False)
+
+    def get(self, run_id: str) -> Optional[IngestRun]:
+        with self._lock:
+            return self._runs.get(run_id)
+
+
+ingest_runs = IngestRegistry()
+
+
+@lru_cache
+def get_bulk_ingestor() -> BulkIngestor:
+    # Shared so concurrent runs draw from one Mux rate limit.
+    return BulkIngestor()
+
+
+def start_ingest(run: IngestRun, ingestor: BulkIngestor) -> None:
+    ingest_runs.add(run)
+    if run.pending:
+        threading.Thread(target=ingestor.run, args=(run,), name=f"ingest-{run.id[:8]}", daemon=True).start()
@@ -0,0 +1,306 @@
+import logging
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.models import JobStatus, Video, VideoJob, VideoStatus
+from app.mux.client import MuxAPIError
+from app.mux.service import MuxService, get_mux_service
+from app.videos.cache import invalidate_catalog
+
+logger = logging.getLogger(__name__)
+
+jobs_table = VideoJob.__table__
+videos_table = Video.__table__
+
+
+def is_retryable(exc: Exception) -> bool:
+    # Mux rejecting the request itself (bad input URL, auth) will not fix
+    # itself; everything else (timeouts, 429, 5xx, open breaker) might.
+    if isinstance(exc, MuxAPIError):
+        return exc.status_code == 429 or exc.status_code >= 500
+    return True
+
+
+class VideoJobWorker:
+    """Creates Mux assets for queued video_jobs rows on a small thread pool.
+
+    Jobs are claimed with FOR UPDATE SKIP LOCKED plus a conditional UPDATE, so
+    several API processes (or scripts/run_video_jobs.py) can share the
+    queue. The lease is renewed while the Mux call runs; a claimed job whose
+    worker dies is re-queued once its lease runs out, which counts as an
+    attempt. Failures are retried with exponential backoff; after max_attempts,
+    or on a non-retryable Mux error, the job is dead-lettered and its video
+    marked failed.
+    """
+
+    def __init__(
+        self,
+        mux_service: Optional[MuxService] = None,
+        session_factory: Callable[[], Session] = SessionLocal,
+        workers: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        lease_seconds: Optional[float] = None,
+    ) -> None:
+        self._mux_service = mux_service
+        self.session_factory = session_factory
+        self.workers = workers or settings.video_job_workers
+        self.poll_interval = poll_interval or settings.video_job_poll_interval_seconds
+        self.lease_seconds = lease_seconds or settings.video_job_lease_seconds
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def mux_service(self) -> MuxService:
+        if self._mux_service is None:
+            self._mux_service = get_mux_service()
+        return self._mux_service
+
+    def notify(self) -> None:
+        """Wake the dispatcher now instead of at the next poll."""
+        self._wake.set()
+
+    def recover_stale(self) -> int:
+        """Re-queue jobs whose worker died or hung; each recovery costs an attempt."""
+        now = datetime.utcnow()
+        cutoff = now - timedelta(seconds=self.lease_seconds)
+        stale = (jobs_table.c.status == JobStatus.RUNNING.value, jobs_table.c.locked_at < cutoff)
+        error = "Lease expired: worker crashed or hung"
+        with self.session_factory() as db:
+            dead = db.execute(
+                update(jobs_table)
+                .where(*stale, jobs_table.c.attempts + 1 >= jobs_table.c.max_attempts)
+                .values(
+                    status=JobStatus.DEAD.value,
+                    attempts=jobs_table.c.attempts + 1,
+                    last_error=error,
+                    locked_at=None,
+                    updated_at=now,
+                )
+                .returning(jobs_table.c.id, jobs_table.c.video_id)
+            ).all()
+            if dead:
+                db.execute(
+                    update(videos_table)
+                    .where(videos_table.c.id.in_([job.video_id for job in dead]))
+                    .values(status=VideoStatus.FAILED.value)
+                )
+            requeued = db.execute(
+                update(jobs_table)
+                .where(*stale)
+                .values(
+                    status=JobStatus.QUEUED.value,
+                    attempts=jobs_table.c.attempts + 1,
+                    last_error=error,
+                    locked_at=None,
+                    updated_at=now,
+                )
+            ).rowcount
+            db.commit()
+        if dead:
+            logger.error("Video jobs %s dead after their last lease expired", [job.id for job in dead])
+            invalidate_catalog([job.video_id for job in dead])
+        if requeued:
+            logger.warning("Re-queued %s video jobs with expired leases", requeued)
+        return requeued + len(dead)
+
+    def renew_lease(self, job_id: int) -> None:
+        with self.session_factory() as db:
+            db.execute(
+                update(jobs_table)
+                .where(jobs_table.c.id == job_id, jobs_table.c.status == JobStatus.RUNNING.value)
+                .values(locked_at=datetime.utcnow())
+            )
+            db.commit()
+
+    @contextmanager
+    def _lease_kept(self, job_id: int):
+        """Renew the job's lease while a slow Mux call runs, so it is not re-queued mid-call."""
+        done = threading.Event()
+
+        def keep() -> None:
+            while not done.wait(self.lease_seconds / 3):
+                try:
+                    self.renew_lease(job_id)
+                except Exception:
+                    logger.exception("Could not renew lease of video job %s", job_id)
+
+        thread = threading.Thread(target=keep, name=f"video-job-lease-{job_id}", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            done.set()
+            thread.join()
+
+    def claim(self, limit: int) -> list:
+        now = datetime.utcnow()
+        with self.session_factory() as db:
+            ids = db.scalars(
+                select(VideoJob.id)
+                .where(VideoJob.status == JobStatus.QUEUED.value, VideoJob.run_after <= now)
+                .order_by(VideoJob.run_after, VideoJob.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            ).all()
+            if not ids:
+                return []
+            # The status check keeps the claim safe where row locks don't
+            # exist (SQLite serializes writers instead).
+            jobs = db.execute(
+                update(jobs_table)
+                .where(jobs_table.c.id.in_(ids), jobs_table.c.status == JobStatus.QUEUED.value)
+                .values(status=JobStatus.RUNNING.value, locked_at=now, updated_at=now)
+                .returning(
+                    jobs_table.c.id,
+                    jobs_table.c.video_id,
+                    jobs_table.c.input_url,
+                    jobs_table.c.attempts,
+                    jobs_table.c.max_attempts,
+                )
+            ).all()
+            db.commit()
+        return jobs
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(settings.video_job_backoff_base_seconds * 2 ** (attempts - 1), settings.video_job_backoff_max_seconds)
+        return delay * random.uniform(0.8, 1.2)
+
+    def process(self, job) -> str:
+        attempts = job.attempts + 1
+        try:
+            with self._lease_kept(job.id):
+                mux_asset_id, playback_id = self.mux_service.create_asset(job.input_url)
+        except Exception as exc:
+            return self._fail(job, attempts, exc)
+
+        now = datetime.utcnow()
+        with self.session_factory() as db:
+            db.execute(
+                update(videos_table)
+                .where(videos_table.c.id == job.video_id)
+                .values(mux_asset_id=mux_asset_id, playback_id=playback_id)
+            )
+            db.execute(
+                update(jobs_table)
+                .where(jobs_table.c.id == job.id)
+                .values(
+                    status=JobStatus.SUCCEEDED.value,
+                    attempts=attempts,
+                    last_error=None,
+                    locked_at=None,
+                    updated_at=now,
+                )
+            )
+            db.commit()
+        invalidate_catalog([job.video_id])
+        return JobStatus.SUCCEEDED.value
+
+    def _fail(self, job, attempts: int, exc: Exception) -> str:
+        error = f"{type(exc).__name__}: {exc}"[:500]
+        now = datetime.utcnow()
+        dead = not is_retryable(exc) or attempts >= job.max_attempts
+        values = {"attempts": attempts, "last_error": error, "locked_at": None, "updated_at": now}
+        if dead:
+            values["status"] = JobStatus.DEAD.value
+        else:
+            values["status"] = JobStatus.QUEUED.value
+            values["run_after"] = now + timedelta(seconds=self._backoff(attempts))
+
+        with self.session_factory() as db:
+            db.execute(update(jobs_table).where(jobs_table.c.id == job.id).values(**values))
+            if dead:
+                db.execute(
+                    update(videos_table)
+                    .where(videos_table.c.id == job.video_id)
+                    .values(status=VideoStatus.FAILED.value)
+                )
+            db.commit()
+
+        if dead:
+            logger.error("Video job %s dead after %s attempts: %s", job.id, attempts, error)
+            invalidate_catalog([job.video_id])
+        else:
+            logger.warning("Video job %s attempt %s failed, retrying: %s", job.id, attempts, error)
+        return values["status"]
+
+    def run_once(self) -> dict[str, int]:
+        """Drain currently due jobs in the foreground; returns final status counts."""
+        self.recover_stale()
+        counts: dict[str, int] = {}
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="video-job") as executor:
+            while True:
+                jobs = self.claim(self.workers)
+                if not jobs:
+                    break
+                for status in executor.map(self.process, jobs):
+                    counts[status] = counts.get(status, 0) + 1
+        return counts
+
+    def _process_and_release(self, job) -> None:
+        try:
+            self.process(job)
+        except Exception:
+            logger.exception("Video job %s crashed; it is retried after its lease expires", job.id)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._wake.set()
+
+    def _run(self) -> None:
+        next_recovery = 0.0
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                if self._stop.is_set():
+                    break
+                now = datetime.utcnow().timestamp()
+                if now >= next_recovery:
+                    self.recover_stale()
+                    next_recovery = now + self.lease_seconds / 2
+                with self._lock:
+                    free = self.workers - self._in_flight
+                jobs = self.claim(free) if free > 0 else []
+                for job in jobs:
+                    with self._lock:
+                        self._in_flight += 1
+                    self._executor.submit(self._process_and_release, job)
+            except Exception:
+                logger.exception("Video job dispatch failed")
+                jobs = []
+            if not jobs:
+                self._wake.wait(self.poll_interval)
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="video-job")
+        self._thread = threading.Thread(target=self._run, name="video-job-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        if self._executor:
+            # Jobs still talking to Mux finish on their own; anything cut off
+            # is picked up again when its lease expires.
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+video_job_worker = VideoJobWorker()
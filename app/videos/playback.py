@@ -0,0 +1,54 @@
+"""Cached per-video playback decisions for /videos/{id}/play.
+
+A decision holds everything the entitlement check needs plus the playback
+URL (and, for videos that aren't ready, the whole response body), so a
+cache hit is a dictionary lookup and a role comparison. Entries are dropped
+by invalidate_catalog() on every write path; the TTL only bounds staleness
+from writes made by other processes.
+"""
+import time
+from typing import NamedTuple, Optional
+
+import orjson
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.metrics import PLAYBACK_ENTRY_AGE
+from app.db.models import Video, VideoStatus
+from app.mux.service import MuxService
+from app.videos.cache import playback_cache
+
+
+class PlaybackDecision(NamedTuple):
+    status: str
+    is_hidden: bool
+    is_premium: bool
+    playback_url: Optional[str]
+    body: bytes
+    loaded_at: float
+
+
+def build_decision(status: str, is_hidden: bool, is_premium: bool, playback_id: Optional[str]) -> PlaybackDecision:
+    playback_url = None
+    if status == VideoStatus.READY.value and playback_id:
+        playback_url = MuxService.get_public_playback_url(playback_id)
+    body = orjson.dumps({"status": status, "playback_url": playback_url})
+    return PlaybackDecision(status, is_hidden, is_premium, playback_url, body, time.monotonic())
+
+
+async def get_playback_decision(db: AsyncSession, video_id: int) -> Optional[PlaybackDecision]:
+    decision = playback_cache.get(video_id)
+    if decision is not None:
+        PLAYBACK_ENTRY_AGE.observe(time.monotonic() - decision.loaded_at)
+        return decision
+
+    generation = playback_cache.generation
+    row = (await db.execute(
+        select(Video.status, Video.is_hidden, Video.is_premium, Video.playback_id).where(Video.id == video_id)
+    )).first()
+    if row is None:
+        # Unknown ids are not cached, so probing random ids cannot evict
+        # the hot entries.
+        return None
+    decision = build_decision(*row)
+    playback_cache.set(video_id, decision, generation)
+    return decision
@@ -0,0 +1,56 @@
+"""Column-only video reads serialized straight to JSON bytes.
+
+Catalog routes select just the columns VideoResponse needs, so SQLAlchemy
+returns plain Row tuples instead of identity-mapped ORM objects, and the
+rows are encoded in one orjson pass. The dict shape matches VideoResponse,
+which stays the documented response_model; the routes return the bytes
+directly, so FastAPI does not validate them a second time.
+"""
+from typing import Any, Iterable, Optional
+
+import orjson
+from sqlalchemy import Select, select
+from app.db.models import Video
+from app.mux.service import MuxService
+
+VIDEO_COLUMNS = (
+    Video.id,
+    Video.title,
+    Video.description,
+    Video.is_premium,
+    Video.is_hidden,
+    Video.mux_asset_id,
+    Video.playback_id,
+    Video.status,
+    Video.created_by,
+    Video.created_at,
+)
+
+
+def select_video_rows() -> Select:
+    return select(*VIDEO_COLUMNS)
+
+
+def video_to_dict(video: Any) -> dict:
+    """Works on projected Rows and on Video instances alike."""
+    return {
+        "id": video.id,
+        "title": video.title,
+        "description": video.description,
+        "is_premium": video.is_premium,
+        "is_hidden": video.is_hidden,
+        "mux_asset_id": video.mux_asset_id,
+        "playback_id": video.playback_id,
+        "thumbnail_url": MuxService.get_thumbnail_url(video.playback_id) if video.playback_id else None,
+        "status": video.status,
+        "created_by": video.created_by,
+        "created_at": video.created_at,
+    }
+
+
+def dump_video(video: Any) -> bytes:
+    return orjson.dumps(video_to_dict(video))
+
+
+def dump_page(videos: Iterable[Any], next_cursor: Optional[str]) -> bytes:
+    return orjson.dumps({"items": [video_to_dict(v) for v in videos], "next_cursor": next_cursor})
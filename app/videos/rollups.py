@@ -0,0 +1,250 @@
+"""Incremental play-count rollups behind GET /videos/trending.
+
+Each pass folds the playback_events rows past the rollup_state high-water
+mark into hourly and daily per-video counters and into video_rollups:
+
+- total_plays and plays_7d ("most watched"),
+- trend_key, an exponentially decayed play count kept in log space
+  relative to TREND_EPOCH. Decay multiplies every video's score by the same
+  factor, so ORDER BY trend_key DESC is the trending order at any moment and
+  idle rows never need rewriting.
+
+A pass claims its event range by moving the high-water mark with a
+conditional UPDATE, so concurrent runners (several API processes, or
+scripts/run_rollups.py) never count an event twice. Events younger than
+settle_seconds are left for the next pass, in case an older id is still
+being written by another process.
+"""
+import enum
+import logging
+import math
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.models import PlaybackEvent, PlaybackEventType, RollupState, VideoRollup, VideoStatDaily, VideoStatHourly
+from app.videos.cache import trending_cache
+
+logger = logging.getLogger(__name__)
+
+STATE_NAME = "playback_events"
+TREND_EPOCH = datetime(2026, 1, 1)
+LOOKUP_CHUNK = 500
+
+
+class TrendingKind(str, enum.Enum):
+    TRENDING = "trending"
+    MOST_WATCHED = "most_watched"
+
+
+def _insert(dialect: str, table):
+    return (postgresql.insert if dialect == "postgresql" else sqlite.insert)(table)
+
+
+def _upsert(db: Session, dialect: str, model, rows: list[dict], keys: tuple[str, ...], additive: tuple[str, ...] = ()):
+    table = model.__table__
+    stmt = _insert(dialect, table)
+    values = {
+        column: (table.c[column] + stmt.excluded[column]) if column in additive else stmt.excluded[column]
+        for column in rows[0]
+        if column not in keys
+    }
+    db.execute(stmt.on_conflict_do_update(index_elements=list(keys), set_=values), rows)
+
+
+def _logaddexp(a: Optional[float], b: float) -> float:
+    if a is None:
+        return b
+    high, low = max(a, b), min(a, b)
+    return high + math.log1p(math.exp(low - high))
+
+
+class TrendingAggregator:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        interval: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        settle_seconds: Optional[float] = None,
+        half_life_hours: Optional[float] = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.interval = interval or settings.rollup_interval_seconds
+        self.batch_size = batch_size or settings.rollup_batch_size
+        self.settle_seconds = settings.rollup_settle_seconds if settle_seconds is None else settle_seconds
+        self.decay = math.log(2) / ((half_life_hours or settings.trending_half_life_hours) * 3600)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _hour_bucket(dialect: str):
+        # occurred_at is the client's clock (clamped at ingestion); never let
+        # it place a play after the server received it.
+        if dialect == "postgresql":
+            return func.date_trunc("hour", func.least(PlaybackEvent.occurred_at, PlaybackEvent.received_at))
+        return func.strftime("%Y-%m-%d %H:00:00", func.min(PlaybackEvent.occurred_at, PlaybackEvent.received_at))
+
+    def _high_water_mark(self, db: Session, dialect: str) -> int:
+        low = db.scalar(select(RollupState.last_event_id).where(RollupState.name == STATE_NAME))
+        if low is None:
+            db.execute(
+                _insert(dialect, RollupState.__table__)
+                .values(name=STATE_NAME, last_event_id=0, updated_at=datetime.utcnow())
+                .on_conflict_do_nothing(index_elements=["name"])
+            )
+            db.commit()
+            low = 0
+        return low
+
+    def run_batch(self) -> tuple[int, set[int]]:
+        """Fold one range of events; returns (ids advanced, video ids touched)."""
+        now = datetime.utcnow()
+        with self.session_factory() as db:
+            dialect = db.get_bind().dialect.name
+            low = self._high_water_mark(db, dialect)
+            window = (
+                select(PlaybackEvent.id, PlaybackEvent.received_at)
+                .where(PlaybackEvent.id > low)
+                .order_by(PlaybackEvent.id)
+                .limit(self.batch_size)
+                .subquery()
+            )
+            high = db.scalar(
+                select(func.max(window.c.id)).where(window.c.received_at <= now - timedelta(seconds=self.settle_seconds))
+            )
+            if high is None:
+                return 0, set()
+
+            claimed = db.execute(
+                update(RollupState.__table__)
+                .where(RollupState.name == STATE_NAME, RollupState.last_event_id == low)
+                .values(last_event_id=high, updated_at=now)
+            ).rowcount
+            if not claimed:
+                db.rollback()
+                return 0, set()
+
+            bucket = self._hour_bucket(dialect)
+            counts = db.execute(
+                select(PlaybackEvent.video_id, bucket, func.count())
+                .where(
+                    PlaybackEvent.id > low,
+                    PlaybackEvent.id <= high,
+                    PlaybackEvent.event_type == PlaybackEventType.PLAY.value,
+                )
+                .group_by(PlaybackEvent.video_id, bucket)
+            ).all()
+            touched = self._apply(db, dialect, counts, now) if counts else set()
+            db.commit()
+        return high - low, touched
+
+    def _apply(self, db: Session, dialect: str, counts: list, now: datetime) -> set[int]:
+        hourly, daily = [], defaultdict(int)
+        plays, last_play, contribution = defaultdict(int), {}, {}
+        half_hour = timedelta(minutes=30)
+        for video_id, bucket, count in counts:
+            if not isinstance(bucket, datetime):
+                bucket = datetime.fromisoformat(bucket)
+            hourly.append({"video_id": video_id, "bucket_start": bucket, "plays": count})
+            daily[(video_id, bucket.date())] += count
+            plays[video_id] += count
+            last_play[video_id] = max(last_play.get(video_id, bucket), bucket)
+            # Plays are timed at the middle of their hour.
+            weight = math.log(count) + self.decay * (bucket + half_hour - TREND_EPOCH).total_seconds()
+            contribution[video_id] = _logaddexp(contribution.get(video_id), weight)
+
+        _upsert(db, dialect, VideoStatHourly, hourly, ("video_id", "bucket_start"), additive=("plays",))
+        _upsert(
+            db,
+            dialect,
+            VideoStatDaily,
+            [{"video_id": v, "day": d, "plays": n} for (v, d), n in daily.items()],
+            ("video_id", "day"),
+            additive=("plays",),
+        )
+
+        video_ids = list(plays)
+        existing = {}
+        for start in range(0, len(video_ids), LOOKUP_CHUNK):
+            chunk = video_ids[start:start + LOOKUP_CHUNK]
+            for row in db.execute(
+                select(VideoRollup.video_id, VideoRollup.trend_key, VideoRollup.last_play_at)
+                .where(VideoRollup.video_id.in_(chunk))
+            ):
+                existing[row.video_id] = row
+        rollups = []
+        for video_id in video_ids:
+            row = existing.get(video_id)
+            last = last_play[video_id] if row is None or row.last_play_at is None else max(row.last_play_at, last_play[video_id])
+            rollups.append({
+                "video_id": video_id,
+                "total_plays": plays[video_id],
+                "trend_key": _logaddexp(row.trend_key if row else None, contribution[video_id]),
+                "last_play_at": last,
+                "updated_at": now,
+            })
+        _upsert(db, dialect, VideoRollup, rollups, ("video_id",), additive=("total_plays",))
+        return set(video_ids)
+
+    def refresh_weekly(self, touched: set[int]) -> None:
+        """Recompute plays_7d for videos with plays this week, so old days slide out."""
+        since = datetime.utcnow().date() - timedelta(days=6)
+        weekly = (
+            select(func.coalesce(func.sum(VideoStatDaily.plays), 0))
+            .where(VideoStatDaily.video_id == VideoRollup.video_id, VideoStatDaily.day >= since)
+            .scalar_subquery()
+        )
+        condition = VideoRollup.plays_7d > 0
+        if touched:
+            condition = or_(condition, VideoRollup.video_id.in_(touched))
+        with self.session_factory() as db:
+            db.execute(update(VideoRollup).where(condition).values(plays_7d=weekly))
+            cutoff = datetime.utcnow() - timedelta(days=settings.rollup_hourly_retention_days)
+            db.execute(VideoStatHourly.__table__.delete().where(VideoStatHourly.bucket_start < cutoff))
+            db.commit()
+
+    def run_once(self) -> int:
+        """Fold every settled event; returns how many event ids were consumed."""
+        consumed, touched = 0, set()
+        while not self._stop.is_set():
+            advanced, videos = self.run_batch()
+            if not advanced:
+                break
+            consumed += advanced
+            touched |= videos
+        self.refresh_weekly(touched)
+        if touched:
+            trending_cache.clear()
+        return consumed
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                consumed = self.run_once()
+                if consumed:
+                    logger.info("Rollups: folded %s playback events", consumed)
+            except Exception:
+                logger.exception("Rollup pass failed")
+            self._stop.wait(self.interval)
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="rollups", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+
+trending_aggregator = TrendingAggregator()
@@ -1,151 +1,465 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.auth.deps import get_current_user, require_roles
-from app.db.database import get_db
-from app.db.models import User, UserRole, Video, VideoStatus
-from app.mux.service import MuxService
-from app.videos.schemas import VideoCreateRequest, VideoResponse, PlayResponse
+from datetime import datetime
+from typing import Optional, Union
+
+import orjson
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.auth.deps import get_read_user, require_roles
+from app.auth.schemas import CurrentUser, TokenUser
+from app.core.config import settings
+from app.core.pagination import decode_cursor, decode_offset_cursor, encode_cursor, encode_offset_cursor
+from app.db.database import get_async_db
+from app.db.replicas import get_read_db, pin_to_primary
+from app.db.models import JobStatus, UserRole, Video, VideoJob, VideoRollup, VideoStatus
+from app.mux.client import MuxAPIError, MuxUnavailableError
+from app.mux.service import AsyncMuxService, get_async_mux_service
+from app.mux.uploads import UploadError, await_asset
+from app.videos.cache import catalog_cache, invalidate_catalog, search_cache, trending_cache
+from app.videos.events import InvalidSessionError, clamp_occurred_at, issue_session, playback_event_buffer, verify_session
+from app.videos.ingest import ManifestError, detect_format, get_bulk_ingestor, ingest_runs, parse_manifest, start_ingest
+from app.videos.jobs import video_job_worker
+from app.videos.playback import get_playback_decision
+from app.videos.projection import dump_page, dump_video, select_video_rows
+from app.videos.rollups import TrendingKind
+from app.videos.search import search_query, search_terms
+from app.videos.schemas import (
+    IngestRunResponse,
+    PlaybackEventBatch,
+    PlaybackEventIn,
+    PlaybackEventsAccepted,
+    PlayResponse,
+    VideoCreateRequest,
+    VideoJobResponse,
+    VideoPage,
+    VideoResponse,
+    VideoUpdateRequest,
+    VideoUploadForm,
+)
+from app.videos.uploads import UploadRequestError, proxy_multipart_upload
 
 router = APIRouter(prefix="/videos", tags=["videos"])
 
 
-@router.post("", response_model=VideoResponse, status_code=201)
-def create_video(
-    payload: VideoCreateRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(UserRole.ADMIN)),
-):
-    mux_service = MuxService()
-    try:
-        mux_asset_id, playback_id = mux_service.create_asset(payload.input_url)
-    except Exception:
-        raise HTTPException(
-            status_code=status.HTTP_502_BAD_GATEWAY,
-            detail="Mux asset creation failed",
+def is_placeholder(video) -> bool:
+    """A row POST /videos or bulk ingest created before Mux has an asset for it."""
+    return video.status == VideoStatus.PROCESSING.value and video.mux_asset_id is None
+
+
+def filter_visible(query, role: UserRole):
+    """Apply the catalog visibility rules for a role to a Video query."""
+    if role == UserRole.ADMIN:
+        return query
+    query = query.filter(or_(Video.status != VideoStatus.PROCESSING.value, Video.mux_asset_id.is_not(None)))
+    if role == UserRole.USER:
+        return query.filter(
+            Video.is_premium.is_(False),
+            Video.is_hidden.is_(False),
         )
+    return query.filter(Video.is_hidden.is_(False))
+
+
+def json_response(body: bytes, status_code: int = 200) -> Response:
+    return Response(content=body, status_code=status_code, media_type="application/json")
 
+
+def to_job_response(job: VideoJob, mux_asset_id: Optional[str], playback_id: Optional[str]) -> VideoJobResponse:
+    return VideoJobResponse(
+        job_id=job.id,
+        status=job.status,
+        video_id=job.video_id,
+        attempts=job.attempts,
+        max_attempts=job.max_attempts,
+        last_error=job.last_error,
+        run_after=job.run_after,
+        mux_asset_id=mux_asset_id,
+        playback_id=playback_id,
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+    )
+
+
+@router.post("", response_model=VideoJobResponse, status_code=202)
+async def create_video(
+    payload: VideoCreateRequest,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(require_roles(UserRole.ADMIN)),
+):
+    # The Mux call happens in app/videos/jobs.py; the row shows up as
+    # processing until the job attaches its asset.
     video = Video(
         title=payload.title,
         description=payload.description,
         is_premium=payload.is_premium,
         is_hidden=payload.is_hidden,
-        mux_asset_id=mux_asset_id,
-        playback_id=playback_id,
         status=VideoStatus.PROCESSING.value,
         created_by=current_user.id,
     )
     db.add(video)
-    db.commit()
-    db.refresh(video)
-
-    return VideoResponse(
-        id=video.id,
-        title=video.title,
-        description=video.description,
-        is_premium=video.is_premium,
-        is_hidden=video.is_hidden,
-        mux_asset_id=video.mux_asset_id,
-        playback_id=video.playback_id,
-        thumbnail_url=f"https://image.mux.com/{playback_id}/thumbnail.jpg?time=0" if playback_id else None,
-        status=video.status,
-        created_by=video.created_by,
-        created_at=video.created_at,
+    await db.flush()
+    job = VideoJob(
+        video_id=video.id,
+        input_url=payload.input_url,
+        max_attempts=settings.video_job_max_attempts,
+        created_by=current_user.id,
     )
+    db.add(job)
+    await db.commit()
+    invalidate_catalog([video.id])
+    pin_to_primary(response)
+    video_job_worker.notify()
 
+    response.headers["Location"] = f"/videos/jobs/{job.id}"
+    return to_job_response(job, None, None)
 
-@router.get("", response_model=list[VideoResponse])
-def list_videos(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+
+@router.post("/upload", response_model=VideoResponse, status_code=201)
+async def upload_video(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(require_roles(UserRole.ADMIN)),
+    mux_service: AsyncMuxService = Depends(get_async_mux_service),
 ):
-    query = db.query(Video)
-    if current_user.role == UserRole.USER:
-        query = query.filter(
-            Video.is_premium.is_(False),
-            Video.is_hidden.is_(False),
-        )
-    elif current_user.role == UserRole.PREMIUM:
-        query = query.filter(Video.is_hidden.is_(False))
-    videos = query.order_by(Video.created_at.desc()).all()
-
-    return [
-        VideoResponse(
-            id=v.id,
-            title=v.title,
-            description=v.description,
-            is_premium=v.is_premium,
-            is_hidden=v.is_hidden,
-            mux_asset_id=v.mux_asset_id,
-            playback_id=v.playback_id,
-            thumbnail_url=f"https://image.mux.com/{v.playback_id}/thumbnail.jpg?time=0" if v.playback_id else None,
-            status=v.status,
-            created_by=v.created_by,
-            created_at=v.created_at,
+    """multipart/form-data with title, description, is_premium, is_hidden, then file."""
+    try:
+        form, upload_id, size = await proxy_multipart_upload(
+            request.headers.get("content-type", ""), request.stream(), mux_service, VideoUploadForm,
         )
-        for v in videos
-    ]
+    except UploadRequestError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except MuxUnavailableError:
+        raise HTTPException(status_code=503, detail="Mux is unavailable, try again later")
+    except MuxAPIError as exc:
+        if exc.status_code == 429:
+            raise HTTPException(status_code=503, detail="Mux is rate limiting uploads, try again later",
+                                headers={"Retry-After": exc.retry_after or "1"})
+        raise HTTPException(status_code=502, detail="Mux upload failed")
+    except UploadError:
+        raise HTTPException(status_code=502, detail="Mux upload failed")
+
+    # Mux usually creates the asset within a second or two; if not, the
+    # reconciler attaches it later via mux_upload_id.
+    try:
+        asset = await await_asset(mux_service, upload_id)
+    except UploadError:
+        asset = None
+        video_status = VideoStatus.FAILED.value
+    except (MuxUnavailableError, MuxAPIError):
+        # The bytes are already at Mux; keep the row and let the reconciler look again.
+        asset = None
+        video_status = VideoStatus.PROCESSING.value
+    else:
+        video_status = VideoStatus.PROCESSING.value
+    mux_asset_id, playback_id = asset or (None, None)
+
+    video = Video(
+        title=form.title,
+        description=form.description,
+        is_premium=form.is_premium,
+        is_hidden=form.is_hidden,
+        mux_upload_id=upload_id,
+        mux_asset_id=mux_asset_id,
+        playback_id=playback_id,
+        status=video_status,
+        created_by=current_user.id,
+    )
+    db.add(video)
+    await db.commit()
+    invalidate_catalog([video.id])
+    response = json_response(dump_video(video), status_code=201)
+    pin_to_primary(response)
+    return response
+
+
+@router.get("/jobs/{job_id}", response_model=VideoJobResponse)
+async def get_video_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(require_roles(UserRole.ADMIN)),
+):
+    row = (await db.execute(
+        select(VideoJob, Video.mux_asset_id, Video.playback_id)
+        .join(Video, Video.id == VideoJob.video_id)
+        .where(VideoJob.id == job_id)
+    )).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return to_job_response(*row)
+
+
+@router.post("/jobs/{job_id}/retry", response_model=VideoJobResponse)
+async def retry_video_job(
+    job_id: int,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(require_roles(UserRole.ADMIN)),
+):
+    job = await db.get(VideoJob, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status != JobStatus.DEAD.value:
+        raise HTTPException(status_code=409, detail="Only dead jobs can be retried")
+
+    job.status = JobStatus.QUEUED.value
+    job.attempts = 0
+    job.last_error = None
+    job.run_after = datetime.utcnow()
+    video = await db.get(Video, job.video_id)
+    video.status = VideoStatus.PROCESSING.value
+    await db.commit()
+    invalidate_catalog([job.video_id])
+    pin_to_primary(response)
+    video_job_worker.notify()
+    return to_job_response(job, video.mux_asset_id, video.playback_id)
+
+
+@router.post("/bulk", response_model=IngestRunResponse, status_code=202)
+async def bulk_ingest(
+    manifest: UploadFile = File(...),
+    manifest_format: Optional[str] = Query(None, alias="format", pattern="^(csv|jsonl)$"),
+    current_user: CurrentUser = Depends(require_roles(UserRole.ADMIN)),
+):
+    content = await manifest.read(settings.ingest_max_manifest_bytes + 1)
+    if len(content) > settings.ingest_max_manifest_bytes:
+        raise HTTPException(status_code=413, detail="Manifest too large")
+    try:
+        text = content.decode("utf-8-sig")
+        fmt = manifest_format or detect_format(manifest.filename, manifest.content_type)
+        entries = parse_manifest(text, fmt)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Manifest must be UTF-8")
+    except ManifestError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    ingestor = get_bulk_ingestor()
+    run = await run_in_threadpool(ingestor.prepare, entries, current_user.id)
+    start_ingest(run, ingestor)
+    return run.report()
+
+
+@router.get("/bulk/{run_id}", response_model=IngestRunResponse)
+async def get_bulk_ingest(
+    run_id: str,
+    current_user: CurrentUser = Depends(require_roles(UserRole.ADMIN)),
+):
+    run = ingest_runs.get(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail="Ingest run not found")
+    return run.report()
+
+
+@router.get("", response_model=VideoPage)
+async def list_videos(
+    limit: int = Query(24, ge=1, le=100),
+    cursor: Optional[str] = None,
+    status_filter: Optional[VideoStatus] = Query(None, alias="status"),
+    premium_only: bool = False,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: TokenUser = Depends(get_read_user),
+):
+    cache_key = ("list", current_user.role, cursor, limit, status_filter, premium_only)
+    cached = catalog_cache.get(cache_key)
+    if cached is not None:
+        return json_response(cached)
+    generation = catalog_cache.generation
+
+    query = filter_visible(select_video_rows(), current_user.role)
+    if status_filter is not None:
+        query = query.filter(Video.status == status_filter.value)
+    if premium_only:
+        query = query.filter(Video.is_premium.is_(True))
+    if cursor:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        query = query.filter(tuple_(Video.created_at, Video.id) < tuple_(cursor_created_at, cursor_id))
+
+    # Fetch one extra row to know whether another page exists without a COUNT.
+    query = query.order_by(Video.created_at.desc(), Video.id.desc()).limit(limit + 1)
+    videos = (await db.execute(query)).all()
+    next_cursor = None
+    if len(videos) > limit:
+        videos = videos[:limit]
+        next_cursor = encode_cursor(videos[-1].created_at, videos[-1].id)
+
+    body = dump_page(videos, next_cursor)
+    catalog_cache.set(cache_key, body, generation)
+    return json_response(body)
+
+
+@router.get("/search", response_model=VideoPage)
+async def search_videos(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(24, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TokenUser = Depends(get_read_user),
+):
+    terms = search_terms(q)
+    if not terms:
+        return json_response(dump_page([], None))
+
+    cache_key = ("search", current_user.role, tuple(terms), cursor, limit)
+    cached = search_cache.get(cache_key)
+    if cached is not None:
+        return json_response(cached)
+    generation = search_cache.generation
+
+    offset = decode_offset_cursor(cursor) if cursor else 0
+    query = filter_visible(search_query(db.bind.dialect.name, terms), current_user.role)
+    videos = (await db.execute(query.offset(offset).limit(limit + 1))).all()
+    next_cursor = None
+    if len(videos) > limit:
+        videos = videos[:limit]
+        next_cursor = encode_offset_cursor(offset + limit)
+
+    body = dump_page(videos, next_cursor)
+    search_cache.set(cache_key, body, generation)
+    return json_response(body)
+
+
+@router.get("/trending", response_model=VideoPage)
+async def trending_videos(
+    kind: TrendingKind = TrendingKind.TRENDING,
+    limit: int = Query(24, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TokenUser = Depends(get_read_user),
+):
+    """Top videos from the precomputed rollups (app/videos/rollups.py)."""
+    cache_key = ("trending", current_user.role, kind, limit)
+    cached = trending_cache.get(cache_key)
+    if cached is not None:
+        return json_response(cached)
+    generation = trending_cache.generation
+
+    query = filter_visible(
+        select_video_rows().join(VideoRollup, VideoRollup.video_id == Video.id), current_user.role
+    ).filter(Video.status == VideoStatus.READY.value)
+    if kind is TrendingKind.MOST_WATCHED:
+        query = query.filter(VideoRollup.plays_7d > 0).order_by(VideoRollup.plays_7d.desc(), Video.id.desc())
+    else:
+        query = query.order_by(VideoRollup.trend_key.desc(), Video.id.desc())
+    videos = (await db.execute(query.limit(limit))).all()
+
+    body = dump_page(videos, None)
+    trending_cache.set(cache_key, body, generation)
+    return json_response(body)
 
 
 @router.get("/{video_id}", response_model=VideoResponse)
-def get_video(
+async def get_video(
     video_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: TokenUser = Depends(get_read_user),
 ):
-    video = db.query(Video).filter(Video.id == video_id).first()
+    cache_key = ("video", current_user.role, video_id)
+    cached = catalog_cache.get(cache_key)
+    if cached is not None:
+        return json_response(cached)
+    generation = catalog_cache.generation
+
+    video = (await db.execute(select_video_rows().where(Video.id == video_id))).first()
     if not video:
         raise HTTPException(status_code=404, detail="Video not found")
 
-    if video.is_hidden and current_user.role != UserRole.ADMIN:
+    if (video.is_hidden or is_placeholder(video)) and current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=404, detail="Video not found")
 
     if video.is_premium and current_user.role == UserRole.USER:
         raise HTTPException(status_code=403, detail="Premium content")
 
-    return VideoResponse(
-        id=video.id,
-        title=video.title,
-        description=video.description,
-        is_premium=video.is_premium,
-        is_hidden=video.is_hidden,
-        mux_asset_id=video.mux_asset_id,
-        playback_id=video.playback_id,
-        thumbnail_url=f"https://image.mux.com/{video.playback_id}/thumbnail.jpg?time=0" if video.playback_id else None,
-        status=video.status,
-        created_by=video.created_by,
-        created_at=video.created_at,
-    )
+    body = dump_video(video)
+    catalog_cache.set(cache_key, body, generation)
+    return json_response(body)
 
 
-@router.get("/{video_id}/play", response_model=PlayResponse)
-def play_video(
+@router.patch("/{video_id}", response_model=VideoResponse)
+async def update_video(
     video_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    payload: VideoUpdateRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(require_roles(UserRole.ADMIN)),
 ):
-    video = db.query(Video).filter(Video.id == video_id).first()
+    video = await db.get(Video, video_id)
     if not video:
         raise HTTPException(status_code=404, detail="Video not found")
 
-    if video.mux_asset_id:
-        try:
-            mux_service = MuxService()
-            latest_status = mux_service.get_asset_status(video.mux_asset_id)
-            if latest_status != video.status:
-                video.status = latest_status
-                db.commit()
-                db.refresh(video)
-        except Exception:
-            pass
-
-    if video.status != VideoStatus.READY.value:
-        return PlayResponse(status=video.status, playback_url=None)
-
-    if video.is_hidden and current_user.role != UserRole.ADMIN:
+    for field, value in payload.model_dump(exclude_unset=True).items():
+        setattr(video, field, value)
+    await db.commit()
+    await db.refresh(video)
+    invalidate_catalog([video_id])
+
+    response = json_response(dump_video(video))
+    pin_to_primary(response)
+    return response
+
+
+@router.get("/{video_id}/play", response_model=PlayResponse)
+async def play_video(
+    video_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TokenUser = Depends(get_read_user),
+):
+    # Status is kept current by the background reconciler (app/mux/reconciler.py),
+    # so playback never waits on a Mux round trip; the decision itself is
+    # usually served from memory (app/videos/playback.py).
+    decision = await get_playback_decision(db, video_id)
+    if decision is None:
         raise HTTPException(status_code=404, detail="Video not found")
 
-    if video.is_premium and current_user.role == UserRole.USER:
+    if decision.status != VideoStatus.READY.value:
+        return json_response(decision.body)
+
+    if decision.is_hidden and current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=404, detail="Video not found")
+
+    if decision.is_premium and current_user.role == UserRole.USER:
         raise HTTPException(status_code=403, detail="Premium content")
 
-    playback_url = MuxService.get_public_playback_url(video.playback_id)
-    return PlayResponse(status=video.status, playback_url=playback_url)
+    return json_response(orjson.dumps({
+        "status": decision.status,
+        "playback_url": decision.playback_url,
+        "session_id": issue_session(current_user.id, video_id),
+    }))
+
+
+@router.post("/events", response_model=PlaybackEventsAccepted, status_code=202)
+async def record_playback_events(
+    payload: Union[PlaybackEventBatch, PlaybackEventIn],
+    current_user: TokenUser = Depends(get_read_user),
+):
+    """One event, or {"events": [...]}; each carries the session_id from /play."""
+    events = payload.events if isinstance(payload, PlaybackEventBatch) else [payload]
+    now = datetime.utcnow()
+    sessions: dict[str, int] = {}
+    rows = []
+    for event in events:
+        video_id = sessions.get(event.session_id)
+        if video_id is None:
+            try:
+                user_id, video_id = verify_session(event.session_id)
+            except InvalidSessionError as exc:
+                raise HTTPException(status_code=400, detail=str(exc))
+            if user_id != current_user.id:
+                raise HTTPException(status_code=403, detail="Playback session belongs to another user")
+            sessions[event.session_id] = video_id
+        rows.append({
+            "session_id": event.session_id,
+            "user_id": current_user.id,
+            "video_id": video_id,
+            "event_type": event.type.value,
+            "position_seconds": event.position_seconds,
+            "bitrate_kbps": event.bitrate_kbps,
+            "buffering_ms": event.buffering_ms,
+            "occurred_at": clamp_occurred_at(event.occurred_at, now),
+            "received_at": now,
+        })
+
+    if not playback_event_buffer.submit(rows):
+        raise HTTPException(
+            status_code=503,
+            detail="Event buffer is full, retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    return PlaybackEventsAccepted(accepted=len(rows))
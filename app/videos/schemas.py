@@ -1,6 +1,11 @@
 from datetime import datetime
-from pydantic import BaseModel
-from app.db.models import VideoStatus
+from pydantic import AliasChoices, BaseModel, Field, field_validator
+from app.core.config import settings
+from app.db.models import JobStatus, PlaybackEventType, VideoStatus
+
+INT32_MAX = 2**31 - 1
+# A week; far longer than any real title.
+MAX_POSITION_SECONDS = 7 * 86_400
 
 
 class VideoCreateRequest(BaseModel):
@@ -11,6 +16,36 @@ class VideoCreateRequest(BaseModel):
     input_url: str
 
 
+class IngestItem(BaseModel):
+    title: str = Field(min_length=1)
+    description: str | None = None
+    input_url: str = Field(min_length=1, validation_alias=AliasChoices("input_url", "url"))
+    is_premium: bool = False
+    is_hidden: bool = False
+
+
+class VideoUploadForm(BaseModel):
+    title: str = Field(min_length=1)
+    description: str | None = None
+    is_premium: bool = False
+    is_hidden: bool = False
+
+
+class VideoUpdateRequest(BaseModel):
+    title: str | None = None
+    description: str | None = None
+    is_premium: bool | None = None
+    is_hidden: bool | None = None
+
+    @field_validator("title", "is_premium", "is_hidden")
+    @classmethod
+    def not_null(cls, v):
+        # Omitted fields are left alone; only description may be cleared.
+        if v is None:
+            raise ValueError("Cannot be null")
+        return v
+
+
 class VideoResponse(BaseModel):
     id: int
     title: str
@@ -25,6 +60,65 @@ class VideoResponse(BaseModel):
     created_at: datetime
 
 
+class VideoPage(BaseModel):
+    items: list[VideoResponse]
+    next_cursor: str | None = None
+
+
+class VideoJobResponse(BaseModel):
+    job_id: int
+    status: JobStatus
+    video_id: int
+    attempts: int
+    max_attempts: int
+    last_error: str | None = None
+    run_after: datetime
+    mux_asset_id: str | None = None
+    playback_id: str | None = None
+    created_at: datetime
+    updated_at: datetime
+
+
 class PlayResponse(BaseModel):
     status: str
     playback_url: str | None = None
+    # Send back with playback events (POST /videos/events).
+    session_id: str | None = None
+
+
+class PlaybackEventIn(BaseModel):
+    session_id: str = Field(max_length=64)
+    type: PlaybackEventType
+    # Bounded by the column types, so one bad value cannot fail a whole flush.
+    position_seconds: float | None = Field(None, ge=0, le=MAX_POSITION_SECONDS, allow_inf_nan=False)
+    bitrate_kbps: int | None = Field(None, ge=0, le=INT32_MAX)
+    buffering_ms: int | None = Field(None, ge=0, le=INT32_MAX)
+    # Client clock; defaults to when the server received the event.
+    occurred_at: datetime | None = None
+
+
+class PlaybackEventBatch(BaseModel):
+    events: list[PlaybackEventIn] = Field(min_length=1, max_length=settings.playback_event_max_batch)
+
+
+class PlaybackEventsAccepted(BaseModel):
+    accepted: int
+
+
+class IngestItemResult(BaseModel):
+    line: int
+    title: str | None
+    status: str
+    video_id: int | None = None
+    mux_asset_id: str | None = None
+    error: str | None = None
+    retryable: bool | None = None
+
+
+class IngestRunResponse(BaseModel):
+    run_id: str
+    state: str
+    created_at: datetime
+    finished_at: datetime | None = None
+    counts: dict[str, int]
+    items: list[IngestItemResult]
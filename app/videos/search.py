@@ -0,0 +1,127 @@
+"""Full-text search over video titles and descriptions.
+
+Postgres uses the generated `search_vector` column and GIN index from
+migrations/004_videos_fulltext_search.sql. SQLite (local runs and tests)
+uses an external-content FTS5 table kept in sync by triggers, created by
+ensure_search_index() at startup. Titles weigh more than descriptions on
+both backends. Any other database falls back to unranked ILIKE matching,
+which scans the table but keeps the endpoint working.
+"""
+import re
+from typing import Optional
+
+from sqlalchemy import Select, and_, case, column, func, literal_column, or_, table, text
+from sqlalchemy.engine import Engine
+from app.db.models import Video
+from app.videos.projection import select_video_rows
+
+# Must match the configuration baked into the generated column, or the GIN
+# index is not used.
+SEARCH_CONFIG = "simple"
+
+TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+MAX_TERMS = 8
+
+videos_fts = table("videos_fts", column("rowid"))
+
+SQLITE_FTS_DDL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS videos_fts
+    USING fts5(title, description, content='videos', content_rowid='id')
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS videos_fts_ai AFTER INSERT ON videos BEGIN
+        INSERT INTO videos_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS videos_fts_ad AFTER DELETE ON videos BEGIN
+        INSERT INTO videos_fts(videos_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS videos_fts_au AFTER UPDATE OF title, description ON videos BEGIN
+        INSERT INTO videos_fts(videos_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO videos_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+)
+
+
+def search_terms(q: str) -> list[str]:
+    """Reduce free text to plain word tokens, so no query syntax reaches the engine."""
+    return TERM_PATTERN.findall(q.lower())[:MAX_TERMS]
+
+
+def search_query(dialect: str, terms: list[str]) -> Select:
+    """Ranked Select of projected video rows matching every term.
+
+    The last term matches as a prefix, so results keep up while typing.
+    Callers add visibility filters, offset and limit.
+    """
+    if dialect == "postgresql":
+        tsquery = func.to_tsquery(SEARCH_CONFIG, " & ".join(terms[:-1] + [f"{terms[-1]}:*"]))
+        search_vector = literal_column("videos.search_vector")
+        return (
+            select_video_rows()
+            .where(search_vector.op("@@")(tsquery))
+            .order_by(func.ts_rank_cd(search_vector, tsquery).desc(), Video.created_at.desc(), Video.id.desc())
+        )
+
+    if dialect == "sqlite":
+        match = " ".join([f'"{term}"' for term in terms[:-1]] + [f'"{terms[-1]}"*'])
+        fts = literal_column("videos_fts")
+        return (
+            select_video_rows()
+            .join(videos_fts, videos_fts.c.rowid == Video.id)
+            .where(fts.op("MATCH")(match))
+            # bm25 is lower-is-better; title matches count ten times a description match.
+            .order_by(func.bm25(fts, 10.0, 1.0), Video.created_at.desc(), Video.id.desc())
+        )
+
+    # Anything else: every term as a substring, title matches first.
+    matches = [
+        or_(Video.title.icontains(term, autoescape=True), Video.description.icontains(term, autoescape=True))
+        for term in terms
+    ]
+    title_match = and_(*[Video.title.icontains(term, autoescape=True) for term in terms])
+    return (
+        select_video_rows()
+        .where(*matches)
+        .order_by(case((title_match, 0), else_=1), Video.created_at.desc(), Video.id.desc())
+    )
+
+
+def ensure_search_index(engine: Engine) -> Optional[str]:
+    """Create the SQLite FTS index if needed; on Postgres only check for it.
+
+    Returns a warning message when search will not work, else None.
+    """
+    dialect = engine.dialect.name
+    if dialect == "sqlite":
+        with engine.begin() as conn:
+            triggers = conn.scalar(text(
+                "SELECT count(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'videos_fts_%'"
+            ))
+            for statement in SQLITE_FTS_DDL:
+                conn.exec_driver_sql(statement)
+            if triggers < 3:
+                # New index, or videos was recreated underneath an old one.
+                conn.exec_driver_sql("INSERT INTO videos_fts(videos_fts) VALUES ('rebuild')")
+        return None
+
+    if dialect == "postgresql":
+        with engine.connect() as conn:
+            present = conn.scalar(text(
+                "SELECT 1 FROM information_schema.columns "
+                "WHERE table_name = 'videos' AND column_name = 'search_vector'"
+            ))
+        if not present:
+            return "videos.search_vector is missing; apply migrations/004_videos_fulltext_search.sql"
+        return None
+
+    return f"Full-text search is not available on {dialect}; /videos/search falls back to ILIKE scans"
@@ -0,0 +1,150 @@
+"""Proxy a streamed multipart/form-data request body to a Mux direct upload.
+
+The body is parsed incrementally as it arrives; form fields are collected
+and the bytes of the `file` part are forwarded to Mux one aligned chunk at a
+time, so neither memory nor local disk ever holds the whole file. Form
+fields must come before the file part.
+"""
+import logging
+from typing import AsyncIterator, Optional, Type, TypeVar
+
+import httpx
+from multipart.multipart import MultipartParser, parse_options_header
+from pydantic import BaseModel, ValidationError
+from app.core.config import settings
+from app.mux.service import AsyncMuxService
+from app.mux.uploads import AsyncChunkedUploader, aligned_chunk_size
+
+logger = logging.getLogger(__name__)
+
+FILE_FIELD = "file"
+MAX_FIELD_BYTES = 64 * 1024
+
+FormModel = TypeVar("FormModel", bound=BaseModel)
+
+
+class UploadRequestError(ValueError):
+    pass
+
+
+class _FormStream:
+    """Collects MultipartParser callbacks; file bytes are buffered for the caller."""
+
+    def __init__(self) -> None:
+        self.fields: dict[str, str] = {}
+        self.file_started = False
+        self.file_done = False
+        self.buffer = bytearray()
+        self._header_field = b""
+        self._header_value = b""
+        self._headers: dict[bytes, bytes] = {}
+        self._name: Optional[str] = None
+        self._value = bytearray()
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+        }
+
+    def on_part_begin(self) -> None:
+        self._headers = {}
+        self._name = None
+        self._value = bytearray()
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        self._name = options.get(b"name", b"").decode("utf-8", "replace")
+        if self._name == FILE_FIELD:
+            if self.file_started:
+                raise UploadRequestError("Only one file per upload")
+            self.file_started = True
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._name == FILE_FIELD:
+            self.buffer += data[start:end]
+            return
+        self._value += data[start:end]
+        if len(self._value) > MAX_FIELD_BYTES:
+            raise UploadRequestError(f"Form field {self._name!r} is too large")
+
+    def on_part_end(self) -> None:
+        if self._name == FILE_FIELD:
+            self.file_done = True
+        elif self._name:
+            self.fields[self._name] = self._value.decode("utf-8")
+
+
+async def proxy_multipart_upload(
+    content_type: str,
+    body: AsyncIterator[bytes],
+    mux_service: AsyncMuxService,
+    form_model: Type[FormModel],
+) -> tuple[FormModel, str, int]:
+    """Stream the `file` part to a new Mux direct upload.
+
+    The fields are validated against `form_model` before any byte goes to
+    Mux. Returns (validated form, Mux upload id, bytes uploaded).
+    """
+    _, params = parse_options_header(content_type)
+    boundary = params.get(b"boundary")
+    if not boundary:
+        raise UploadRequestError("Expected a multipart/form-data body")
+
+    form = _FormStream()
+    parser = MultipartParser(boundary, form.callbacks())
+    chunk_size = aligned_chunk_size()
+    uploader: Optional[AsyncChunkedUploader] = None
+    upload_id = None
+    fields = None
+
+    async with httpx.AsyncClient(timeout=httpx.Timeout(60.0, connect=settings.mux_connect_timeout_seconds)) as client:
+        async for data in body:
+            parser.write(data)
+            if form.file_started and uploader is None:
+                try:
+                    fields = form_model.model_validate(form.fields)
+                except ValidationError as exc:
+                    problems = "; ".join(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in exc.errors())
+                    raise UploadRequestError(f"Invalid form fields (send them before the file): {problems}")
+                upload_id, url = await mux_service.create_direct_upload()
+                uploader = AsyncChunkedUploader(url, client, progress=_log_progress(upload_id))
+            while uploader and len(form.buffer) >= chunk_size and not (form.file_done and len(form.buffer) == chunk_size):
+                await uploader.send(bytes(form.buffer[:chunk_size]))
+                del form.buffer[:chunk_size]
+        parser.finalize()
+
+        if uploader is None or not form.file_done:
+            raise UploadRequestError(f"Missing {FILE_FIELD!r} part")
+        if not uploader.offset and not form.buffer:
+            raise UploadRequestError("Uploaded file is empty")
+        await uploader.send(bytes(form.buffer), final=True)
+    return fields, upload_id, uploader.offset
+
+
+def _log_progress(upload_id: str):
+    step = 100 * 1024 * 1024
+    state = {"next": step}
+
+    def report(sent: int, total: Optional[int]) -> None:
+        if sent >= state["next"] or (total is not None and sent >= total):
+            logger.info("Mux upload %s: %.1f MiB sent", upload_id, sent / 1024 / 1024)
+            state["next"] = sent + step
+
+    return report
@@ -1,24 +1,32 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
-from pathlib import Path
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import Response
+from sqlalchemy.exc import OperationalError
 from app.db.database import Base, engine
+from app.db.migrations import MigrationError, migrate
 from app.db.models import User, Video
+from app.db.replicas import replica_router
 from app.auth.router import router as auth_router
 from app.admin.router import router as admin_router
 from app.videos.router import router as videos_router
+from app.mux.router import router as mux_router
+from app.core.config import settings
+from app.mux.reconciler import MuxStatusReconciler
+from app.mux.webhooks import webhook_ingestor
+from app.mux.service import get_async_mux_service, get_mux_service
+from app.auth.hashing import password_hasher
+from app.videos.events import playback_event_buffer
+from app.videos.jobs import video_job_worker
+from app.videos.rollups import trending_aggregator
+from app.videos.search import ensure_search_index
+from app.core.metrics import AppStatsCollector, MetricsMiddleware, render_latest
+from app.core.static import static_pages
+from prometheus_client import REGISTRY
 
 # Create app
 app = FastAPI(title="Horios OTT", version="0.1.0")
 
-# Create tables (lazy - only if needed)
-try:
-    Base.metadata.create_all(bind=engine)
-except Exception as e:
-    print(f"⚠️  DB connection failed: {e}")
-    print("⚠️  Running in API-only mode (no persistence)")
-    print("    Connect DATABASE_URL when ready")
-
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -28,10 +36,89 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large API responses (web/ pages are precompressed, see app/core/static.py)
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=settings.gzip_minimum_size,
+    compresslevel=settings.gzip_compress_level,
+)
+
+# Metrics middleware (outermost, so it sees the final status code)
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+    REGISTRY.register(AppStatsCollector())
+
 # Routers
 app.include_router(auth_router)
 app.include_router(admin_router)
 app.include_router(videos_router)
+app.include_router(mux_router)
+
+
+mux_reconciler = MuxStatusReconciler()
+
+
+@app.on_event("startup")
+def prepare_database():
+    if not settings.db_migrate_on_startup:
+        return
+    try:
+        if engine.dialect.name == "postgresql":
+            # One SELECT when the ledger is current (app/db/migrations.py).
+            applied = migrate(engine)
+            if applied:
+                print(f"✅ Applied migrations: {', '.join(applied)}")
+        else:
+            # Local SQLite databases are built straight from the models.
+            Base.metadata.create_all(bind=engine)
+            search_warning = ensure_search_index(engine)
+            if search_warning:
+                print(f"⚠️  {search_warning}")
+    except MigrationError as e:
+        # A failed or edited migration means the schema does not match the
+        # code; refuse to start rather than serve on it.
+        print(f"❌ {e}")
+        raise
+    except OperationalError as e:
+        print(f"⚠️  DB connection failed: {e}")
+        print("⚠️  Running in API-only mode (no persistence)")
+        print("    Connect DATABASE_URL when ready")
+
+
+@app.on_event("startup")
+def start_background_workers():
+    webhook_ingestor.start()
+    if settings.mux_reconcile_enabled:
+        mux_reconciler.start()
+    if settings.video_jobs_enabled:
+        video_job_worker.start()
+    playback_event_buffer.start()
+    if settings.rollups_enabled:
+        trending_aggregator.start()
+
+
+@app.on_event("shutdown")
+def stop_background_workers():
+    mux_reconciler.stop()
+    video_job_worker.stop()
+    playback_event_buffer.stop()
+    trending_aggregator.stop()
+    webhook_ingestor.stop()
+    password_hasher.shutdown()
+    if get_mux_service.cache_info().currsize:
+        get_mux_service().client.close()
+
+
+@app.on_event("startup")
+async def start_replica_checks():
+    replica_router.start()
+
+
+@app.on_event("shutdown")
+async def close_async_clients():
+    await replica_router.stop()
+    if get_async_mux_service.cache_info().currsize:
+        await get_async_mux_service().aclose()
 
 
 @app.get("/health")
@@ -39,18 +126,23 @@ def health_check():
     return {"status": "ok"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    body, content_type = render_latest()
+    return Response(content=body, media_type=content_type)
+
+
+@app.on_event("startup")
+def load_static_pages():
+    static_pages.load("index.html", "login.html")
+
+
 # Placeholder routes (se llenan en siguientes días)
 @app.get("/")
-def root():
-    web_path = Path(__file__).parent / "web" / "index.html"
-    if web_path.exists():
-        return FileResponse(web_path)
-    return {"message": "Horios OTT API"}
+def root(request: Request):
+    return static_pages.response(request, "index.html") or {"message": "Horios OTT API"}
 
 
 @app.get("/login")
-def login_page():
-    web_path = Path(__file__).parent / "web" / "login.html"
-    if web_path.exists():
-        return FileResponse(web_path)
-    return {"message": "Login page not found"}
+def login_page(request: Request):
+    return static_pages.response(request, "login.html") or {"message": "Login page not found"}
@@ -9,7 +9,7 @@ CREATE TABLE IF NOT EXISTS users (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL
 );
 
-CREATE INDEX idx_users_email ON users(email);
+CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
 
 CREATE TABLE IF NOT EXISTS videos (
     id SERIAL PRIMARY KEY,
@@ -23,7 +23,7 @@ CREATE TABLE IF NOT EXISTS videos (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL
 );
 
-CREATE INDEX idx_videos_mux_asset_id ON videos(mux_asset_id);
-CREATE INDEX idx_videos_playback_id ON videos(playback_id);
-CREATE INDEX idx_videos_created_by ON videos(created_by);
-CREATE INDEX idx_videos_status ON videos(status);
+CREATE INDEX IF NOT EXISTS idx_videos_mux_asset_id ON videos(mux_asset_id);
+CREATE INDEX IF NOT EXISTS idx_videos_playback_id ON videos(playback_id);
+CREATE INDEX IF NOT EXISTS idx_videos_created_by ON videos(created_by);
+CREATE INDEX IF NOT EXISTS idx_videos_status ON videos(status);
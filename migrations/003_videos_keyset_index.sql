@@ -0,0 +1,9 @@
+-- Migration: Keyset pagination index for the catalog
+-- Date: 2026-10-17
+
+CREATE INDEX IF NOT EXISTS idx_videos_created_at_id ON videos (created_at DESC, id DESC);
+
+-- Most catalog reads (USER / PREMIUM) only ever see non-hidden rows.
+CREATE INDEX IF NOT EXISTS idx_videos_visible_created_at_id
+    ON videos (created_at DESC, id DESC)
+    WHERE is_hidden = FALSE;
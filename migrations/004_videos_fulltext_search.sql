@@ -0,0 +1,12 @@
+-- Migration: Full-text search over video titles and descriptions
+-- Date: 2026-10-17
+
+-- Titles rank above descriptions (weight A vs B). The 'simple' configuration
+-- must match SEARCH_CONFIG in app/videos/search.py for the index to be used.
+ALTER TABLE videos ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_videos_search_vector ON videos USING GIN (search_vector);
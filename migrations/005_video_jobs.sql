@@ -0,0 +1,21 @@
+-- Migration: Durable queue for Mux asset creation
+-- Date: 2026-10-17
+
+CREATE TABLE IF NOT EXISTS video_jobs (
+    id SERIAL PRIMARY KEY,
+    video_id INTEGER NOT NULL REFERENCES videos(id) ON DELETE CASCADE,
+    input_url TEXT NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued' CHECK (status IN ('queued', 'running', 'succeeded', 'dead')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    last_error TEXT,
+    run_after TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    locked_at TIMESTAMP,
+    created_by INTEGER NOT NULL REFERENCES users(id),
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_video_jobs_video_id ON video_jobs (video_id);
+-- The worker polls for due work: status = 'queued' AND run_after <= now().
+CREATE INDEX IF NOT EXISTS idx_video_jobs_status_run_after ON video_jobs (status, run_after);
@@ -0,0 +1,6 @@
+-- Migration: Track Mux direct uploads until their asset exists
+-- Date: 2026-10-17
+
+ALTER TABLE videos ADD COLUMN IF NOT EXISTS mux_upload_id VARCHAR(255);
+
+CREATE INDEX IF NOT EXISTS idx_videos_mux_upload_id ON videos (mux_upload_id);
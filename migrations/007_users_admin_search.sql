@@ -0,0 +1,13 @@
+-- Migration: Indexes for the paginated admin user list
+-- Date: 2026-10-17
+
+-- Default listing and its keyset cursor: ORDER BY created_at DESC, id DESC.
+CREATE INDEX IF NOT EXISTS idx_users_created_at_id ON users (created_at DESC, id DESC);
+
+-- Role filter on the same ordering.
+CREATE INDEX IF NOT EXISTS idx_users_role_created_at_id ON users (role, created_at DESC, id DESC);
+
+-- Case-insensitive email prefix search. The "C" collation orders by bytes,
+-- so one index serves both the prefix range and ORDER BY lower(email), id;
+-- app/admin/router.py must use the same expression.
+CREATE INDEX IF NOT EXISTS idx_users_email_lower ON users ((lower(email) COLLATE "C"), id);
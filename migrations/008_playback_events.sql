@@ -0,0 +1,21 @@
+-- Migration: Player telemetry (play / heartbeat / progress / QoE events)
+-- Date: 2026-10-17
+
+-- Append-only and written with COPY in batches; no foreign keys so inserts
+-- don't pay for lookups in users and videos.
+CREATE TABLE IF NOT EXISTS playback_events (
+    id BIGSERIAL PRIMARY KEY,
+    session_id VARCHAR(64) NOT NULL,
+    user_id INTEGER NOT NULL,
+    video_id INTEGER NOT NULL,
+    event_type VARCHAR(16) NOT NULL,
+    position_seconds DOUBLE PRECISION,
+    bitrate_kbps INTEGER,
+    buffering_ms INTEGER,
+    occurred_at TIMESTAMP NOT NULL,
+    received_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- "Continue watching": latest position per user and video.
+CREATE INDEX IF NOT EXISTS idx_playback_events_user_video_occurred
+    ON playback_events (user_id, video_id, occurred_at DESC);
@@ -0,0 +1,36 @@
+-- Migration: Play-count rollups and trending scores (app/videos/rollups.py)
+-- Date: 2026-10-17
+
+CREATE TABLE IF NOT EXISTS video_stats_hourly (
+    video_id INTEGER NOT NULL,
+    bucket_start TIMESTAMP NOT NULL,
+    plays INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (video_id, bucket_start)
+);
+
+CREATE TABLE IF NOT EXISTS video_stats_daily (
+    video_id INTEGER NOT NULL,
+    day DATE NOT NULL,
+    plays INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (video_id, day)
+);
+
+-- trend_key is a log-space decayed play count; ORDER BY trend_key DESC is
+-- the trending order at any point in time.
+CREATE TABLE IF NOT EXISTS video_rollups (
+    video_id INTEGER PRIMARY KEY,
+    total_plays BIGINT NOT NULL DEFAULT 0,
+    plays_7d INTEGER NOT NULL DEFAULT 0,
+    trend_key DOUBLE PRECISION NOT NULL,
+    last_play_at TIMESTAMP,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_video_rollups_trend_key ON video_rollups (trend_key DESC);
+CREATE INDEX IF NOT EXISTS idx_video_rollups_plays_7d ON video_rollups (plays_7d DESC);
+
+CREATE TABLE IF NOT EXISTS rollup_state (
+    name VARCHAR(64) PRIMARY KEY,
+    last_event_id BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
@@ -1,7 +1,8 @@
 #!/bin/bash
 
-# Script para crear las tablas en Supabase/Postgres
-# Uso: ./run_migrations.sh
+# Script para aplicar las migraciones en Supabase/Postgres
+# Uso: ./run_migrations.sh [--status | --check]
+# Aplica migrations/*.sql en orden y las registra en schema_migrations.
 
 DB_URL=${DATABASE_URL}
 
@@ -11,6 +12,6 @@ if [ -z "$DB_URL" ]; then
 fi
 
 echo "Ejecutando migraciones..."
-psql "$DB_URL" -f migrations/001_initial_schema.sql
+python scripts/migrate.py "$@" || exit 1
 
 echo "✅ Migraciones completadas"
@@ -0,0 +1,133 @@
+"""Compare the sync (threadpool) and async DB paths under high concurrency.
+
+Runs the same catalog page query through a `def` route on the sync engine
+and an `async def` route on the async engine, driven in-process over ASGI,
+and prints requests/sec and latency percentiles as JSON.
+
+Usage (point DATABASE_URL at a local Postgres for meaningful numbers):
+    python scripts/bench_db_modes.py --requests 5000 --concurrency 200
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.metrics import percentile
+from app.db.database import Base, SessionLocal, engine, get_async_db, get_db
+from app.db.models import User, UserRole, Video
+
+PAGE_SIZE = 24
+
+
+def page_query():
+    return (
+        select(Video)
+        .where(Video.is_hidden.is_(False))
+        .order_by(Video.created_at.desc(), Video.id.desc())
+        .limit(PAGE_SIZE)
+    )
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/sync")
+    def sync_page(db: Session = Depends(get_db)):
+        return {"count": len(db.scalars(page_query()).all())}
+
+    @app.get("/async")
+    async def async_page(db: AsyncSession = Depends(get_async_db)):
+        return {"count": len((await db.scalars(page_query())).all())}
+
+    return app
+
+
+def ensure_rows(count: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        existing = db.scalar(select(func.count(Video.id)))
+        if existing >= count:
+            return
+        owner = db.scalar(select(User).where(User.email == "bench@example.com"))
+        if owner is None:
+            owner = User(email="bench@example.com", password_hash="!", role=UserRole.ADMIN)
+            db.add(owner)
+            db.flush()
+        db.add_all(
+            Video(title=f"Bench video {i}", created_by=owner.id, playback_id=f"bench{i}")
+            for i in range(existing, count)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+async def run_mode(app: FastAPI, path: str, total: int, concurrency: int) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one() -> None:
+            nonlocal errors
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(path)
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    errors += 1
+
+        # Warm up the pools so connection setup is not measured.
+        await asyncio.gather(*(one() for _ in range(min(concurrency, total))))
+        latencies.clear()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        duration = time.perf_counter() - started
+
+    return {
+        "requests": total,
+        "errors": errors,
+        "duration_s": round(duration, 3),
+        "requests_per_s": round(total / duration, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+async def run(args) -> dict:
+    app = build_app()
+    results = {"concurrency": args.concurrency, "database": engine.url.render_as_string(hide_password=True)}
+    for mode in ("sync", "async"):
+        results[mode] = await run_mode(app, f"/{mode}", args.requests, args.concurrency)
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark sync vs async DB routes")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=1000, help="minimum videos to seed")
+    args = parser.parse_args()
+
+    ensure_rows(args.rows)
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
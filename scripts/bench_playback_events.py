@@ -0,0 +1,132 @@
+"""Sustained throughput of the playback event buffer (app/videos/events.py).
+
+Producer threads submit batches of events as fast as the buffer accepts
+them while the flush thread writes to the database, for a fixed duration.
+Reports accepted and written events/sec, how often backpressure kicked in,
+and the peak backlog. Uses a throwaway SQLite file unless --database-url
+points at Postgres (where batches go through COPY).
+
+Usage:
+    python scripts/bench_playback_events.py --seconds 10 --producers 4
+    python scripts/bench_playback_events.py --database-url postgresql://... --flush-size 5000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import create_engine, delete, func, select
+from sqlalchemy.orm import sessionmaker
+from app.db.database import Base
+from app.db.models import PlaybackEvent
+from app.videos.events import PlaybackEventBuffer
+
+
+def make_rows(batch: int, producer: int, counter: int) -> list[dict]:
+    now = datetime.utcnow()
+    return [
+        {
+            "session_id": f"bench-{producer}-{counter}",
+            "user_id": producer,
+            "video_id": (counter + i) % 500,
+            "event_type": "heartbeat",
+            "position_seconds": float(i * 10),
+            "bitrate_kbps": 4500,
+            "buffering_ms": None,
+            "occurred_at": now,
+            "received_at": now,
+        }
+        for i in range(batch)
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark playback event ingestion")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--producers", type=int, default=4)
+    parser.add_argument("--batch", type=int, default=20, help="events per submit (one API request)")
+    parser.add_argument("--buffer-size", type=int, default=50_000)
+    parser.add_argument("--flush-size", type=int, default=2_000)
+    parser.add_argument("--database-url", help="default: a temporary SQLite file")
+    args = parser.parse_args()
+
+    tmp = None
+    url = args.database_url
+    if not url:
+        tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+        url = f"sqlite:///{tmp.name}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine, tables=[PlaybackEvent.__table__])
+    session_factory = sessionmaker(bind=engine)
+    with session_factory() as db:
+        db.execute(delete(PlaybackEvent).where(PlaybackEvent.session_id.like("bench-%")))
+        db.commit()
+
+    buffer = PlaybackEventBuffer(
+        session_factory=session_factory,
+        max_events=args.buffer_size,
+        flush_size=args.flush_size,
+        flush_interval=0.5,
+    )
+    stop = threading.Event()
+    peak = [0]
+    refusals = [0]
+
+    def produce(producer: int) -> None:
+        counter = 0
+        while not stop.is_set():
+            counter += 1
+            if buffer.submit(make_rows(args.batch, producer, counter)):
+                peak[0] = max(peak[0], len(buffer))
+            else:
+                refusals[0] += 1
+                time.sleep(0.001)  # what a client does after a 503
+
+    buffer.start()
+    started = time.perf_counter()
+    threads = [threading.Thread(target=produce, args=(i,)) for i in range(args.producers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    produced_for = time.perf_counter() - started
+    buffer.stop(timeout=30)
+    drained_for = time.perf_counter() - started
+
+    with session_factory() as db:
+        stored = db.scalar(select(func.count()).select_from(PlaybackEvent).where(PlaybackEvent.session_id.like("bench-%")))
+    engine.dispose()
+    if tmp:
+        os.unlink(tmp.name)
+
+    stats = buffer.stats
+    print(json.dumps({
+        "database": engine.dialect.name,
+        "producers": args.producers,
+        "batch": args.batch,
+        "flush_size": args.flush_size,
+        "seconds": round(produced_for, 2),
+        "accepted_per_sec": round(stats["accepted"] / produced_for),
+        "written_per_sec": round(stats["written"] / drained_for),
+        "rejected_submits": refusals[0],
+        "peak_backlog": peak[0],
+        "flushes": stats["flushes"],
+        "stored": stored,
+        "lost": stats["accepted"] - stored,
+    }, indent=2))
+    return 0 if stored == stats["accepted"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
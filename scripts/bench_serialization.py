@@ -0,0 +1,126 @@
+"""Microbenchmark for the catalog serialization path.
+
+Compares the old path (hydrate Video ORM objects, build VideoResponse per
+row, dump through pydantic, then validate again as FastAPI's response_model
+would) with the column projection in app/videos/projection.py on the same
+rows, using a throwaway in-memory SQLite database.
+
+Usage:
+    python scripts/bench_serialization.py --rows 10000 --repeat 5
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+from app.db.database import Base
+from app.db.models import User, UserRole, Video, VideoStatus
+from app.videos.projection import dump_page, select_video_rows
+from app.videos.schemas import VideoPage, VideoResponse
+
+
+def build_db(rows: int):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    base = datetime(2026, 1, 1)
+    with Session(engine) as db:
+        owner = User(email="bench@example.com", password_hash="!", role=UserRole.ADMIN)
+        db.add(owner)
+        db.flush()
+        db.execute(insert(Video), [
+            {
+                "title": f"Bench video {i}",
+                "description": f"Description for bench video {i}",
+                "is_premium": i % 3 == 0,
+                "mux_asset_id": f"asset{i}",
+                "playback_id": f"playback{i}",
+                "status": VideoStatus.READY.value,
+                "created_by": owner.id,
+                "created_at": base + timedelta(seconds=i),
+            }
+            for i in range(rows)
+        ])
+        db.commit()
+    return engine
+
+
+def legacy_page(engine) -> bytes:
+    with Session(engine) as db:
+        videos = db.scalars(select(Video).order_by(Video.created_at.desc(), Video.id.desc())).all()
+        page = VideoPage(
+            items=[
+                VideoResponse(
+                    id=v.id,
+                    title=v.title,
+                    description=v.description,
+                    is_premium=v.is_premium,
+                    is_hidden=v.is_hidden,
+                    mux_asset_id=v.mux_asset_id,
+                    playback_id=v.playback_id,
+                    thumbnail_url=f"https://image.mux.com/{v.playback_id}/thumbnail.jpg?time=0" if v.playback_id else None,
+                    status=v.status,
+                    created_by=v.created_by,
+                    created_at=v.created_at,
+                )
+                for v in videos
+            ],
+            next_cursor=None,
+        )
+        # FastAPI re-validates a returned model against response_model.
+        VideoPage.model_validate(page.model_dump())
+        return page.model_dump_json().encode("utf-8")
+
+
+def projected_page(engine) -> bytes:
+    with Session(engine) as db:
+        rows = db.execute(select_video_rows().order_by(Video.created_at.desc(), Video.id.desc())).all()
+        return dump_page(rows, None)
+
+
+def measure(fn, engine, repeat: int) -> dict:
+    fn(engine)  # warm up statement caches
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(engine)
+        timings.append(time.perf_counter() - started)
+    return {
+        "median_ms": round(statistics.median(timings) * 1000, 2),
+        "min_ms": round(min(timings) * 1000, 2),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark catalog list serialization")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = build_db(args.rows)
+    if json.loads(legacy_page(engine)) != json.loads(projected_page(engine)):
+        print("Projection output differs from VideoPage", file=sys.stderr)
+        return 1
+
+    legacy = measure(legacy_page, engine, args.repeat)
+    projected = measure(projected_page, engine, args.repeat)
+    print(json.dumps({
+        "rows": args.rows,
+        "repeat": args.repeat,
+        "orm_pydantic": legacy,
+        "projection_orjson": projected,
+        "speedup": round(legacy["median_ms"] / projected["median_ms"], 2),
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
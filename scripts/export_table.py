@@ -0,0 +1,47 @@
+"""Dump the videos or users table as NDJSON or CSV.
+
+Rows are streamed from a server-side cursor inside one read-only snapshot,
+so memory stays flat and the dump is consistent while the API keeps
+writing.
+
+Usage:
+    python scripts/export_table.py videos > videos.ndjson
+    python scripts/export_table.py users --format csv --output users.csv
+"""
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.admin.export import ExportFormat, ExportTable, iter_export
+from app.db.database import engine
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Export a table as NDJSON or CSV")
+    parser.add_argument("table", choices=[table.value for table in ExportTable])
+    parser.add_argument("--format", choices=[fmt.value for fmt in ExportFormat], default=ExportFormat.NDJSON.value)
+    parser.add_argument("--output", help="file to write (default: stdout)")
+    args = parser.parse_args()
+
+    chunks = iter_export(engine, ExportTable(args.table), ExportFormat(args.format))
+    written = 0
+    if args.output:
+        with open(args.output, "wb") as out:
+            for chunk in chunks:
+                out.write(chunk)
+                written += len(chunk)
+    else:
+        for chunk in chunks:
+            sys.stdout.buffer.write(chunk)
+            written += len(chunk)
+        sys.stdout.buffer.flush()
+    print(f"Exported {args.table}: {written} bytes", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
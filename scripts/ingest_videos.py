@@ -0,0 +1,67 @@
+"""Bulk-create videos from a CSV or JSONL manifest.
+
+Each entry needs `title` and `url` (or `input_url`); `description`,
+`is_premium` and `is_hidden` are optional. Titles already in the database
+are skipped (their flags are updated), so a manifest can be re-run to
+resume after an interruption or to retry failed items.
+
+Usage:
+    python scripts/ingest_videos.py catalog.csv --created-by 1
+    python scripts/ingest_videos.py catalog.jsonl --concurrency 8 --rate 2 --report report.jsonl
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.videos.cache import invalidate_catalog, invalidate_remote_catalog
+from app.videos.ingest import BulkIngestor, ManifestError, detect_format, parse_manifest
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Bulk ingest videos from a manifest")
+    parser.add_argument("manifest", help="path to a .csv or .jsonl manifest")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="override detection by extension")
+    parser.add_argument("--created-by", type=int, default=1, help="owner user id for new videos")
+    parser.add_argument("--concurrency", type=int, help="parallel Mux requests")
+    parser.add_argument("--rate", type=float, help="Mux asset creations per second")
+    parser.add_argument("--report", help="write per-item results as JSONL to this file")
+    parser.add_argument("--admin-token", help="invalidate the running API's catalog cache when done")
+    args = parser.parse_args()
+
+    path = Path(args.manifest)
+    try:
+        entries = parse_manifest(path.read_text(encoding="utf-8-sig"), args.format or detect_format(path.name, None))
+    except (OSError, ManifestError) as exc:
+        print(f"Cannot read manifest: {exc}", file=sys.stderr)
+        return 2
+
+    ingestor = BulkIngestor(concurrency=args.concurrency, rate_per_second=args.rate)
+    run = ingestor.prepare(entries, args.created_by)
+    print(f"Prepared {len(run.items)} entries, {len(run.pending)} need Mux assets")
+    ingestor.run(run)
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as report:
+            for item in run.items:
+                report.write(json.dumps(item) + "\n")
+    else:
+        for item in run.items:
+            if item["status"] in ("failed", "invalid", "duplicate", "in_progress"):
+                print(f"line {item['line']}: {item['status']}: {item['title']} ({item['error']})")
+
+    invalidate_catalog()
+    if args.admin_token:
+        invalidate_remote_catalog(args.admin_token)
+
+    counts = run.counts()
+    print("Ingest complete. " + ", ".join(f"{status}={count}" for status, count in sorted(counts.items())))
+    return 1 if counts.get("failed") or counts.get("invalid") else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
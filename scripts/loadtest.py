@@ -0,0 +1,349 @@
+"""Offline load test: seeded database, fake Mux, real HTTP traffic.
+
+Seeds users and videos into DATABASE_URL (a local SQLite file by default),
+starts the fake Mux server and the API under uvicorn in this process, then
+drives a weighted traffic mix at a fixed concurrency and prints per-endpoint
+throughput and latency percentiles as JSON. Runs are meant to be diffed
+across commits, so the report includes the git revision and full config.
+
+Usage:
+    python scripts/loadtest.py --mix browse --concurrency 50 --duration 30
+    python scripts/loadtest.py --mix mixed --users 500 --videos 20000 --output run.json
+    python scripts/loadtest.py --mix "list=50,get=30,play=20"
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# Safe before configure_environment(): app.core.metrics does not read settings.
+from app.core.metrics import percentile
+
+PASSWORD = "loadtest-password"
+EMAIL_DOMAIN = "loadtest.example.com"
+
+# operation -> weight
+MIXES = {
+    "browse": {"list": 45, "list_next": 15, "get": 25, "play": 15},
+    "mixed": {"login": 5, "list": 40, "list_next": 10, "get": 25, "play": 15, "create": 5},
+    "login": {"login": 100},
+    "playback": {"get": 30, "play": 70},
+}
+
+ENDPOINTS = {
+    "login": "POST /auth/login",
+    "list": "GET /videos",
+    "list_next": "GET /videos?cursor",
+    "get": "GET /videos/{video_id}",
+    "play": "GET /videos/{video_id}/play",
+    "create": "POST /videos",
+}
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    if value in MIXES:
+        return MIXES[value]
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"unknown operation {name!r}; choose from {', '.join(ENDPOINTS)}")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+def configure_environment(args, mux_base_url: str) -> None:
+    # Settings are read at import time, so this runs before any app import.
+    # Spawned bcrypt workers inherit the same environment.
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ["MUX_BASE_URL"] = mux_base_url
+    os.environ.setdefault("MUX_TOKEN_ID", "loadtest")
+    os.environ.setdefault("MUX_TOKEN_SECRET", "loadtest")
+    os.environ.setdefault("JWT_SECRET", "loadtest-secret")
+    os.environ["MUX_RECONCILE_ENABLED"] = "true" if args.reconcile else "false"
+    # Every simulated user logs in from 127.0.0.1, so the per-IP login limit
+    # would turn the login mix into a 429 benchmark.
+    os.environ["AUTH_RATE_LIMIT_ENABLED"] = "true" if args.rate_limit else "false"
+
+
+def role_for(index: int):
+    from app.db.models import UserRole
+
+    if index == 0 or index % 20 == 1:
+        return UserRole.ADMIN
+    return UserRole.PREMIUM if index % 4 == 0 else UserRole.USER
+
+
+def seed(user_count: int, video_count: int) -> tuple[list[dict], list[int]]:
+    """Top up loadtest users and videos; returns (users, visible video ids)."""
+    from sqlalchemy import func, insert, select
+    from app.auth.security import hash_password
+    from app.db.database import Base, SessionLocal, engine
+    from app.db.models import User, Video, VideoStatus
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        emails = [f"user{i}@{EMAIL_DOMAIN}" for i in range(user_count)]
+        existing = set(db.scalars(select(User.email).where(User.email.like(f"%@{EMAIL_DOMAIN}"))))
+        missing = [(i, email) for i, email in enumerate(emails) if email not in existing]
+        if missing:
+            # One bcrypt hash shared by every seeded account keeps seeding fast.
+            password_hash = hash_password(PASSWORD)
+            db.execute(
+                insert(User),
+                [{"email": email, "password_hash": password_hash, "role": role_for(i)} for i, email in missing],
+            )
+            db.commit()
+        users = [
+            {"id": row.id, "email": row.email, "role": row.role}
+            for row in db.execute(select(User.id, User.email, User.role).where(User.email.in_(emails)))
+        ]
+
+        owner_id = next(user["id"] for user in users if user["role"].value == "ADMIN")
+        have = db.scalar(select(func.count(Video.id)).where(Video.title.like("Load test video %")))
+        base = datetime(2026, 1, 1)
+        batch = []
+        for i in range(have, video_count):
+            batch.append({
+                "title": f"Load test video {i}",
+                "description": f"Seeded by scripts/loadtest.py ({i})",
+                "is_premium": i % 3 == 0,
+                "is_hidden": i % 17 == 0,
+                "mux_asset_id": f"loadtest-asset-{i}",
+                "playback_id": f"loadtest-playback-{i}",
+                "status": VideoStatus.READY.value,
+                "created_by": owner_id,
+                "created_at": base + timedelta(seconds=i),
+            })
+            if len(batch) == 5000:
+                db.execute(insert(Video), batch)
+                batch.clear()
+        if batch:
+            db.execute(insert(Video), batch)
+        db.commit()
+
+        video_ids = list(db.scalars(
+            select(Video.id).where(Video.is_hidden.is_(False), Video.is_premium.is_(False)).limit(5000)
+        ))
+    finally:
+        db.close()
+    return users, video_ids
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_api(port: int):
+    import uvicorn
+    import main
+
+    server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, name="loadtest-api", daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 30
+    while not server.started:
+        if time.monotonic() > deadline or not thread.is_alive():
+            raise RuntimeError("API server failed to start")
+        time.sleep(0.05)
+    return server, thread
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = {name: [] for name in ENDPOINTS}
+        self.statuses: dict[str, dict[str, int]] = {name: {} for name in ENDPOINTS}
+        self.enabled = False
+
+    def record(self, op: str, status: str, elapsed: float) -> None:
+        if not self.enabled:
+            return
+        self.latencies[op].append(elapsed)
+        self.statuses[op][status] = self.statuses[op].get(status, 0) + 1
+
+    def report(self, duration: float) -> dict:
+        endpoints = {}
+        total = errors = 0
+        for op, latencies in self.latencies.items():
+            if not latencies:
+                continue
+            failed = sum(count for status, count in self.statuses[op].items() if not status.startswith("2"))
+            total += len(latencies)
+            errors += failed
+            endpoints[ENDPOINTS[op]] = {
+                "requests": len(latencies),
+                "errors": failed,
+                "statuses": dict(sorted(self.statuses[op].items())),
+                "requests_per_s": round(len(latencies) / duration, 1),
+                "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+                "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+                "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+                "max_ms": round(max(latencies) * 1000, 2),
+            }
+        return {
+            "total": {
+                "requests": total,
+                "errors": errors,
+                "requests_per_s": round(total / duration, 1) if duration else 0.0,
+            },
+            "endpoints": endpoints,
+        }
+
+
+async def virtual_user(client, rng: random.Random, mix: dict, users: list[dict], tokens: dict,
+                       video_ids: list[int], recorder: Recorder, stop: asyncio.Event) -> None:
+    ops, weights = list(mix), list(mix.values())
+    admins = [user for user in users if user["role"].value == "ADMIN"]
+    cursor = None
+    while not stop.is_set():
+        op = rng.choices(ops, weights)[0]
+        user = rng.choice(admins if op == "create" else users)
+        headers = {"Authorization": f"Bearer {tokens[user['id']]}"}
+        if op == "list_next" and cursor is None:
+            op = "list"
+
+        started = time.perf_counter()
+        try:
+            if op == "login":
+                response = await client.post("/auth/login", json={"email": user["email"], "password": PASSWORD})
+            elif op == "list":
+                response = await client.get("/videos", params={"limit": 24}, headers=headers)
+            elif op == "list_next":
+                response = await client.get("/videos", params={"limit": 24, "cursor": cursor}, headers=headers)
+            elif op == "get":
+                response = await client.get(f"/videos/{rng.choice(video_ids)}", headers=headers)
+            elif op == "play":
+                response = await client.get(f"/videos/{rng.choice(video_ids)}/play", headers=headers)
+            else:
+                response = await client.post("/videos", headers=headers, json={
+                    "title": f"Load test upload {rng.random():.8f}",
+                    "input_url": "https://example.com/loadtest.mp4",
+                })
+            status = str(response.status_code)
+        except Exception as exc:
+            response = None
+            status = type(exc).__name__
+        recorder.record(op, status, time.perf_counter() - started)
+
+        if response is not None and op in ("list", "list_next") and response.status_code == 200:
+            cursor = response.json().get("next_cursor")
+
+
+async def drive(base_url: str, args, users: list[dict], video_ids: list[int]) -> dict:
+    import httpx
+    from app.auth.security import create_access_token
+
+    # Browsing traffic reuses tokens as real clients would; logins are measured separately.
+    tokens = {user["id"]: create_access_token(str(user["id"]), user["role"].value) for user in users}
+    recorder = Recorder()
+    stop = asyncio.Event()
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        tasks = [
+            asyncio.create_task(virtual_user(
+                client, random.Random(args.seed + i), args.mix, users, tokens, video_ids, recorder, stop,
+            ))
+            for i in range(args.concurrency)
+        ]
+        await asyncio.sleep(args.warmup)
+        recorder.enabled = True
+        started = time.perf_counter()
+        await asyncio.sleep(args.duration)
+        recorder.enabled = False
+        duration = time.perf_counter() - started
+        stop.set()
+        await asyncio.gather(*tasks)
+
+    return {"duration_s": round(duration, 3), **recorder.report(duration)}
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, stderr=subprocess.DEVNULL, text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load test the API against a seeded DB and fake Mux")
+    parser.add_argument("--database-url", default=f"sqlite:///{ROOT / 'loadtest.db'}")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--videos", type=int, default=5000)
+    parser.add_argument("--mix", type=parse_mix, default="browse",
+                        help=f"preset ({', '.join(MIXES)}) or op=weight list over {', '.join(ENDPOINTS)}")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=20.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="unmeasured seconds before the run")
+    parser.add_argument("--seed", type=int, default=1, help="random seed for the traffic mix")
+    parser.add_argument("--mux-latency", type=float, default=0.05, help="fake Mux per-request latency")
+    parser.add_argument("--reconcile", action="store_true", help="run the Mux reconciler during the test")
+    parser.add_argument("--rate-limit", action="store_true", help="keep the login/register rate limits on")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    from app.mux.fake_server import FakeMuxServer
+
+    with FakeMuxServer(latency=args.mux_latency) as mux:
+        configure_environment(args, mux.base_url)
+        users, video_ids = seed(args.users, args.videos)
+        if not video_ids:
+            print("No visible videos to request", file=sys.stderr)
+            return 1
+
+        port = free_port()
+        server, thread = start_api(port)
+        try:
+            results = asyncio.run(drive(f"http://127.0.0.1:{port}", args, users, video_ids))
+        finally:
+            server.should_exit = True
+            thread.join(timeout=10)
+        mux_requests = mux.state.requests
+
+    from app.db.database import engine
+
+    report = {
+        "revision": git_revision(),
+        "started_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "config": {
+            "database": engine.url.render_as_string(hide_password=True),
+            "users": args.users,
+            "videos": args.videos,
+            "mix": args.mix,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "seed": args.seed,
+            "mux_latency_s": args.mux_latency,
+            "rate_limit": args.rate_limit,
+        },
+        **results,
+        "fake_mux_requests": mux_requests,
+    }
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
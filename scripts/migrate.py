@@ -0,0 +1,48 @@
+"""Apply migrations/*.sql to DATABASE_URL (Postgres) and record them.
+
+Usage:
+    python scripts/migrate.py            # apply pending migrations
+    python scripts/migrate.py --status   # list applied / pending / edited
+    python scripts/migrate.py --check    # exit 1 if anything is pending
+"""
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.db.database import engine
+from app.db.migrations import MigrationError, migrate, pending, status
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Apply SQL migrations")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--status", action="store_true", help="show every migration and its state")
+    group.add_argument("--check", action="store_true", help="exit 1 when migrations are pending")
+    args = parser.parse_args()
+
+    try:
+        if args.status:
+            for row in status(engine):
+                applied = f"  {row['applied_at']:%Y-%m-%d %H:%M} ({row['duration_ms']} ms)" if "applied_at" in row else ""
+                print(f"{row['version']}_{row['name']}: {row['state']}{applied}")
+            return 0
+        if args.check:
+            todo = pending(engine)
+            for migration in todo:
+                print(f"pending: {migration.version}_{migration.name}")
+            return 1 if todo else 0
+        applied = migrate(engine)
+    except MigrationError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+
+    print(f"Applied {', '.join(applied)}" if applied else "Schema is up to date")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
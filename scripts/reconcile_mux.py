@@ -0,0 +1,27 @@
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.mux.reconciler import MuxStatusReconciler
+
+
+def main() -> int:
+    reconciler = MuxStatusReconciler()
+    loop = "--loop" in sys.argv
+    try:
+        while True:
+            result = reconciler.run_once()
+            print(f"Reconcile pass. checked={result.checked}, changed={result.changed}, failed={result.failed}")
+            if not loop:
+                return 0
+            time.sleep(reconciler.interval)
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
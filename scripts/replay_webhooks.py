@@ -0,0 +1,134 @@
+"""Replay recorded (or synthetic) Mux webhook events against the API.
+
+Usage:
+    python scripts/replay_webhooks.py --events events.jsonl --concurrency 32
+    python scripts/replay_webhooks.py --generate 5000 --duplicates 0.2
+
+Prints a JSON summary with throughput and acknowledgement latency.
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import requests
+from app.core.config import settings
+from app.core.metrics import percentile
+from app.mux.webhooks import sign_payload
+
+
+def load_events(path: str) -> list[bytes]:
+    with open(path, "rb") as fh:
+        return [line.strip() for line in fh if line.strip()]
+
+
+def generate_events(count: int, duplicates: float) -> list[bytes]:
+    from app.db.database import SessionLocal
+    from app.db.models import Video
+
+    db = SessionLocal()
+    try:
+        asset_ids = [row[0] for row in db.query(Video.mux_asset_id).filter(Video.mux_asset_id.isnot(None))]
+    finally:
+        db.close()
+    if not asset_ids:
+        asset_ids = [uuid.uuid4().hex for _ in range(100)]
+
+    events = []
+    for _ in range(count):
+        if events and random.random() < duplicates:
+            events.append(random.choice(events))
+            continue
+        asset_id = random.choice(asset_ids)
+        event_type = "video.asset.ready" if random.random() < 0.9 else "video.asset.errored"
+        events.append(
+            json.dumps(
+                {
+                    "id": str(uuid.uuid4()),
+                    "type": event_type,
+                    "object": {"type": "asset", "id": asset_id},
+                    "data": {"id": asset_id, "status": event_type.rsplit(".", 1)[-1]},
+                }
+            ).encode("utf-8")
+        )
+    return events
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Replay Mux webhook events")
+    parser.add_argument("--url", default=f"{settings.api_base_url}/mux/webhooks")
+    parser.add_argument("--events", help="JSONL file with one recorded event body per line")
+    parser.add_argument("--generate", type=int, default=0, help="number of synthetic events")
+    parser.add_argument("--duplicates", type=float, default=0.0, help="fraction of re-sent events")
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    if not settings.mux_webhook_secret:
+        print("MUX_WEBHOOK_SECRET is not configured")
+        return 1
+    if args.events:
+        events = load_events(args.events)
+    elif args.generate:
+        events = generate_events(args.generate, args.duplicates)
+    else:
+        parser.error("pass --events or --generate")
+
+    local = threading.local()
+    latencies: list[float] = []
+    statuses: dict[str, int] = {}
+    lock = threading.Lock()
+
+    def send(body: bytes) -> None:
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        headers = {
+            "Content-Type": "application/json",
+            "Mux-Signature": sign_payload(body, settings.mux_webhook_secret),
+        }
+        started = time.perf_counter()
+        try:
+            response = session.post(args.url, data=body, headers=headers, timeout=10)
+            key = str(response.status_code)
+            if response.ok:
+                key = response.json().get("status", key)
+        except requests.RequestException:
+            key = "error"
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+            statuses[key] = statuses.get(key, 0) + 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        list(executor.map(send, events))
+    duration = time.perf_counter() - started
+
+    print(
+        json.dumps(
+            {
+                "events": len(events),
+                "concurrency": args.concurrency,
+                "duration_s": round(duration, 3),
+                "events_per_s": round(len(events) / duration, 1) if duration else None,
+                "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+                "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+                "statuses": statuses,
+            },
+            indent=2,
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,33 @@
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.videos.rollups import TrendingAggregator
+
+
+def main() -> int:
+    """Fold new playback events into the trending rollups once, or keep going with --loop.
+
+    Useful with ROLLUPS_ENABLED=false on the API to aggregate in a single
+    separate process.
+    """
+    aggregator = TrendingAggregator()
+    loop = "--loop" in sys.argv
+    try:
+        while True:
+            consumed = aggregator.run_once()
+            if consumed or not loop:
+                print(f"Rollups pass. {consumed} playback events folded")
+            if not loop:
+                return 0
+            time.sleep(aggregator.interval)
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
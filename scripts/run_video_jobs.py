@@ -0,0 +1,34 @@
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.videos.jobs import VideoJobWorker
+
+
+def main() -> int:
+    """Drain due video jobs once, or keep polling with --loop.
+
+    Useful with VIDEO_JOBS_ENABLED=false on the API to run Mux calls in a
+    separate process.
+    """
+    worker = VideoJobWorker()
+    loop = "--loop" in sys.argv
+    try:
+        while True:
+            counts = worker.run_once()
+            if counts or not loop:
+                summary = ", ".join(f"{status}={count}" for status, count in sorted(counts.items()))
+                print(f"Video jobs pass. {summary or 'nothing due'}")
+            if not loop:
+                return 0
+            time.sleep(worker.poll_interval)
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
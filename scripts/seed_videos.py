@@ -5,10 +5,9 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from sqlalchemy.orm import Session
-from app.db.database import SessionLocal
-from app.db.models import Video, VideoStatus
-from app.mux.service import MuxService
+from app.mux.service import get_mux_service
+from app.videos.cache import invalidate_catalog, invalidate_remote_catalog
+from app.videos.ingest import BulkIngestor
 
 VIDEOS = [
     {
@@ -85,31 +84,6 @@ VIDEOS = [
 ]
 
 
-def ensure_video(db: Session, mux_service: MuxService, item: dict, created_by: int) -> str:
-    existing = db.query(Video).filter(Video.title == item["title"]).first()
-    if existing:
-        existing.is_premium = item["is_premium"]
-        existing.is_hidden = item["is_hidden"]
-        db.commit()
-        return "updated"
-
-    mux_asset_id, playback_id = mux_service.create_asset(item["url"])
-    video = Video(
-        title=item["title"],
-        description=item["description"],
-        is_premium=item["is_premium"],
-        is_hidden=item["is_hidden"],
-        mux_asset_id=mux_asset_id,
-        playback_id=playback_id,
-        status=VideoStatus.PROCESSING.value,
-        created_by=created_by,
-    )
-    db.add(video)
-    db.commit()
-    print(f"created asset: {mux_asset_id} | playback_id={playback_id}")
-    return "created"
-
-
 def main() -> int:
     created_by = 1
     if "--created-by" in sys.argv:
@@ -117,22 +91,20 @@ def main() -> int:
         if idx + 1 < len(sys.argv):
             created_by = int(sys.argv[idx + 1])
 
-    db = SessionLocal()
-    created = 0
-    updated = 0
-    try:
-        mux_service = MuxService()
-        for item in VIDEOS[:10]:
-            action = ensure_video(db, mux_service, item, created_by)
-            if action == "created":
-                created += 1
-            else:
-                updated += 1
-            print(f"{action}: {item['title']}")
-    finally:
-        db.close()
+    entries = [(line, item, None) for line, item in enumerate(VIDEOS[:10], start=1)]
+    ingestor = BulkIngestor(get_mux_service())
+    run = ingestor.run(ingestor.prepare(entries, created_by))
+    for item in run.items:
+        print(f"{item['status']}: {item['title']}" + (f" ({item['error']})" if item["error"] else ""))
+
+    invalidate_catalog()
+    if "--admin-token" in sys.argv:
+        idx = sys.argv.index("--admin-token")
+        if idx + 1 < len(sys.argv):
+            invalidate_remote_catalog(sys.argv[idx + 1])
 
-    print(f"Seed complete. created={created}, updated={updated}")
+    counts = run.counts()
+    print(f"Seed complete. created={counts.get('created', 0)}, updated={counts.get('updated', 0) + counts.get('exists', 0)}")
     return 0
 
 
@@ -0,0 +1,129 @@
+"""Upload local video files to Mux through direct uploads.
+
+Each file is streamed in resumable chunks (one chunk in memory at a time)
+and a video row is created for it. Several files upload at once with
+--parallel; chunks of a single file always go in order. Files whose title
+already exists are skipped, so an interrupted batch can simply be re-run.
+
+Usage:
+    python scripts/upload_videos.py masters/*.mp4 --created-by 1
+    python scripts/upload_videos.py film.mov --title "Feature film" --premium --chunk-mb 32
+"""
+import argparse
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import select
+
+from app.db.database import SessionLocal
+from app.db.models import Video, VideoStatus
+from app.mux.service import get_mux_service
+from app.mux.uploads import ChunkedUploader, UploadError, wait_for_asset
+from app.videos.cache import invalidate_catalog, invalidate_remote_catalog
+
+_print_lock = threading.Lock()
+
+
+def progress_printer(name: str, interval: float = 2.0):
+    last = {"at": 0.0}
+
+    def report(sent: int, total) -> None:
+        now = time.monotonic()
+        if now - last["at"] < interval and sent != total:
+            return
+        last["at"] = now
+        percent = f" {100 * sent / total:5.1f}%" if total else ""
+        with _print_lock:
+            print(f"{name}:{percent} {sent / 1024 / 1024:.1f} MiB", file=sys.stderr)
+
+    return report
+
+
+def upload_one(path: Path, title: str, args) -> str:
+    mux_service = get_mux_service()
+    upload_id, url = mux_service.create_direct_upload()
+    uploader = ChunkedUploader(url, progress=progress_printer(path.name))
+    uploader.upload_file(path, args.chunk_mb * 1024 * 1024 if args.chunk_mb else None)
+
+    status = VideoStatus.PROCESSING.value
+    try:
+        mux_asset_id, playback_id = wait_for_asset(mux_service, upload_id) or (None, None)
+    except UploadError:
+        mux_asset_id, playback_id = None, None
+        status = VideoStatus.FAILED.value
+
+    with SessionLocal() as db:
+        db.add(
+            Video(
+                title=title,
+                is_premium=args.premium,
+                is_hidden=args.hidden,
+                mux_upload_id=upload_id,
+                mux_asset_id=mux_asset_id,
+                playback_id=playback_id,
+                status=status,
+                created_by=args.created_by,
+            )
+        )
+        db.commit()
+    return f"uploaded {uploader.offset} bytes (upload {upload_id}, asset {mux_asset_id or 'pending'})"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Upload local video files to Mux")
+    parser.add_argument("files", nargs="+", help="video files to upload")
+    parser.add_argument("--title", help="title for a single file (default: file name without extension)")
+    parser.add_argument("--created-by", type=int, default=1, help="owner user id for new videos")
+    parser.add_argument("--premium", action="store_true", help="mark the videos premium")
+    parser.add_argument("--hidden", action="store_true", help="mark the videos hidden")
+    parser.add_argument("--parallel", type=int, default=2, help="files uploaded at the same time")
+    parser.add_argument("--chunk-mb", type=int, help="chunk size in MiB (rounded down to 256 KiB)")
+    parser.add_argument("--admin-token", help="invalidate the running API's catalog cache when done")
+    args = parser.parse_args()
+
+    paths = [Path(name) for name in args.files]
+    if args.title and len(paths) > 1:
+        print("--title only works with a single file", file=sys.stderr)
+        return 2
+    missing = [str(path) for path in paths if not path.is_file()]
+    if missing:
+        print(f"Not found: {', '.join(missing)}", file=sys.stderr)
+        return 2
+
+    titles = {path: args.title or path.stem for path in paths}
+    with SessionLocal() as db:
+        existing = set(db.scalars(select(Video.title).where(Video.title.in_(titles.values()))))
+    todo = [path for path in paths if titles[path] not in existing]
+    for path in paths:
+        if path not in todo:
+            print(f"{path}: skipped, title {titles[path]!r} already exists")
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=max(1, args.parallel)) as executor:
+        futures = {executor.submit(upload_one, path, titles[path], args): path for path in todo}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                print(f"{path}: {future.result()}")
+            except Exception as exc:
+                failed += 1
+                print(f"{path}: failed: {exc}", file=sys.stderr)
+
+    if len(todo) > failed:
+        invalidate_catalog()
+        if args.admin_token:
+            invalidate_remote_catalog(args.admin_token)
+
+    print(f"Upload complete. uploaded={len(todo) - failed}, skipped={len(paths) - len(todo)}, failed={failed}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,49 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# Settings are read at import time, so the environment is set before any app import.
+_tmp = tempfile.mkdtemp(prefix="horios-tests-")
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{_tmp}/primary.db",
+    JWT_SECRET="test-secret-test-secret-test-secret",
+    MUX_TOKEN_ID="test-token",
+    MUX_TOKEN_SECRET="test-secret",
+    MUX_RECONCILE_ENABLED="false",
+    VIDEO_JOBS_ENABLED="false",
+    ROLLUPS_ENABLED="false",
+    AUTH_RATE_LIMIT_ENABLED="false",
+)
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.db.database import Base, engine
+
+
+@pytest.fixture
+def database():
+    """Fresh schema on the primary (DATABASE_URL) database, with empty caches."""
+    from app.auth.deps import user_cache
+    from app.videos.cache import invalidate_catalog
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    user_cache.clear()
+    invalidate_catalog()
+    yield engine
+
+
+@pytest.fixture
+def sqlite_sessions(tmp_path):
+    """sessionmaker for a throwaway SQLite file with the full schema."""
+    local = create_engine(f"sqlite:///{tmp_path / 'local.db'}")
+    Base.metadata.create_all(local)
+    yield sessionmaker(bind=local)
+    local.dispose()
@@ -0,0 +1,38 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app.auth.security import create_access_token
+from app.db.database import engine
+from app.db.models import User, UserRole
+import main
+
+
+@pytest.fixture
+def client(database):
+    now = datetime.utcnow()
+    with Session(engine) as db:
+        db.add(User(id=1, email="admin@example.com", password_hash="x", role=UserRole.ADMIN, created_at=now))
+        for n in range(2, 6):
+            db.add(User(id=n, email=f"user{n}@example.com", password_hash="x", role=UserRole.USER,
+                        created_at=now - timedelta(minutes=n)))
+        db.commit()
+    client = TestClient(main.app)
+    client.headers["Authorization"] = "Bearer " + create_access_token("1", UserRole.ADMIN.value)
+    return client
+
+
+def test_cursors_page_within_their_own_ordering(client):
+    first = client.get("/admin/users", params={"limit": 2, "q": "user"}).json()
+    second = client.get("/admin/users", params={"limit": 2, "q": "user", "cursor": first["next_cursor"]}).json()
+    emails = [user["email"] for user in first["items"] + second["items"]]
+    assert emails == [f"user{n}@example.com" for n in range(2, 6)]
+
+
+def test_cursor_from_the_other_ordering_is_rejected(client):
+    by_date = client.get("/admin/users", params={"limit": 2}).json()["next_cursor"]
+    by_email = client.get("/admin/users", params={"limit": 2, "q": "user"}).json()["next_cursor"]
+
+    assert client.get("/admin/users", params={"q": "user", "cursor": by_date}).status_code == 400
+    assert client.get("/admin/users", params={"cursor": by_email}).status_code == 400
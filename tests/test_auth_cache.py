@@ -0,0 +1,59 @@
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app.auth.deps import get_current_user, user_cache
+from app.auth.security import create_access_token
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal, engine
+from app.db.models import User, UserRole
+import main
+
+
+def set_role(role: UserRole) -> None:
+    # Straight to the database, as a write in another worker would look here.
+    with Session(engine) as db:
+        db.get(User, 1).role = role
+        db.commit()
+
+
+def test_demoted_admin_loses_access_after_the_admin_ttl(database, monkeypatch):
+    monkeypatch.setattr(settings, "user_cache_admin_ttl_seconds", 0.2)
+    with Session(engine) as db:
+        db.add(User(id=1, email="admin@example.com", password_hash="x", role=UserRole.ADMIN))
+        db.commit()
+    client = TestClient(main.app)
+    client.headers["Authorization"] = "Bearer " + create_access_token("1", UserRole.ADMIN.value)
+
+    assert client.get("/admin/cache/stats").status_code == 200
+    set_role(UserRole.USER)
+    assert client.get("/admin/cache/stats").status_code == 200
+    time.sleep(0.3)
+    assert client.get("/admin/cache/stats").status_code == 403
+
+
+def test_viewers_keep_the_regular_ttl(database, monkeypatch):
+    monkeypatch.setattr(settings, "user_cache_admin_ttl_seconds", 0.0)
+    with Session(engine) as db:
+        db.add(User(id=1, email="viewer@example.com", password_hash="x", role=UserRole.USER))
+        db.commit()
+    client = TestClient(main.app)
+    client.headers["Authorization"] = "Bearer " + create_access_token("1", UserRole.USER.value)
+
+    assert client.get("/videos").status_code == 200
+    assert user_cache.get(1).role == UserRole.USER
+
+
+def test_identity_lookup_hands_its_connection_back(database):
+    with Session(engine) as db:
+        db.add(User(id=1, email="viewer@example.com", password_hash="x", role=UserRole.USER))
+        db.commit()
+
+    async def lookup():
+        async with AsyncSessionLocal() as db:
+            user = await get_current_user(create_access_token("1", UserRole.USER.value), db)
+            return user, db.in_transaction()
+
+    user, holding = asyncio.run(lookup())
+    assert user.id == 1 and not holding
@@ -0,0 +1,55 @@
+import pytest
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from app.db.database import engine
+from app.db.models import User, UserRole, Video
+from app.mux.client import CircuitBreaker, MuxHttpClient
+from app.mux.fake_server import FakeMuxServer
+from app.mux.service import MuxService
+from app.videos.ingest import BulkIngestor, IngestRegistry, parse_manifest
+
+MANIFEST = "\n".join(
+    f'{{"title": "Clip {n}", "url": "https://example.com/{n}.mp4"}}' for n in range(3)
+)
+
+
+@pytest.fixture
+def ingestor(database):
+    with Session(engine) as db:
+        db.add(User(id=1, email="admin@example.com", password_hash="x", role=UserRole.ADMIN))
+        db.commit()
+    with FakeMuxServer() as server:
+        client = MuxHttpClient(CircuitBreaker(failure_threshold=100, reset_timeout=60), base_url=server.base_url)
+        yield BulkIngestor(MuxService(client), rate_per_second=100, registry=IngestRegistry())
+        client.close()
+
+
+def test_failed_result_write_still_finishes_the_run(ingestor, monkeypatch):
+    run = ingestor.prepare(parse_manifest(MANIFEST, "jsonl"), created_by=1)
+
+    def broken_flush(assigned, failed):
+        raise OperationalError("UPDATE videos", {}, Exception("database is locked"))
+
+    monkeypatch.setattr(ingestor, "_flush", broken_flush)
+    ingestor.run(run)
+
+    assert run.state == "done" and run.finished_at is not None
+    assert run.counts() == {"failed": 3}
+    assert all(item["retryable"] and "not saved" in item["error"] for item in run.items)
+    with Session(engine) as db:
+        assert db.query(Video).filter(Video.mux_asset_id.is_(None)).count() == 3
+
+
+def test_a_manifest_cannot_be_ingested_twice_at_once(ingestor):
+    first = ingestor.prepare(parse_manifest(MANIFEST, "jsonl"), created_by=1)
+    second = ingestor.prepare(parse_manifest(MANIFEST, "jsonl"), created_by=1)
+    assert len(first.pending) == 3
+    assert not second.pending and second.counts() == {"in_progress": 3}
+    assert second.state == "done"
+
+    ingestor.run(first)
+    assert first.counts() == {"created": 3}
+    again = ingestor.prepare(parse_manifest(MANIFEST, "jsonl"), created_by=1)
+    assert again.counts() == {"exists": 3}
+    with Session(engine) as db:
+        assert db.query(Video).count() == 3
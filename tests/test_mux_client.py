@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+import requests
+from app.core.config import settings
+from app.mux.client import AsyncMuxHttpClient, CircuitBreaker, MuxAPIError, MuxHttpClient
+from app.mux.fake_server import FakeMuxServer
+from app.mux.service import MuxService
+from app.videos.ingest import BulkIngestor
+from app.videos.schemas import IngestItem
+
+
+@pytest.fixture
+def fake_mux():
+    with FakeMuxServer() as server:
+        yield server
+
+
+def test_rate_limit_surfaces_as_429_without_tripping_breaker(fake_mux):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    client = MuxHttpClient(breaker, base_url=fake_mux.base_url)
+    fake_mux.state.rate_limit_next_posts = settings.mux_max_retries + 1
+
+    with pytest.raises(MuxAPIError) as excinfo:
+        client.request("POST", "/assets", json={"input": [{"url": "https://example.com/a.mp4"}]})
+    assert excinfo.value.status_code == 429
+    assert excinfo.value.retry_after == "0"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    assert client.request("POST", "/assets", json={"input": [{"url": "https://example.com/a.mp4"}]})["data"]["id"]
+    client.close()
+
+
+def test_bulk_ingest_penalizes_shared_limiter_on_429(fake_mux):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    ingestor = BulkIngestor(mux_service=MuxService(MuxHttpClient(breaker, base_url=fake_mux.base_url)), rate_per_second=100)
+    fake_mux.state.rate_limit_next_posts = settings.mux_max_retries + 1
+
+    with pytest.raises(MuxAPIError):
+        ingestor._create_asset(IngestItem(title="t", input_url="https://example.com/a.mp4"))
+    # Retry-After: 0 from the fake still drains the burst.
+    assert ingestor.limiter._tokens <= 0
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def half_open_breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    return breaker
+
+
+def test_unexpected_error_releases_half_open_trial(fake_mux, monkeypatch):
+    breaker = half_open_breaker()
+    client = MuxHttpClient(breaker, base_url=fake_mux.base_url)
+
+    def redirect_loop(*args, **kwargs):
+        raise requests.TooManyRedirects("redirect loop")
+
+    monkeypatch.setattr(client.session, "request", redirect_loop)
+    with pytest.raises(requests.TooManyRedirects):
+        client.request("GET", "/assets/missing")
+    monkeypatch.undo()
+
+    assert client.request("POST", "/assets", json={"input": [{"url": "https://example.com/a.mp4"}]})
+    assert breaker.state == CircuitBreaker.CLOSED
+    client.close()
+
+
+def test_cancelled_async_call_releases_half_open_trial():
+    async def scenario():
+        with FakeMuxServer(latency=0.5) as server:
+            breaker = half_open_breaker()
+            client = AsyncMuxHttpClient(breaker, base_url=server.base_url)
+            task = asyncio.create_task(client.request("GET", "/assets/missing"))
+            await asyncio.sleep(0.1)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            assert breaker.before_call() is True
+            await client.aclose()
+
+    asyncio.run(scenario())
@@ -0,0 +1,54 @@
+from datetime import datetime
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import func, select
+from app.db.models import PlaybackEvent
+from app.videos.events import PlaybackEventBuffer
+from app.videos.schemas import PlaybackEventIn
+
+
+def event_row(**overrides) -> dict:
+    now = datetime.utcnow()
+    row = {
+        "session_id": "s",
+        "user_id": 1,
+        "video_id": 1,
+        "event_type": "heartbeat",
+        "position_seconds": 1.0,
+        "bitrate_kbps": 4500,
+        "buffering_ms": None,
+        "occurred_at": now,
+        "received_at": now,
+    }
+    row.update(overrides)
+    return row
+
+
+@pytest.mark.parametrize(
+    "field, value",
+    [("bitrate_kbps", 2**31), ("buffering_ms", 10**20), ("position_seconds", float("inf"))],
+)
+def test_out_of_range_values_are_rejected(field, value):
+    with pytest.raises(ValidationError):
+        PlaybackEventIn(session_id="s", type="heartbeat", **{field: value})
+
+
+def test_bad_row_is_dropped_after_max_attempts(sqlite_sessions):
+    buffer = PlaybackEventBuffer(session_factory=sqlite_sessions, max_events=100, flush_size=50, max_attempts=2)
+    rows = [event_row(position_seconds=float(i)) for i in range(10)]
+    rows.insert(4, event_row(bitrate_kbps=10**20))
+    assert buffer.submit(rows)
+
+    with pytest.raises(OverflowError):
+        buffer.flush()
+    assert len(buffer) == 11
+
+    assert buffer.flush() == 10
+    assert len(buffer) == 0
+    assert buffer.stats["dropped"] == 1
+    with sqlite_sessions() as db:
+        assert db.scalar(select(func.count()).select_from(PlaybackEvent)) == 10
+
+    assert buffer.submit([event_row()])
+    assert buffer.flush() == 1
@@ -0,0 +1,42 @@
+import asyncio
+import logging
+
+import pytest
+from app.core.ratelimit import KeyedRateLimiter, MemoryRateLimiter
+
+
+def test_limiters_must_implement_hit():
+    with pytest.raises(TypeError):
+        KeyedRateLimiter()
+
+    class Incomplete(KeyedRateLimiter):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_memory_limiter_allows_burst_then_waits():
+    limiter = MemoryRateLimiter(max_keys=10)
+
+    async def hits():
+        return [await limiter.hit("k", rate=1.0, capacity=2.0) for _ in range(3)]
+
+    first, second, third = asyncio.run(hits())
+    assert first == second == 0.0
+    assert 0.9 < third <= 1.0
+
+
+def test_redis_outage_fails_open_and_is_counted(caplog):
+    pytest.importorskip("redis")
+    from app.core.ratelimit import RedisRateLimiter
+
+    limiter = RedisRateLimiter("redis://127.0.0.1:1/0")
+
+    async def hits():
+        return [await limiter.hit("k", rate=1.0, capacity=1.0) for _ in range(3)]
+
+    with caplog.at_level(logging.WARNING, logger="app.core.ratelimit"):
+        assert asyncio.run(hits()) == [0.0, 0.0, 0.0]
+    assert limiter.stats() == {"backend": "redis", "errors": 3}
+    assert len([r for r in caplog.records if "unavailable" in r.message]) == 1
@@ -0,0 +1,73 @@
+import pytest
+from app.db.models import User, UserRole, Video, VideoStatus
+from app.mux.client import CircuitBreaker, MuxHttpClient
+from app.mux.fake_server import FakeMuxServer
+from app.mux.reconciler import MuxStatusReconciler
+from app.mux.service import MuxService
+
+
+@pytest.fixture
+def fake_mux():
+    with FakeMuxServer(ready_after=3600) as server:
+        yield server
+
+
+def test_reconciler_moves_videos_to_their_mux_status(fake_mux, sqlite_sessions):
+    state = fake_mux.state
+    ready, errored, preparing = (state.create_asset("https://example.com/a.mp4")["id"] for _ in range(3))
+    state.set_status(ready, "ready")
+    state.set_status(errored, "errored")
+    uploaded = state.create_upload("http://unused")["id"]
+    state.complete_upload(state.uploads[uploaded])
+    waiting = state.create_upload("http://unused")["id"]
+
+    with sqlite_sessions() as db:
+        db.add(User(id=1, email="admin@example.com", password_hash="x", role=UserRole.ADMIN))
+        for video_id, asset_id in enumerate([ready, errored, preparing, "missing"], start=1):
+            db.add(Video(id=video_id, title="t", status=VideoStatus.PROCESSING.value, mux_asset_id=asset_id, created_by=1))
+        db.add(Video(id=5, title="t", status=VideoStatus.PROCESSING.value, mux_upload_id=uploaded, created_by=1))
+        db.add(Video(id=6, title="t", status=VideoStatus.PROCESSING.value, mux_upload_id=waiting, created_by=1))
+        db.commit()
+
+    client = MuxHttpClient(CircuitBreaker(failure_threshold=100, reset_timeout=60), base_url=fake_mux.base_url)
+    # batch_size=2 makes the pass page through the processing rows.
+    reconciler = MuxStatusReconciler(MuxService(client), session_factory=sqlite_sessions, batch_size=2)
+    result = reconciler.run_once()
+    client.close()
+
+    # The resolved upload gets its asset id first, then is polled like the rest.
+    assert (result.uploads_resolved, result.checked, result.changed, result.failed) == (1, 5, 2, 1)
+    with sqlite_sessions() as db:
+        status = {video.id: video.status for video in db.query(Video)}
+        assert status == {
+            1: VideoStatus.READY.value,
+            2: VideoStatus.FAILED.value,
+            3: VideoStatus.PROCESSING.value,
+            4: VideoStatus.PROCESSING.value,
+            5: VideoStatus.PROCESSING.value,
+            6: VideoStatus.PROCESSING.value,
+        }
+        assert db.get(Video, 5).mux_asset_id == state.uploads[uploaded]["asset_id"]
+        assert db.get(Video, 6).mux_asset_id is None
+
+
+def test_uploads_beyond_the_first_batch_are_resolved(fake_mux, sqlite_sessions):
+    state = fake_mux.state
+    waiting = [state.create_upload("http://unused")["id"] for _ in range(3)]
+    done = state.create_upload("http://unused")["id"]
+    state.complete_upload(state.uploads[done])
+
+    with sqlite_sessions() as db:
+        db.add(User(id=1, email="admin@example.com", password_hash="x", role=UserRole.ADMIN))
+        for video_id, upload_id in enumerate(waiting + [done], start=1):
+            db.add(Video(id=video_id, title="t", status=VideoStatus.PROCESSING.value, mux_upload_id=upload_id, created_by=1))
+        db.commit()
+
+    client = MuxHttpClient(CircuitBreaker(failure_threshold=100, reset_timeout=60), base_url=fake_mux.base_url)
+    reconciler = MuxStatusReconciler(MuxService(client), session_factory=sqlite_sessions, batch_size=2)
+    result = reconciler.run_once()
+    client.close()
+
+    assert result.uploads_resolved == 1
+    with sqlite_sessions() as db:
+        assert db.get(Video, 4).mux_asset_id == state.uploads[done]["asset_id"]
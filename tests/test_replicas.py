@@ -0,0 +1,93 @@
+"""Replica routing with two local SQLite files standing in for replicas."""
+import math
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from app.auth.deps import user_cache
+from app.auth.security import create_access_token
+from app.db import replicas
+from app.db.database import Base, engine
+from app.db.models import User, UserRole, Video, VideoStatus
+from app.videos.cache import invalidate_catalog
+import main
+
+
+def seed(bind, title: str, role: UserRole = UserRole.ADMIN) -> None:
+    with Session(bind) as db:
+        db.add(User(id=1, email="admin@example.com", password_hash="x", role=role))
+        db.add(Video(id=1, title=title, status=VideoStatus.READY.value, created_by=1))
+        db.commit()
+
+
+@pytest.fixture
+def client(database, tmp_path, monkeypatch):
+    urls = []
+    for name in ("replica-a", "replica-b"):
+        path = tmp_path / f"{name}.db"
+        replica_engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(replica_engine)
+        seed(replica_engine, name)
+        replica_engine.dispose()
+        urls.append(f"sqlite:///{path}")
+    # A third replica that cannot be reached.
+    urls.append(f"sqlite:///{tmp_path / 'missing' / 'replica-c.db'}")
+    seed(engine, "primary")
+
+    router = replicas.ReplicaRouter(urls)
+    monkeypatch.setattr(replicas, "replica_router", router)
+    monkeypatch.setattr(main, "replica_router", router)
+    user_cache.clear()
+    invalidate_catalog()
+    router._last_write = -math.inf
+
+    with TestClient(main.app) as test_client:
+        deadline = time.monotonic() + 5
+        while router.replicas[2].healthy and time.monotonic() < deadline:
+            time.sleep(0.01)
+        test_client.headers["Authorization"] = "Bearer " + create_access_token("1", UserRole.ADMIN.value)
+        test_client.replica_router = router
+        yield test_client
+
+
+def video_title(client, **params) -> str:
+    # Distinct params skip the catalog cache.
+    return client.get("/videos", params=params).json()["items"][0]["title"]
+
+
+def test_reads_round_robin_over_healthy_replicas(client):
+    assert not client.replica_router.replicas[2].healthy
+    titles = [video_title(client, limit=n) for n in range(1, 5)]
+    assert titles == ["replica-a", "replica-b", "replica-a", "replica-b"]
+
+
+def test_writes_pin_reads_to_primary(client):
+    response = client.patch("/videos/1", json={"title": "renamed"})
+    assert response.status_code == 200
+    assert replicas.PRIMARY_COOKIE in response.cookies
+    assert video_title(client, limit=1) == "renamed"
+
+    # Another worker: only the cookie keeps the writer on the primary.
+    client.replica_router._last_write = -math.inf
+    assert video_title(client, limit=2) == "renamed"
+    client.cookies.clear()
+    assert video_title(client, limit=3).startswith("replica-")
+
+
+def test_background_invalidation_keeps_replica_routing(client):
+    # What the webhook flush, reconciler, job worker and ingest do.
+    for _ in range(3):
+        invalidate_catalog([1])
+    assert not client.replica_router.recently_written()
+    assert video_title(client, limit=1).startswith("replica-")
+
+
+def test_me_from_replica_is_not_cached(client):
+    with Session(engine) as db:
+        db.get(User, 1).role = UserRole.USER
+        db.commit()
+    # The replicas still say ADMIN.
+    assert client.get("/auth/me").json()["role"] == UserRole.ADMIN.value
+    assert user_cache.get(1) is None
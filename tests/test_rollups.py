@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select
+from app.db.models import PlaybackEvent, VideoRollup
+from app.videos.cache import catalog_cache, trending_cache
+from app.videos.events import clamp_occurred_at
+from app.videos.rollups import TrendingAggregator
+
+
+def play_rows(video_id: int, count: int, occurred_at: datetime, received_at: datetime) -> list[dict]:
+    return [
+        {
+            "session_id": "s",
+            "user_id": 1,
+            "video_id": video_id,
+            "event_type": "play",
+            "occurred_at": occurred_at,
+            "received_at": received_at,
+        }
+        for _ in range(count)
+    ]
+
+
+def test_clamp_occurred_at():
+    received = datetime(2026, 10, 17, 12, 0)
+    assert clamp_occurred_at(None, received) == received
+    assert clamp_occurred_at(datetime(2099, 1, 1), received) == received + timedelta(seconds=60)
+    assert clamp_occurred_at(datetime(2000, 1, 1), received) == received - timedelta(days=1)
+
+
+def test_future_dated_play_does_not_outrank_real_plays(sqlite_sessions):
+    received = datetime.utcnow() - timedelta(minutes=5)
+    with sqlite_sessions() as db:
+        db.execute(insert(PlaybackEvent), play_rows(1, 1000, received, received))
+        # Written before ingestion clamped occurred_at.
+        db.execute(insert(PlaybackEvent), play_rows(2, 1, datetime(2099, 1, 1), received))
+        db.commit()
+
+    catalog_cache.set("sentinel", b"{}")
+    aggregator = TrendingAggregator(session_factory=sqlite_sessions, settle_seconds=0, batch_size=300)
+    assert aggregator.run_once() == 1001
+    assert aggregator.run_once() == 0
+
+    with sqlite_sessions() as db:
+        rollups = db.scalars(select(VideoRollup).order_by(VideoRollup.trend_key.desc())).all()
+    assert [(r.video_id, r.total_plays) for r in rollups] == [(1, 1000), (2, 1)]
+    assert rollups[1].last_play_at <= received
+    # A pass only drops the trending pages.
+    assert catalog_cache.get("sentinel") == b"{}"
+    assert trending_cache.stats()["size"] == 0
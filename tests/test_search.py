@@ -0,0 +1,39 @@
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app.auth.security import create_access_token
+from app.db.database import engine
+from app.db.models import User, UserRole, Video, VideoStatus
+from app.videos.cache import catalog_cache, search_cache
+from app.videos.search import ensure_search_index, search_query, search_terms
+import main
+
+
+def seed() -> None:
+    with Session(engine) as db:
+        db.add(User(id=1, email="viewer@example.com", password_hash="x", role=UserRole.USER))
+        db.add(Video(id=1, title="Surf lessons", description="100%_real waves", status=VideoStatus.READY.value, created_by=1))
+        db.add(Video(id=2, title="Cooking", description="surf and turf", status=VideoStatus.READY.value, created_by=1))
+        db.add(Video(id=3, title="Hiking", status=VideoStatus.READY.value, created_by=1))
+        db.commit()
+
+
+def test_other_dialects_fall_back_to_substring_match(database):
+    seed()
+    with Session(engine) as db:
+        ids = [row.id for row in db.execute(search_query("mysql", search_terms("SURF")))]
+        assert ids == [1, 2]
+        # The underscore is matched literally, not as a LIKE wildcard.
+        assert [row.id for row in db.execute(search_query("mysql", ["100", "_real"]))] == [1]
+        assert [row.id for row in db.execute(search_query("mysql", ["100", "xreal"]))] == []
+
+
+def test_search_pages_use_their_own_cache(database):
+    seed()
+    ensure_search_index(engine)
+    client = TestClient(main.app)
+    client.headers["Authorization"] = "Bearer " + create_access_token("1", UserRole.USER.value)
+
+    response = client.get("/videos/search", params={"q": "surf"})
+    assert response.status_code == 200
+    assert [video["id"] for video in response.json()["items"]] == [1, 2]
+    assert search_cache.stats()["size"] == 1 and catalog_cache.stats()["size"] == 0
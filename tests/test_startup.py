@@ -0,0 +1,28 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.exc import OperationalError
+from app.db.migrations import MigrationError
+import main
+
+POSTGRES = SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+
+
+def test_failed_migration_aborts_startup(monkeypatch):
+    def failing_migrate(engine):
+        raise MigrationError("Migration 009_video_rollups failed: syntax error")
+
+    monkeypatch.setattr(main, "engine", POSTGRES)
+    monkeypatch.setattr(main, "migrate", failing_migrate)
+    with pytest.raises(MigrationError):
+        main.prepare_database()
+
+
+def test_unreachable_database_falls_back_to_api_only(monkeypatch, capsys):
+    def unreachable(engine):
+        raise OperationalError("SELECT 1", {}, Exception("connection refused"))
+
+    monkeypatch.setattr(main, "engine", POSTGRES)
+    monkeypatch.setattr(main, "migrate", unreachable)
+    main.prepare_database()
+    assert "API-only mode" in capsys.readouterr().out
@@ -0,0 +1,120 @@
+import asyncio
+import hashlib
+import os
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app.auth.security import create_access_token
+from app.core.config import settings
+from app.db.database import engine
+from app.db.models import User, UserRole, Video, VideoStatus
+from app.mux.client import AsyncMuxHttpClient, CircuitBreaker, MuxHttpClient
+from app.mux.fake_server import FakeMuxServer
+from app.mux.service import AsyncMuxService, MuxService, get_async_mux_service
+from app.mux.uploads import CHUNK_ALIGNMENT, AsyncChunkedUploader, ChunkedUploader
+import main
+
+# Two full chunks and a short final one.
+PAYLOAD = os.urandom(2 * CHUNK_ALIGNMENT + 1000)
+
+
+@pytest.fixture
+def fake_mux(monkeypatch):
+    monkeypatch.setattr(settings, "mux_backoff_base_seconds", 0.01)
+    with FakeMuxServer() as server:
+        yield server
+
+
+def new_upload(server: FakeMuxServer) -> tuple[dict, str]:
+    service = MuxService(MuxHttpClient(CircuitBreaker(5, 60), base_url=server.base_url))
+    upload_id, url = service.create_direct_upload()
+    service.client.close()
+    return server.state.uploads[upload_id], url
+
+
+def assert_uploaded(upload: dict) -> None:
+    assert upload["received"] == upload["total"] == len(PAYLOAD)
+    assert upload["sha256"].hexdigest() == hashlib.sha256(PAYLOAD).hexdigest()
+    assert upload["status"] == "asset_created"
+
+
+@pytest.mark.parametrize("failures", [0, 1, 3])
+def test_chunked_uploader_resumes_after_partial_write(fake_mux, tmp_path, failures):
+    path = tmp_path / "video.mp4"
+    path.write_bytes(PAYLOAD)
+    upload, url = new_upload(fake_mux)
+    fake_mux.state.fail_next_puts = failures
+    offsets = []
+
+    uploader = ChunkedUploader(url, progress=lambda sent, total: offsets.append(sent))
+    uploader.upload_file(path, chunk_size=CHUNK_ALIGNMENT)
+
+    assert uploader.completed
+    assert_uploaded(upload)
+    # Each failed PUT kept half a chunk, which the status query reported back.
+    assert offsets[:1] == ([CHUNK_ALIGNMENT // 2] if failures else [CHUNK_ALIGNMENT])
+    assert offsets[-1] == len(PAYLOAD)
+
+
+def test_async_uploader_resends_only_the_unpersisted_tail_of_the_final_chunk(fake_mux):
+    upload, url = new_upload(fake_mux)
+    final = PAYLOAD[2 * CHUNK_ALIGNMENT:]
+
+    async def scenario():
+        async with httpx.AsyncClient() as client:
+            uploader = AsyncChunkedUploader(url, client)
+            await uploader.send(PAYLOAD[:CHUNK_ALIGNMENT])
+            await uploader.send(PAYLOAD[CHUNK_ALIGNMENT:2 * CHUNK_ALIGNMENT])
+            assert not uploader.completed and upload["total"] is None
+            fake_mux.state.fail_next_puts = 1
+            await uploader.send(final, final=True)
+            return uploader
+
+    uploader = asyncio.run(scenario())
+    assert uploader.completed and uploader.offset == len(PAYLOAD)
+    assert_uploaded(upload)
+
+
+def multipart(title: str, payload: bytes) -> tuple[bytes, str]:
+    boundary = "horios-test-boundary"
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"title\"\r\n\r\n{title}\r\n"
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"v.mp4\"\r\n"
+        f"Content-Type: video/mp4\r\n\r\n"
+    ).encode() + payload + f"\r\n--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+def test_upload_route_streams_file_to_mux(database, fake_mux, monkeypatch):
+    monkeypatch.setattr(settings, "mux_upload_chunk_bytes", CHUNK_ALIGNMENT)
+    with Session(engine) as db:
+        db.add(User(id=1, email="admin@example.com", password_hash="x", role=UserRole.ADMIN))
+        db.commit()
+    service = AsyncMuxService(AsyncMuxHttpClient(CircuitBreaker(5, 60), base_url=fake_mux.base_url))
+    main.app.dependency_overrides[get_async_mux_service] = lambda: service
+    fake_mux.state.fail_next_puts = 2
+    body, content_type = multipart("From the fake", PAYLOAD)
+
+    try:
+        with TestClient(main.app) as client:
+            response = client.post(
+                "/videos/upload",
+                content=body,
+                headers={
+                    "Content-Type": content_type,
+                    "Authorization": "Bearer " + create_access_token("1", UserRole.ADMIN.value),
+                },
+            )
+            client.portal.call(service.aclose)
+    finally:
+        main.app.dependency_overrides.pop(get_async_mux_service)
+
+    assert response.status_code == 201, response.text
+    (upload,) = fake_mux.state.uploads.values()
+    assert_uploaded(upload)
+    with Session(engine) as db:
+        video = db.get(Video, response.json()["id"])
+        assert (video.mux_upload_id, video.mux_asset_id) == (upload["id"], upload["asset_id"])
+        assert video.status == VideoStatus.PROCESSING.value
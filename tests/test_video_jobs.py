@@ -0,0 +1,96 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app.auth.security import create_access_token
+from app.db.database import engine
+from app.db.models import JobStatus, User, UserRole, Video, VideoJob, VideoStatus
+from app.videos.jobs import VideoJobWorker
+import main
+
+
+def add_running_job(sessions, attempts: int, locked_at: datetime, max_attempts: int = 3) -> tuple[int, int]:
+    with sessions() as db:
+        db.add(User(id=1, email="admin@example.com", password_hash="x", role=UserRole.ADMIN))
+        video = Video(title="t", status=VideoStatus.PROCESSING.value, created_by=1)
+        db.add(video)
+        db.flush()
+        job = VideoJob(
+            video_id=video.id,
+            input_url="https://example.com/a.mp4",
+            status=JobStatus.RUNNING.value,
+            attempts=attempts,
+            max_attempts=max_attempts,
+            locked_at=locked_at,
+            created_by=1,
+        )
+        db.add(job)
+        db.commit()
+        return job.id, video.id
+
+
+def test_expired_lease_costs_an_attempt(sqlite_sessions):
+    job_id, _ = add_running_job(sqlite_sessions, attempts=0, locked_at=datetime.utcnow() - timedelta(hours=1))
+    worker = VideoJobWorker(session_factory=sqlite_sessions, lease_seconds=60)
+    assert worker.recover_stale() == 1
+    with sqlite_sessions() as db:
+        job = db.get(VideoJob, job_id)
+        assert (job.status, job.attempts, job.locked_at) == (JobStatus.QUEUED.value, 1, None)
+
+
+def test_last_expired_lease_kills_the_job(sqlite_sessions):
+    job_id, video_id = add_running_job(sqlite_sessions, attempts=2, locked_at=datetime.utcnow() - timedelta(hours=1))
+    worker = VideoJobWorker(session_factory=sqlite_sessions, lease_seconds=60)
+    assert worker.recover_stale() == 1
+    with sqlite_sessions() as db:
+        assert db.get(VideoJob, job_id).status == JobStatus.DEAD.value
+        assert db.get(Video, video_id).status == VideoStatus.FAILED.value
+
+
+class SlowMux:
+    def __init__(self, seconds: float) -> None:
+        self.seconds = seconds
+        self.calls = 0
+
+    def create_asset(self, input_url: str) -> tuple[str, str]:
+        self.calls += 1
+        time.sleep(self.seconds)
+        return "asset-1", "playback-1"
+
+
+def test_lease_is_renewed_during_slow_mux_call(sqlite_sessions):
+    add_running_job(sqlite_sessions, attempts=0, locked_at=datetime.utcnow())
+    mux = SlowMux(1.0)
+    worker = VideoJobWorker(mux_service=mux, session_factory=sqlite_sessions, lease_seconds=0.3)
+    with sqlite_sessions() as db:
+        job = db.query(VideoJob).one()
+    processing = threading.Thread(target=worker.process, args=(job,))
+    processing.start()
+    recovered = 0
+    while processing.is_alive():
+        recovered += worker.recover_stale()
+        time.sleep(0.05)
+    processing.join()
+
+    assert recovered == 0
+    with sqlite_sessions() as db:
+        assert db.get(VideoJob, job.id).status == JobStatus.SUCCEEDED.value
+
+
+def test_placeholders_are_hidden_from_viewers(database):
+    with Session(engine) as db:
+        db.add(User(id=1, email="admin@example.com", password_hash="x", role=UserRole.ADMIN))
+        db.add(User(id=2, email="viewer@example.com", password_hash="x", role=UserRole.USER))
+        db.add(Video(id=1, title="placeholder", status=VideoStatus.PROCESSING.value, created_by=1))
+        db.add(Video(id=2, title="encoding", status=VideoStatus.PROCESSING.value, mux_asset_id="a", created_by=1))
+        db.commit()
+
+    client = TestClient(main.app)
+    viewer = {"Authorization": "Bearer " + create_access_token("2", UserRole.USER.value)}
+    admin = {"Authorization": "Bearer " + create_access_token("1", UserRole.ADMIN.value)}
+    assert [v["id"] for v in client.get("/videos", headers=viewer).json()["items"]] == [2]
+    assert client.get("/videos/1", headers=viewer).status_code == 404
+    assert sorted(v["id"] for v in client.get("/videos", headers=admin).json()["items"]) == [1, 2]
+    assert client.get("/videos/1", headers=admin).status_code == 200
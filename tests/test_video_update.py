@@ -0,0 +1,30 @@
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app.auth.security import create_access_token
+from app.db.database import engine
+from app.db.models import User, UserRole, Video, VideoStatus
+import main
+
+
+def admin_client() -> TestClient:
+    with Session(engine) as db:
+        db.add(User(id=1, email="admin@example.com", password_hash="x", role=UserRole.ADMIN))
+        db.add(Video(id=1, title="t", description="old", is_premium=True, status=VideoStatus.READY.value, created_by=1))
+        db.commit()
+    client = TestClient(main.app)
+    client.headers["Authorization"] = "Bearer " + create_access_token("1", UserRole.ADMIN.value)
+    return client
+
+
+def test_null_clears_description_and_omitted_fields_are_kept(database):
+    client = admin_client()
+    response = client.patch("/videos/1", json={"description": None})
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["title"], body["description"], body["is_premium"]) == ("t", None, True)
+
+
+def test_null_is_rejected_for_required_fields(database):
+    client = admin_client()
+    for field in ("title", "is_premium", "is_hidden"):
+        assert client.patch("/videos/1", json={field: None}).status_code == 422
@@ -0,0 +1,90 @@
+import json
+import time
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.db.models import User, UserRole, Video, VideoStatus
+from app.mux.webhooks import WebhookIngestor, sign_payload
+from app.videos.cache import catalog_cache
+import main
+
+SECRET = "webhook-secret"
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(settings, "mux_webhook_secret", SECRET)
+    return TestClient(main.app)
+
+
+def post(client, event, signature=None):
+    body = event if isinstance(event, bytes) else json.dumps(event).encode()
+    headers = {"Content-Type": "application/json"}
+    headers["Mux-Signature"] = sign_payload(body, SECRET) if signature is None else signature
+    return client.post("/mux/webhooks", content=body, headers=headers)
+
+
+def ready_event(asset_id: str = "asset-1") -> dict:
+    return {"id": uuid.uuid4().hex, "type": "video.asset.ready", "data": {"id": asset_id}}
+
+
+def test_bad_signatures_are_rejected(client):
+    body = json.dumps(ready_event()).encode()
+    assert post(client, body, signature="").status_code == 401
+    assert post(client, body, signature=sign_payload(body, "other-secret")).status_code == 401
+    stale = sign_payload(body, SECRET, int(time.time()) - settings.mux_webhook_tolerance_seconds - 60)
+    assert post(client, body, signature=stale).status_code == 401
+    assert post(client, body).json()["status"] == "accepted"
+
+
+@pytest.mark.parametrize("event", [
+    b"not json",
+    [1, 2],
+    {"id": "x", "type": "video.asset.ready", "data": [1]},
+    {"id": ["x"], "type": "video.asset.ready", "data": {"id": "a"}},
+    {"id": "x", "type": "video.asset.ready", "data": {"id": 7}},
+])
+def test_malformed_events_are_400(client, event):
+    assert post(client, event).status_code == 400
+
+
+def test_duplicate_event_ids_are_acknowledged_once(client):
+    event = ready_event()
+    assert post(client, event).json()["status"] == "accepted"
+    assert post(client, event).json()["status"] == "duplicate"
+
+
+def seed_video(sessions, asset_id: str, status: str) -> None:
+    with sessions() as db:
+        db.add(User(id=1, email="admin@example.com", password_hash="x", role=UserRole.ADMIN))
+        db.add(Video(id=1, title="t", status=status, mux_asset_id=asset_id, created_by=1))
+        db.commit()
+
+
+def test_events_for_one_asset_coalesce_into_one_update(sqlite_sessions):
+    seed_video(sqlite_sessions, "asset-1", VideoStatus.PROCESSING.value)
+    ingestor = WebhookIngestor(session_factory=sqlite_sessions)
+    ingestor.submit("e1", "asset-1", VideoStatus.FAILED.value)
+    ingestor.submit("e2", "asset-1", VideoStatus.READY.value)
+
+    assert ingestor.flush() == 1
+    assert ingestor.stats["coalesced"] == 1
+    with sqlite_sessions() as db:
+        assert db.get(Video, 1).status == VideoStatus.READY.value
+
+
+def test_flush_without_changes_keeps_caches_warm(sqlite_sessions):
+    seed_video(sqlite_sessions, "asset-1", VideoStatus.READY.value)
+    ingestor = WebhookIngestor(session_factory=sqlite_sessions)
+    generation = catalog_cache.generation
+
+    ingestor.submit("e1", "asset-1", VideoStatus.READY.value)
+    ingestor.submit("e2", "unknown-asset", VideoStatus.READY.value)
+    assert ingestor.flush() == 0
+    assert catalog_cache.generation == generation
+
+    ingestor.submit("e3", "asset-1", VideoStatus.FAILED.value)
+    assert ingestor.flush() == 1
+    assert catalog_cache.generation > generation